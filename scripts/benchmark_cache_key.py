@@ -0,0 +1,153 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the encodings and hash algorithms of the cache keys of chart data.
+
+Each query object is hashed the way ``QueryObject.cache_key`` does it, with the
+legacy encoding (sorted JSON from simplejson) and the canonical one, and with each
+available hash algorithm:
+
+    python scripts/benchmark_cache_key.py --number 20000
+"""
+
+import timeit
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable
+
+import click
+from flask import Flask
+
+from superset.utils.hashing import hash_cache_key
+from superset.utils.json import json_int_dttm_ser
+
+ALGORITHMS = ("md5", "sha256", "blake2b", "xxh3_128")
+
+
+def metric(i: int) -> dict[str, Any]:
+    return {
+        "aggregate": "SUM",
+        "column": {
+            "column_name": f"num_{i}",
+            "type": "BIGINT",
+            "is_dttm": False,
+            "python_date_format": None,
+        },
+        "expressionType": "SIMPLE",
+        "label": f"SUM(num_{i})",
+        "optionName": f"metric_{i}",
+    }
+
+
+def simple() -> dict[str, Any]:
+    """
+    A table chart with a metric and a dimension.
+    """
+    return {
+        "datasource": "1__table",
+        "columns": ["country"],
+        "metrics": [metric(0)],
+        "filter": [{"col": "ds", "op": "TEMPORAL_RANGE", "val": "Last week"}],
+        "extras": {"having": "", "where": ""},
+        "row_limit": 10000,
+        "changed_on": datetime(2024, 1, 1),
+        "rls": [],
+        "extra_cache_keys": [],
+    }
+
+
+def large() -> dict[str, Any]:
+    """
+    A time series with many metrics, filters, RLS clauses and custom SQL.
+    """
+    return {
+        **simple(),
+        "columns": [f"dim_{i}" for i in range(10)],
+        "metrics": [metric(i) for i in range(20)],
+        "filter": [
+            {"col": f"dim_{i}", "op": "IN", "val": [f"value_{j}" for j in range(20)]}
+            for i in range(10)
+        ],
+        "extras": {
+            "where": " AND ".join(f"(col_{i} > {i})" for i in range(50)),
+            "time_grain_sqla": "P1D",
+        },
+        "rls": [f"tenant_id = {i}" for i in range(20)],
+        "post_processing": [
+            {
+                "operation": "pivot",
+                "options": {
+                    "index": ["__timestamp"],
+                    "columns": ["dim_0"],
+                    "aggregates": {
+                        f"SUM(num_{i})": {"operator": "mean"} for i in range(20)
+                    },
+                },
+            }
+        ],
+        "time_offsets": ["1 week ago", "1 year ago"],
+    }
+
+
+QUERIES: dict[str, Callable[[], dict[str, Any]]] = {
+    "simple": simple,
+    "large": large,
+}
+
+
+def is_available(algorithm: str) -> bool:
+    try:
+        hash_cache_key({}, algorithm=algorithm)  # type: ignore
+    except ValueError:
+        return False
+    return True
+
+
+@click.command()
+@click.option("--number", default=10_000, help="Number of cache keys per run.")
+@click.option(
+    "--query",
+    "queries",
+    multiple=True,
+    type=click.Choice(list(QUERIES)),
+    help="Query objects to hash (default: all).",
+)
+def main(number: int, queries: tuple[str, ...]) -> None:
+    app = Flask(__name__)
+    with app.app_context():
+        click.echo(f"{'query':>7} {'encoding':>10} {'algorithm':>9} {'µs/key':>8}")
+        for name in queries or QUERIES:
+            query = QUERIES[name]()
+            for legacy in (True, False):
+                app.config["CACHE_KEY_LEGACY_ENCODING"] = legacy
+                for algorithm in filter(is_available, ALGORITHMS):
+                    func = partial(
+                        hash_cache_key,
+                        query,
+                        ignore_nan=True,
+                        default=json_int_dttm_ser,
+                        algorithm=algorithm,
+                    )
+                    elapsed = min(timeit.repeat(func, number=number, repeat=3))
+                    click.echo(
+                        f"{name:>7} {'legacy' if legacy else 'canonical':>10} "
+                        f"{algorithm:>9} {elapsed / number * 1e6:8.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
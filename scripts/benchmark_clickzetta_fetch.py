@@ -0,0 +1,120 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare tuple and Arrow result fetching for ClickZetta.
+
+Each path runs in its own process, from a cursor that holds the result as Arrow
+record batches (the way the driver receives it), to a ``SupersetResultSet``. The
+tuple path converts the batches to rows, like ``fetchall``; the Arrow path hands
+the batches over directly.
+
+    python scripts/benchmark_clickzetta_fetch.py --rows 2000000
+"""
+
+import multiprocessing
+import resource
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+import click
+import numpy as np
+import psutil
+import pyarrow as pa
+
+from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+from superset.result_set import SupersetResultSet
+
+BATCH_SIZE = 65536
+
+
+def make_batches(rows: int) -> list[pa.RecordBatch]:
+    rng = np.random.default_rng(42)
+    start = datetime(2024, 1, 1)
+    batches = []
+    for offset in range(0, rows, BATCH_SIZE):
+        size = min(BATCH_SIZE, rows - offset)
+        batches.append(
+            pa.record_batch(
+                {
+                    "id": pa.array(np.arange(offset, offset + size)),
+                    "value": pa.array(rng.random(size)),
+                    "category": pa.array([f"category_{i % 100}" for i in range(size)]),
+                    "ts": pa.array(
+                        [start + timedelta(seconds=i) for i in range(size)],
+                        type=pa.timestamp("us"),
+                    ),
+                }
+            )
+        )
+    return batches
+
+
+class TupleCursor:
+    def __init__(self, batches: list[pa.RecordBatch]) -> None:
+        self.batches = batches
+        self.description = [
+            (name, None) + (None,) * 5 for name in batches[0].schema.names
+        ]
+
+    def fetchall(self) -> list[tuple]:
+        rows: list[tuple] = []
+        for batch in self.batches:
+            columns = [column.to_pylist() for column in batch.columns]
+            rows.extend(zip(*columns, strict=True))
+        return rows
+
+
+class ArrowCursor(TupleCursor):
+    def fetch_arrow_batches(self) -> Iterator[pa.RecordBatch]:
+        yield from self.batches
+
+
+def run(path: str, rows: int, queue: multiprocessing.Queue) -> None:
+    batches = make_batches(rows)
+    cursor = ArrowCursor(batches) if path == "arrow" else TupleCursor(batches)
+    baseline = psutil.Process().memory_info().rss
+
+    start = time.perf_counter()
+    data = ClickZettaEngineSpec.fetch_data(cursor)
+    result_set = SupersetResultSet(data, cursor.description, ClickZettaEngineSpec)
+    elapsed = time.perf_counter() - start
+
+    assert result_set.size == rows
+    # ru_maxrss is reported in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    queue.put((elapsed, max(peak - baseline, 0)))
+
+
+@click.command()
+@click.option("--rows", default=1_000_000, help="Number of rows in the result.")
+def main(rows: int) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    for path in ("tuples", "arrow"):
+        queue = ctx.Queue()
+        process = ctx.Process(target=run, args=(path, rows, queue))
+        process.start()
+        elapsed, peak = queue.get()
+        process.join()
+        click.echo(
+            f"{path:>6}: {rows / elapsed:>14,.0f} rows/sec, "
+            f"peak RSS +{peak / 1024**2:,.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
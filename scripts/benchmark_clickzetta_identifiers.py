@@ -0,0 +1,128 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare identifier handling for ClickZetta chart SQL.
+
+The old path compiled every identifier with backticks and then ran two regexes
+over each statement right before execution; the new path compiles identifiers
+correctly once. The ClickZetta driver is not required: MySQL's backtick-quoting
+preparer stands in for it.
+
+    python scripts/benchmark_clickzetta_identifiers.py --columns 200 --filters 50
+"""
+
+import re
+import time
+from typing import Any, Callable
+
+import click
+from sqlalchemy import and_, column, func, literal_column, select, table
+from sqlalchemy.dialects.mysql.base import MySQLDialect, MySQLIdentifierPreparer
+from sqlalchemy.sql import Select
+
+from superset.db_engine_specs.clickzetta import QuoteWhenRequiredMixin
+
+
+class AlwaysQuotePreparer(MySQLIdentifierPreparer):
+    def quote(self, ident: str, force: Any = None) -> str:
+        return self.quote_identifier(ident)
+
+
+class QuoteWhenRequiredPreparer(QuoteWhenRequiredMixin, AlwaysQuotePreparer):
+    pass
+
+
+def remove_backticks(sql: str) -> str:
+    """
+    The per-statement rewrite that used to run in ``before_cursor_execute``.
+    """
+    sql = re.sub(r"\x1b\[[0-9;]*m", "", sql)
+    sql = re.sub(r"`([^`]+)`", r"\1", sql)
+    return sql
+
+
+def build_query(columns: int, filters: int) -> Select:
+    """
+    Build a chart-like query: many group-bys and metrics, and large IN filters.
+    """
+    tbl = table("events", schema="analytics")
+    dimensions = [column(f"dim_{i}") for i in range(columns)]
+    metrics = [
+        func.sum(column(f"metric_{i}")).label(f"SUM(metric_{i})")
+        for i in range(columns)
+    ]
+    predicates = [
+        column(f"dim_{i}").in_([f"value `{j}`" for j in range(20)])
+        for i in range(filters)
+    ]
+    return (
+        select(*dimensions, *metrics)
+        .select_from(tbl)
+        .where(and_(*predicates))
+        .group_by(*dimensions)
+        .order_by(literal_column("1"))
+        .limit(10000)
+    )
+
+
+def make_dialect(preparer: type[MySQLIdentifierPreparer]) -> MySQLDialect:
+    dialect = MySQLDialect()
+    dialect.identifier_preparer = preparer(dialect)
+    return dialect
+
+
+def measure(func: Callable[[], str], iterations: int) -> tuple[float, str]:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sql = func()
+    return (time.perf_counter() - start) / iterations, sql
+
+
+@click.command()
+@click.option("--columns", default=100, help="Number of dimensions and metrics.")
+@click.option("--filters", default=20, help="Number of IN filters.")
+@click.option("--iterations", default=50, help="Number of runs per path.")
+def main(columns: int, filters: int, iterations: int) -> None:
+    query = build_query(columns, filters)
+    old_dialect = make_dialect(AlwaysQuotePreparer)
+    new_dialect = make_dialect(QuoteWhenRequiredPreparer)
+
+    def compile_sql(dialect: MySQLDialect) -> str:
+        return str(
+            query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        )
+
+    old_sql = compile_sql(old_dialect)
+    new_sql = compile_sql(new_dialect)
+    click.echo(f"Generated SQL: {len(new_sql):,} characters")
+
+    compile_old, _ = measure(lambda: compile_sql(old_dialect), iterations)
+    rewrite, rewritten = measure(lambda: remove_backticks(old_sql), iterations)
+    compile_new, _ = measure(lambda: compile_sql(new_dialect), iterations)
+
+    click.echo(f"old compile:  {compile_old * 1000:8.3f} ms")
+    click.echo(f"old rewrite:  {rewrite * 1000:8.3f} ms (per execution)")
+    click.echo(f"old total:    {(compile_old + rewrite) * 1000:8.3f} ms")
+    click.echo(f"new compile:  {compile_new * 1000:8.3f} ms (no rewrite)")
+    if rewritten != new_sql:
+        click.echo(
+            "note: the regex rewrite also altered backticks inside string literals"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the formats of the DataFrames stored in the data cache.
+
+Cache backends pickle the whole cache value, so each format is measured the same
+way: ``set`` covers serializing the DataFrame and pickling the value, ``get`` covers
+unpickling it and rebuilding the DataFrame:
+
+    python scripts/benchmark_data_cache.py --rows 10000 --rows 1000000
+"""
+
+import pickle
+import time
+from functools import partial
+from typing import Any, Callable, Optional
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset.utils.arrow import deserialize_dataframe, serialize_dataframe
+from superset.utils.compression import is_codec_available
+
+FORMATS: dict[str, Optional[str]] = {
+    "arrow": None,
+    "arrow+lz4": "lz4",
+    "arrow+zstd": "zstd",
+}
+
+
+def aggregated(rows: int) -> pd.DataFrame:
+    """
+    Dimensions and metrics, as returned by a grouped chart query.
+    """
+    rng = np.random.default_rng(42)
+    countries = np.array(["France", "Germany", "Brazil", "India", "Japan", "Kenya"])
+    return pd.DataFrame(
+        {
+            "__timestamp": pd.date_range("2020-01-01", periods=rows, freq="min"),
+            "country": countries[rng.integers(0, len(countries), rows)],
+            "city": [f"city_{i % 5000}" for i in range(rows)],
+            "count": rng.integers(0, 1_000_000, rows),
+            "SUM(revenue)": rng.random(rows) * 1000,
+        }
+    )
+
+
+def numeric(rows: int) -> pd.DataFrame:
+    """
+    Integer and float columns only.
+    """
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {f"metric_{i}": rng.random(rows) for i in range(5)}
+        | {f"count_{i}": rng.integers(0, 1000, rows) for i in range(5)}
+    )
+
+
+DATASETS: dict[str, Callable[[int], pd.DataFrame]] = {
+    "aggregated": aggregated,
+    "numeric": numeric,
+}
+
+
+def cache_set(df: pd.DataFrame, fmt: str) -> bytes:
+    value = df if fmt == "pickle" else serialize_dataframe(df, FORMATS[fmt])
+    return pickle.dumps({"df": value, "query": "SELECT 1"})
+
+
+def cache_get(blob: bytes, fmt: str) -> pd.DataFrame:
+    value = pickle.loads(blob)["df"]  # noqa: S301
+    return value if fmt == "pickle" else deserialize_dataframe(value)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()
+@click.option(
+    "--rows",
+    "row_counts",
+    multiple=True,
+    type=int,
+    help="Number of rows per dataset (default: 10k, 100k, 1M and 5M).",
+)
+@click.option("--repeat", default=3, help="Runs per measurement; the best is kept.")
+@click.option(
+    "--dataset",
+    "datasets",
+    multiple=True,
+    type=click.Choice(list(DATASETS)),
+    help="Datasets to run (default: all).",
+)
+def main(row_counts: tuple[int, ...], repeat: int, datasets: tuple[str, ...]) -> None:
+    click.echo(
+        f"{'dataset':>10} {'rows':>9} {'format':>10} {'size MiB':>9} "
+        f"{'set ms':>8} {'get ms':>8}"
+    )
+    for dataset in datasets or DATASETS:
+        for rows in row_counts or (10_000, 100_000, 1_000_000, 5_000_000):
+            df = DATASETS[dataset](rows)
+            for fmt in ("pickle", *FORMATS):
+                if (codec := FORMATS.get(fmt)) and not is_codec_available(codec):
+                    continue
+                blob = cache_set(df, fmt)
+                set_time = measure(partial(cache_set, df, fmt), repeat)
+                get_time = measure(partial(cache_get, blob, fmt), repeat)
+                click.echo(
+                    f"{dataset:>10} {rows:>9,} {fmt:>10} "
+                    f"{len(blob) / 1024**2:9.1f} "
+                    f"{set_time * 1000:8.1f} {get_time * 1000:8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
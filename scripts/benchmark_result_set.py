@@ -0,0 +1,181 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the columnar ``SupersetResultSet`` builder with the previous one.
+
+The previous builder copied the rows into a structured NumPy array, converted each
+column back to a list for Arrow, and stringified failing or nested columns one
+element at a time. Each builder and dataset runs in its own process, so that peak
+memory can be measured:
+
+    python scripts/benchmark_result_set.py --rows 200000
+"""
+
+import datetime
+import multiprocessing
+import resource
+import time
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pandas as pd
+import psutil
+import pyarrow as pa
+
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.result_set import dedup, stringify, SupersetResultSet
+
+
+def legacy_stringify_values(array: np.ndarray) -> np.ndarray:
+    result = np.copy(array)
+    with np.nditer(result, flags=["refs_ok"], op_flags=[["readwrite"]]) as it:
+        for obj in it:
+            if na_obj := pd.isna(obj):
+                obj[na_obj] = None
+            else:
+                try:
+                    obj[...] = obj.astype(str)
+                except ValueError:
+                    obj[...] = stringify(obj)
+    return result
+
+
+def legacy_table(data: list[tuple[Any, ...]], names: list[str]) -> pa.Table:
+    """
+    The row-based builder, as it was before the columnar one.
+    """
+    column_names = dedup(names)
+    array = np.array(data, dtype=[(name, "object") for name in column_names])
+    pa_data = []
+    for column in column_names:
+        try:
+            pa_data.append(pa.array(array[column].tolist()))
+        except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError, ValueError, TypeError):
+            pa_data.append(pa.array(legacy_stringify_values(array[column]).tolist()))
+
+    for i, column in enumerate(column_names):
+        if pa.types.is_nested(pa_data[i].type):
+            pa_data[i] = pa.array(legacy_stringify_values(array[column]).tolist())
+        elif pa.types.is_temporal(pa_data[i].type):
+            sample = next((item for item in array[column] if item), None)
+            if isinstance(sample, datetime.datetime) and sample.tzinfo:
+                series = pd.to_datetime(pd.Series(array[column]), utc=True)
+                pa_data[i] = pa.Array.from_pandas(
+                    series, type=pa.timestamp("ns", tz=sample.tzinfo)
+                )
+
+    return pa.Table.from_arrays(pa_data, names=column_names)
+
+
+def wide(rows: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """
+    100 numeric and string columns.
+    """
+    rng = np.random.default_rng(42)
+    columns: list[list[Any]] = []
+    for i in range(100):
+        if i % 3 == 0:
+            columns.append(rng.integers(0, 1_000_000, rows).tolist())
+        elif i % 3 == 1:
+            columns.append(rng.random(rows).tolist())
+        else:
+            columns.append([f"value_{j % 1000}" for j in range(rows)])
+    return [f"col_{i}" for i in range(100)], list(zip(*columns, strict=True))
+
+
+def nested(rows: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """
+    Arrays, maps and structs, plus a column mixing strings and numbers.
+    """
+    return ["id", "tags", "attributes", "mixed"], [
+        (
+            i,
+            [f"tag_{i % 7}", f"tag_{i % 11}"],
+            {"key": i, "nested": {"values": [i, i + 1]}},
+            f"label_{i}" if i % 10 else i,
+        )
+        for i in range(rows)
+    ]
+
+
+def timestamps(rows: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """
+    Timezone-aware and naive timestamps.
+    """
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    return ["id", "ts_utc", "ts_naive"], [
+        (
+            i,
+            start + datetime.timedelta(seconds=i),
+            (start + datetime.timedelta(seconds=i)).replace(tzinfo=None),
+        )
+        for i in range(rows)
+    ]
+
+
+DATASETS: dict[str, Callable[[int], tuple[list[str], list[tuple[Any, ...]]]]] = {
+    "wide": wide,
+    "nested": nested,
+    "timestamps": timestamps,
+}
+
+
+def run(builder: str, dataset: str, rows: int, queue: multiprocessing.Queue) -> None:
+    names, data = DATASETS[dataset](rows)
+    description = [(name, None, None, None, None, None, True) for name in names]
+    baseline = psutil.Process().memory_info().rss
+
+    start = time.perf_counter()
+    if builder == "legacy":
+        table = legacy_table(data, names)
+    else:
+        table = SupersetResultSet(data, description, BaseEngineSpec).table
+    elapsed = time.perf_counter() - start
+
+    assert table.num_rows == rows
+    # ru_maxrss is reported in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    queue.put((elapsed, max(peak - baseline, 0)))
+
+
+@click.command()
+@click.option("--rows", default=100_000, help="Number of rows per dataset.")
+@click.option(
+    "--dataset",
+    "datasets",
+    multiple=True,
+    type=click.Choice(list(DATASETS)),
+    help="Datasets to run (default: all).",
+)
+def main(rows: int, datasets: tuple[str, ...]) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    for dataset in datasets or DATASETS:
+        for builder in ("legacy", "columnar"):
+            queue = ctx.Queue()
+            process = ctx.Process(target=run, args=(builder, dataset, rows, queue))
+            process.start()
+            elapsed, peak = queue.get()
+            process.join()
+            click.echo(
+                f"{dataset:>10} {builder:>8}: {elapsed:8.3f} s, "
+                f"peak RSS +{peak / 1024**2:,.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare JSON and Arrow IPC responses for chart data and SQL Lab results.
+
+For chart data the input is the post-processed DataFrame, as returned by the query
+context; for SQL Lab it's the Arrow table read from the results backend. Each path is
+timed from that input to the response body:
+
+    python scripts/benchmark_result_transport.py --rows 100000 --rows 1000000
+"""
+
+import time
+from functools import partial
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from superset import dataframe
+from superset.result_set import SupersetResultSet
+from superset.utils import json
+from superset.utils.arrow import df_to_arrow, write_arrow_streams
+
+
+def timeseries(rows: int) -> pd.DataFrame:
+    """
+    A time series with a dimension and a few metrics, as plotted by charts.
+    """
+    rng = np.random.default_rng(42)
+    return pd.DataFrame(
+        {
+            "__timestamp": pd.date_range("2020-01-01", periods=rows, freq="min"),
+            "country": rng.choice(["FR", "DE", "BR", "IN", "JP"], rows),
+            "count": rng.integers(0, 10_000, rows),
+            "sum__revenue": rng.random(rows) * 1000,
+            "avg__latency": np.where(rng.random(rows) < 0.1, np.nan, rng.random(rows)),
+        }
+    )
+
+
+def chart_json(df: pd.DataFrame) -> bytes:
+    data = df.to_dict(orient="records")
+    return json.dumps(
+        {"result": [{"data": data, "rowcount": len(df)}]},
+        default=json.json_int_dttm_ser,
+        ignore_nan=True,
+    ).encode("utf-8")
+
+
+def chart_arrow(df: pd.DataFrame) -> bytes:
+    return write_arrow_streams([(df_to_arrow(df), {"rowcount": len(df)})]).to_pybytes()
+
+
+def sqllab_json(table: pa.Table) -> bytes:
+    df = SupersetResultSet.convert_table_to_df(table)
+    data = dataframe.df_to_records(df)
+    return json.dumps(
+        {"data": data, "status": "success"},
+        default=json.pessimistic_json_iso_dttm_ser,
+        ignore_nan=True,
+    ).encode("utf-8")
+
+
+def sqllab_arrow(table: pa.Table) -> bytes:
+    return write_arrow_streams(
+        [(table, {"status": "success"})],
+        default=json.pessimistic_json_iso_dttm_ser,
+    ).to_pybytes()
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(func())
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+
+@click.command()
+@click.option(
+    "--rows",
+    "row_counts",
+    multiple=True,
+    type=int,
+    help="Number of rows (default: 100000).",
+)
+@click.option("--repeat", default=3, help="Runs per measurement; the best is kept.")
+def main(row_counts: tuple[int, ...], repeat: int) -> None:
+    click.echo(
+        f"{'endpoint':>8} {'rows':>9} {'format':>6} {'time':>9} "
+        f"{'rows/s':>12} {'size':>10}"
+    )
+    for rows in row_counts or (100_000,):
+        df = timeseries(rows)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        paths: list[tuple[str, str, Callable[[], Any]]] = [
+            ("chart", "json", partial(chart_json, df)),
+            ("chart", "arrow", partial(chart_arrow, df)),
+            ("sqllab", "json", partial(sqllab_json, table)),
+            ("sqllab", "arrow", partial(sqllab_arrow, table)),
+        ]
+        for endpoint, result_format, func in paths:
+            elapsed, size = measure(func, repeat)
+            click.echo(
+                f"{endpoint:>8} {rows:>9,} {result_format:>6} {elapsed:8.3f}s "
+                f"{rows / elapsed:12,.0f} {size / 1024**2:8.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
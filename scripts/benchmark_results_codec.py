@@ -0,0 +1,169 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the codecs available for the results backend.
+
+Each dataset is written the way async SQL Lab results are stored (an Arrow IPC
+stream inside a compressed msgpack payload) and read back, with every codec and with
+and without Arrow IPC buffer compression. Throughput is relative to the size of the
+uncompressed payload:
+
+    python scripts/benchmark_results_codec.py --rows 200000
+"""
+
+import datetime
+import time
+from functools import partial
+from typing import Any, Callable, Optional
+
+import click
+import msgpack
+import numpy as np
+import pyarrow as pa
+
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.result_set import SupersetResultSet
+from superset.utils.compression import (
+    compress_results,
+    decompress_results,
+    is_codec_available,
+)
+
+CODECS = ["zlib", "zstd", "lz4", "none"]
+
+
+def numeric(rows: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """
+    Integer and float measures, with low and high cardinality.
+    """
+    rng = np.random.default_rng(42)
+    columns = [
+        rng.integers(0, 100, rows).tolist(),
+        rng.integers(0, 1_000_000_000, rows).tolist(),
+        rng.random(rows).round(2).tolist(),
+        rng.random(rows).tolist(),
+    ]
+    return ["small_int", "big_int", "price", "ratio"], list(zip(*columns, strict=True))
+
+
+def strings(rows: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """
+    Dimension-like strings, plus free text.
+    """
+    countries = ["France", "Germany", "Brazil", "India", "Japan", "Kenya"]
+    return ["country", "city", "comment"], [
+        (
+            countries[i % len(countries)],
+            f"city_{i % 5000}",
+            f"order {i} shipped on time, customer note #{i * 7919 % 10007}",
+        )
+        for i in range(rows)
+    ]
+
+
+def events(rows: int) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """
+    Timestamps, identifiers and nullable values, as in an event log.
+    """
+    start = datetime.datetime(2024, 1, 1)
+    return ["ts", "user_id", "event", "value"], [
+        (
+            start + datetime.timedelta(seconds=i * 13),
+            i % 20_000,
+            ("click", "view", "purchase")[i % 3],
+            None if i % 4 else i * 0.5,
+        )
+        for i in range(rows)
+    ]
+
+
+DATASETS: dict[str, Callable[[int], tuple[list[str], list[tuple[Any, ...]]]]] = {
+    "numeric": numeric,
+    "strings": strings,
+    "events": events,
+}
+
+
+def serialize(table: pa.Table, ipc_compression: Optional[str]) -> bytes:
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=ipc_compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return msgpack.dumps({"data": sink.getvalue().to_pybytes()}, use_bin_type=True)
+
+
+def write(table: pa.Table, ipc_compression: Optional[str], codec: str) -> bytes:
+    return compress_results(serialize(table, ipc_compression), codec=codec)
+
+
+def read(blob: bytes) -> pa.Table:
+    payload = msgpack.loads(decompress_results(blob, decode=False), raw=False)
+    return pa.ipc.open_stream(pa.BufferReader(payload["data"])).read_all()
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()
+@click.option("--rows", default=100_000, help="Number of rows per dataset.")
+@click.option("--repeat", default=3, help="Runs per measurement; the best is kept.")
+@click.option(
+    "--dataset",
+    "datasets",
+    multiple=True,
+    type=click.Choice(list(DATASETS)),
+    help="Datasets to run (default: all).",
+)
+def main(rows: int, repeat: int, datasets: tuple[str, ...]) -> None:
+    click.echo(
+        f"{'dataset':>8} {'ipc':>5} {'codec':>5} {'ratio':>7} "
+        f"{'write MB/s':>10} {'read MB/s':>10}"
+    )
+    for dataset in datasets or DATASETS:
+        names, data = DATASETS[dataset](rows)
+        description = [(name, None, None, None, None, None, True) for name in names]
+        table = SupersetResultSet(data, description, BaseEngineSpec).pa_table
+        raw_size = len(serialize(table, None))
+
+        for ipc_compression in (None, "zstd", "lz4"):
+            if ipc_compression and not is_codec_available(ipc_compression):
+                continue
+            for codec in CODECS:
+                if not is_codec_available(codec):
+                    continue
+                # throughput includes serialization, relative to the raw payload
+                blob = write(table, ipc_compression, codec)
+                write_time = measure(
+                    partial(write, table, ipc_compression, codec), repeat
+                )
+                read_time = measure(partial(read, blob), repeat)
+                click.echo(
+                    f"{dataset:>8} {ipc_compression or '-':>5} {codec:>5} "
+                    f"{raw_size / len(blob):7.2f} "
+                    f"{raw_size / write_time / 1024**2:10,.0f} "
+                    f"{raw_size / read_time / 1024**2:10,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
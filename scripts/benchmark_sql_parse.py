@@ -0,0 +1,125 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the time spent parsing the SQL of a dashboard, with and without the cache
+of parsed scripts.
+
+Each chart of the dashboard parses the SQL of its virtual dataset the way a chart
+data request does: to check access, extract tables, detect mutations, and apply RLS
+and a limit:
+
+    python scripts/benchmark_sql_parse.py --charts 60 --datasets 25
+"""
+
+import time
+
+import click
+from sqlglot import parse_one
+
+from superset.sql.parse import (
+    get_parsed_script_cache,
+    RLSMethod,
+    SQLScript,
+    SQLStatement,
+    Table,
+)
+
+
+def dataset_sql(i: int) -> str:
+    """
+    The SQL of a virtual dataset, joining facts to dimensions and aggregating them.
+    """
+    return f"""
+WITH daily AS (
+  SELECT
+    DATE_TRUNC('day', o.created_at) AS day,
+    c.country,
+    p.category,
+    SUM(o.amount) AS revenue,
+    COUNT(DISTINCT o.customer_id) AS customers
+  FROM sales.orders_{i} AS o
+  JOIN sales.customers AS c ON o.customer_id = c.id
+  JOIN sales.products AS p ON o.product_id = p.id
+  WHERE o.created_at >= '2024-01-01'
+    AND o.status IN ('paid', 'shipped')
+    AND c.country <> 'XX'
+  GROUP BY 1, 2, 3
+)
+SELECT
+  day,
+  country,
+  category,
+  revenue,
+  customers,
+  SUM(revenue) OVER (
+    PARTITION BY country ORDER BY day ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
+  ) AS revenue_7d
+FROM daily
+WHERE revenue > 0
+-- the most recent days first
+ORDER BY day DESC, revenue DESC
+"""  # noqa: S608
+
+
+def chart_data_request(sql: str, engine: str) -> None:
+    """
+    Parse the SQL of a dataset as many times as a chart data request does.
+    """
+    # access checks
+    SQLScript(sql, engine).statements[0].tables  # noqa: B018
+    # mutation detection
+    SQLScript(sql, engine).has_mutation()
+    # RLS
+    statement = SQLStatement(sql, engine)
+    statement.apply_rls(
+        None,
+        "sales",
+        {Table("customers", "sales"): [parse_one("tenant_id = 1")]},
+        RLSMethod.AS_SUBQUERY,
+    )
+    # limit
+    statement = SQLStatement(sql, engine)
+    statement.set_limit_value(10_000)
+    statement.format()
+
+
+@click.command()
+@click.option("--charts", default=60, help="Number of charts in the dashboard.")
+@click.option("--datasets", default=25, help="Number of distinct virtual datasets.")
+@click.option("--engine", default="postgresql", help="Engine of the database.")
+@click.option("--loads", default=5, help="Number of times the dashboard is loaded.")
+def main(charts: int, datasets: int, engine: str, loads: int) -> None:
+    sqls = [dataset_sql(i % datasets) for i in range(charts)]
+    cache = get_parsed_script_cache()
+
+    click.echo(f"{'cache size':>10} {'ms/load':>9} {'hits':>6} {'misses':>6}")
+    for cache_size in (0, 512):
+        cache.clear()
+        cache.hits = cache.misses = 0
+        cache.max_entries = cache_size
+        start = time.perf_counter()
+        for _ in range(loads):
+            for sql in sqls:
+                chart_data_request(sql, engine)
+        elapsed = (time.perf_counter() - start) / loads
+        click.echo(
+            f"{cache_size:>10} {elapsed * 1e3:9.1f} {cache.hits:>6} {cache.misses:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
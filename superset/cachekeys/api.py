@@ -25,6 +25,12 @@ from marshmallow.exceptions import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 
 from superset.cachekeys.schemas import CacheInvalidationRequestSchema
+from superset.common.utils.cache_generation import (
+    bump_database_generations,
+    bump_datasource_generations,
+    CacheGenerationError,
+)
+from superset.common.utils.query_cache_manager import QueryCacheManager
 from superset.connectors.sqla.models import SqlaTable
 from superset.extensions import cache_manager, db, event_logger, stats_logger_manager
 from superset.models.cache import CacheKey
@@ -53,15 +59,21 @@ class CacheRestApi(BaseSupersetModelRestApi):
         """
         Take a list of datasources, find and invalidate the associated cache records
         and remove the database records.
+
+        The cache generations of the datasources, and of the databases if any, are
+        bumped, which invalidates their cached query results even when the cache
+        keys are not stored in the metadata database.
         ---
         post:
           summary: Invalidate cache records and remove the database records
           description: >-
             Takes a list of datasources, finds and invalidates the associated cache
-            records and removes the database records.
+            records and removes the database records. Passing database ids
+            invalidates the cached results of all their datasources.
           requestBody:
             description: >-
-              A list of datasources uuid or the tuples of database and datasource names
+              A list of datasources uuid or the tuples of database and datasource
+              names, and a list of database ids
             required: true
             content:
               application/json:
@@ -93,6 +105,14 @@ class CacheRestApi(BaseSupersetModelRestApi):
             if ds_obj:
                 datasource_uids.add(ds_obj.uid)
 
+        try:
+            bump_datasource_generations(datasource_uids)
+            bump_database_generations(datasources.get("database_ids", []))
+        except CacheGenerationError as ex:
+            logger.error(ex, exc_info=True)
+            return self.response_500(str(ex))
+
+        QueryCacheManager.invalidate_local(datasource_uids)
         cache_key_objs = (
             db.session.query(CacheKey)
             .filter(CacheKey.datasource_uid.in_(datasource_uids))
@@ -55,3 +55,10 @@ class CacheInvalidationRequestSchema(Schema):
         fields.Nested(Datasource),
         metadata={"description": "A list of the data source and database names"},
     )
+    database_ids = fields.List(
+        fields.Integer(),
+        metadata={
+            "description": "A list of database ids, whose data sources are all "
+            "invalidated"
+        },
+    )
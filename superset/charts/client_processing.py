@@ -35,6 +35,7 @@ from flask_babel import gettext as __
 
 from superset.common.chart_data import ChartDataResultFormat
 from superset.extensions import event_logger
+from superset.utils.arrow import df_to_arrow
 from superset.utils.core import (
     extract_dataframe_dtypes,
     get_column_names,
@@ -263,7 +264,7 @@ def pivot_table_v2(
     """
     Pivot table v2.
     """
-    verbose_map = datasource.data["verbose_map"] if datasource else None
+    verbose_map = datasource.get_data_field("verbose_map") if datasource else None
 
     return pivot_df(
         df,
@@ -340,6 +341,8 @@ def apply_client_processing(  # noqa: C901
 
         if query["result_format"] == ChartDataResultFormat.JSON:
             df = pd.DataFrame.from_dict(data)
+        elif query["result_format"] == ChartDataResultFormat.ARROW:
+            df = data.to_pandas()
         elif query["result_format"] == ChartDataResultFormat.CSV:
             # Use custom NA values configuration for
             # reports to avoid unwanted conversions
@@ -353,7 +356,7 @@ def apply_client_processing(  # noqa: C901
 
         # convert all columns to verbose (label) name
         if datasource:
-            df.rename(columns=datasource.data["verbose_map"], inplace=True)
+            df.rename(columns=datasource.get_data_field("verbose_map"), inplace=True)
 
         processed_df = post_processor(df, form_data, datasource)
 
@@ -392,5 +395,9 @@ def apply_client_processing(  # noqa: C901
             processed_df.to_csv(buf, index=show_default_index)
             buf.seek(0)
             query["data"] = buf.getvalue()
+        elif query["result_format"] == ChartDataResultFormat.ARROW:
+            query["data"] = df_to_arrow(
+                processed_df.reset_index() if show_default_index else processed_df
+            )
 
     return result
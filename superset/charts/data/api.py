@@ -51,13 +51,19 @@ from superset.exceptions import QueryObjectValidationError
 from superset.extensions import event_logger
 from superset.models.sql_lab import Query
 from superset.utils import json
+from superset.utils.arrow import accepts_arrow, write_arrow_streams
 from superset.utils.core import (
     create_zip,
     DatasourceType,
     get_user_id,
 )
 from superset.utils.decorators import logs_context
-from superset.views.base import CsvResponse, generate_download_headers, XlsxResponse
+from superset.views.base import (
+    ArrowResponse,
+    CsvResponse,
+    generate_download_headers,
+    XlsxResponse,
+)
 from superset.views.base_api import statsd_metrics
 
 if TYPE_CHECKING:
@@ -119,6 +125,10 @@ class ChartDataRestApi(ChartRestApi):
                 application/json:
                   schema:
                     $ref: "#/components/schemas/ChartDataResponseSchema"
+                application/vnd.apache.arrow.stream:
+                  schema:
+                    type: string
+                    format: binary
             202:
               description: Async job details
               content:
@@ -152,6 +162,7 @@ class ChartDataRestApi(ChartRestApi):
         json_body["result_format"] = request.args.get(
             "format", ChartDataResultFormat.JSON
         )
+        self._negotiate_result_format(json_body)
         json_body["result_type"] = request.args.get("type", ChartDataResultType.FULL)
         json_body["force"] = request.args.get("force")
 
@@ -226,6 +237,10 @@ class ChartDataRestApi(ChartRestApi):
                 application/json:
                   schema:
                     $ref: "#/components/schemas/ChartDataResponseSchema"
+                application/vnd.apache.arrow.stream:
+                  schema:
+                    type: string
+                    format: binary
             202:
               description: Async job details
               content:
@@ -249,6 +264,7 @@ class ChartDataRestApi(ChartRestApi):
         if json_body is None:
             return self.response_400(message=_("Request is not JSON"))
 
+        self._negotiate_result_format(json_body)
         try:
             query_context = self._create_query_context_from_form(json_body)
             command = ChartDataCommand(query_context)
@@ -314,6 +330,10 @@ class ChartDataRestApi(ChartRestApi):
                 application/json:
                   schema:
                     $ref: "#/components/schemas/ChartDataResponseSchema"
+                application/vnd.apache.arrow.stream:
+                  schema:
+                    type: string
+                    format: binary
             400:
               $ref: '#/components/responses/400'
             401:
@@ -330,6 +350,7 @@ class ChartDataRestApi(ChartRestApi):
             # Set form_data in Flask Global as it is used as a fallback
             # for async queries with jinja context
             g.form_data = cached_data
+            self._negotiate_result_format(cached_data)
             query_context = self._create_query_context_from_form(cached_data)
             command = ChartDataCommand(query_context)
             command.validate()
@@ -446,8 +467,33 @@ class ChartDataRestApi(ChartRestApi):
             resp.headers["Content-Type"] = "application/json; charset=utf-8"
             return resp
 
+        if result_format == ChartDataResultFormat.ARROW:
+            is_guest_user = security_manager.is_guest_user()
+            results = []
+            for query in result["queries"]:
+                metadata = {
+                    key: value
+                    for key, value in query.items()
+                    # the index is dropped from the data, as in JSON records
+                    if key not in {"data", "indexnames"}
+                    and not (is_guest_user and key == "query")
+                }
+                results.append((query.get("data"), metadata))
+            with event_logger.log_context(f"{self.__class__.__name__}.arrow_ipc"):
+                response_data = write_arrow_streams(results)
+            return ArrowResponse(response_data.to_pybytes(), status=200)
+
         return self.response_400(message=f"Unsupported result_format: {result_format}")
 
+    @staticmethod
+    def _negotiate_result_format(form_data: dict[str, Any]) -> None:
+        """
+        Return Arrow IPC streams instead of JSON to clients that prefer them.
+        """
+        result_format = form_data.get("result_format", ChartDataResultFormat.JSON)
+        if result_format == ChartDataResultFormat.JSON and accepts_arrow(request):
+            form_data["result_format"] = ChartDataResultFormat.ARROW
+
     def _log_is_cached(
         self,
         result: dict[str, Any],
@@ -0,0 +1,127 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import logging
+
+import click
+from flask.cli import with_appcontext
+
+from superset.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@with_appcontext
+@click.option(
+    "--datasource-uid",
+    "-u",
+    "datasource_uids",
+    multiple=True,
+    help="UID of a datasource to invalidate, eg, 42__table",
+)
+@click.option(
+    "--database",
+    "-d",
+    "database_names",
+    multiple=True,
+    help="Name of a database whose datasources are all invalidated",
+)
+def invalidate_cache(
+    datasource_uids: tuple[str, ...],
+    database_names: tuple[str, ...],
+) -> None:
+    """Invalidate the cached query results of datasources or databases"""
+    # pylint: disable=import-outside-toplevel
+    from superset.common.utils.cache_generation import (
+        bump_database_generations,
+        bump_datasource_generations,
+    )
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+    from superset.models.core import Database
+
+    if not datasource_uids and not database_names:
+        raise click.UsageError("Pass at least one datasource UID or database name")
+
+    databases = (
+        db.session.query(Database)
+        .filter(Database.database_name.in_(database_names))
+        .all()
+    )
+    if missing := set(database_names) - {database.name for database in databases}:
+        raise click.BadParameter(
+            f"Unknown databases: {', '.join(sorted(missing))}",
+            param_hint="--database",
+        )
+
+    bump_datasource_generations(datasource_uids)
+    bump_database_generations(database.id for database in databases)
+    QueryCacheManager.invalidate_local(set(datasource_uids))
+    logger.info(
+        "Invalidated the cache of %s datasources and %s databases",
+        len(datasource_uids),
+        len(databases),
+    )
+
+
+@click.command()
+@with_appcontext
+@click.option(
+    "--warmed-at",
+    "-w",
+    required=True,
+    help="When the predictive cache warm up ran, in UTC, eg, '2024-01-31 07:30'",
+)
+@click.option(
+    "--end",
+    "-e",
+    default=None,
+    help="End of the period of the report (default: one day after the warm up)",
+)
+@click.option("--top-n", default=100, help="The top_n of the warm up")
+@click.option("--lookback-days", default=28, help="The lookback_days of the warm up")
+@click.option(
+    "--hours",
+    default=None,
+    help="The hours of the warm up, comma separated, eg, 8,9,10,11",
+)
+@click.option("--window-hours", default=4, help="The window_hours of the warm up")
+@click.option("--half-life-days", default=7.0, help="The half_life_days of the warm up")
+def cache_warmup_report(  # pylint: disable=too-many-arguments
+    warmed_at: str,
+    end: str | None,
+    top_n: int,
+    lookback_days: int,
+    hours: str | None,
+    window_hours: int,
+    half_life_days: float,
+) -> None:
+    """Report the cache hit rate of the charts warmed up by the predictive strategy"""
+    # pylint: disable=import-outside-toplevel
+    from superset.tasks.cache import PredictiveStrategy
+    from superset.utils import json
+    from superset.utils.date_parser import parse_human_datetime
+
+    strategy = PredictiveStrategy(
+        top_n=top_n,
+        lookback_days=lookback_days,
+        hours=[int(hour) for hour in hours.split(",")] if hours else None,
+        window_hours=window_hours,
+        half_life_days=half_life_days,
+        now=parse_human_datetime(warmed_at),
+    )
+    report = strategy.get_report(parse_human_datetime(end) if end else None)
+    click.echo(json.dumps(report, indent=2))
@@ -20,6 +20,7 @@ from typing import Any, cast, Optional, Union
 
 from flask import g
 
+from superset.charts.schemas import ChartDataQueryContextSchema
 from superset.commands.base import BaseCommand
 from superset.commands.chart.data.get_data_command import ChartDataCommand
 from superset.commands.chart.exceptions import (
@@ -36,15 +37,29 @@ from superset.viz import viz_types
 
 
 class ChartWarmUpCacheCommand(BaseCommand):
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         chart_or_id: Union[int, Slice],
         dashboard_id: Optional[int],
         extra_filters: Optional[str],
+        force: bool = True,
+        query_context: Optional[dict[str, Any]] = None,
     ):
+        """
+        :param chart_or_id: The chart, or its ID
+        :param dashboard_id: The dashboard whose filters are applied to the chart
+        :param extra_filters: Filters applied instead of the ones of the dashboard
+        :param force: Whether to run the queries even if their results are cached
+        :param query_context: A query context for the chart, as sent to the chart
+            data API, to run instead of the one saved with the chart
+        """
         self._chart_or_id = chart_or_id
         self._dashboard_id = dashboard_id
         self._extra_filters = extra_filters
+        self._force = force
+        self._query_context = query_context
+        # whether the data of the chart was already cached, once run
+        self.is_cached = False
 
     def _get_dashboard_filters(self, chart_id: int) -> list[dict[str, Any]]:
         """Retrieve dashboard filters from extra_filters or dashboard metadata."""
@@ -71,33 +86,43 @@ class ChartWarmUpCacheCommand(BaseCommand):
             datasource_type=chart.datasource.type,
             datasource_id=chart.datasource.id,
             form_data=form_data,
-            force=True,
+            force=self._force,
         ).get_payload()
         delattr(g, "form_data")
 
+        self.is_cached = bool(payload.get("is_cached"))
         return payload["errors"] or None, payload["status"]
 
     def _warm_up_non_legacy_cache(self, chart: Slice) -> tuple[Any, Any]:
         """Warm up cache for non-legacy visualizations."""
-        query_context = chart.get_query_context()
+        if self._query_context is not None:
+            query_context = ChartDataQueryContextSchema().load(self._query_context)
+        else:
+            query_context = chart.get_query_context()
 
         if not query_context:
             raise ChartInvalidError("Chart's query context does not exist")
 
         # Apply dashboard filters if dashboard_id is provided
-        if dashboard_filters := self._get_dashboard_filters(chart.id):
+        if self._query_context is None and (
+            dashboard_filters := self._get_dashboard_filters(chart.id)
+        ):
             for query in query_context.queries:
                 query.filter.extend(
                     cast(list[QueryObjectFilterClause], dashboard_filters)
                 )
 
-        query_context.force = True
+        query_context.force = self._force
         command = ChartDataCommand(query_context)
         command.validate()
         payload = command.run()
+        query_results = cast(list[dict[str, Any]], payload["queries"])
+        self.is_cached = all(
+            query_result.get("is_cached") for query_result in query_results
+        )
 
         # Report the first error.
-        for query_result in cast(list[dict[str, Any]], payload["queries"]):
+        for query_result in query_results:
             error = query_result.get("error")
             status = query_result.get("status")
             if error is not None:
@@ -112,7 +137,7 @@ class ChartWarmUpCacheCommand(BaseCommand):
         try:
             form_data = get_form_data(chart.id, use_slice_data=True)[0]
 
-            if form_data.get("viz_type") in viz_types:
+            if self._query_context is None and form_data.get("viz_type") in viz_types:
                 error, status = self._warm_up_legacy_cache(chart, form_data)
             else:
                 error, status = self._warm_up_non_legacy_cache(chart)
@@ -28,7 +28,7 @@ from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SerializationError, SupersetErrorException
 from superset.models.sql_lab import Query
 from superset.sqllab.utils import apply_display_max_row_configuration_if_require
-from superset.utils import core as utils
+from superset.utils.compression import decompress_results
 from superset.utils.dates import now_as_float
 from superset.views.utils import _deserialize_results_payload
 
@@ -38,6 +38,10 @@ logger = logging.getLogger(__name__)
 class SqlExecutionResultsCommand(BaseCommand):
     _key: str
     _rows: int | None
+    _chunk: int | None
+    _as_arrow: bool
+    _offset: int
+    _columns: list[str] | None
     _blob: Any
     _query: Query
 
@@ -45,9 +49,17 @@ class SqlExecutionResultsCommand(BaseCommand):
         self,
         key: str,
         rows: int | None = None,
+        chunk: int | None = None,
+        as_arrow: bool = False,
+        offset: int = 0,
+        columns: list[str] | None = None,
     ) -> None:
         self._key = key
         self._rows = rows
+        self._chunk = chunk
+        self._as_arrow = as_arrow
+        self._offset = offset
+        self._columns = columns
 
     def validate(self) -> None:
         if not results_backend:
@@ -83,6 +95,8 @@ class SqlExecutionResultsCommand(BaseCommand):
                 status=404,
             )
 
+        self._validate_columns()
+
         # Now fetch results from backend (query exists, so this is a valid request)
         read_from_results_backend_start = now_as_float()
         self._blob = results_backend.get(self._key)
@@ -120,17 +134,45 @@ class SqlExecutionResultsCommand(BaseCommand):
                 status=410,
             )
 
+    def _validate_columns(self) -> None:
+        # the columns of the results are known for queries run since they're stored
+        if self._columns is None or not (
+            result_columns := self._query.extra.get("columns")
+        ):
+            return
+
+        names = {
+            column.get("column_name", column.get("name")) for column in result_columns
+        }
+        if unknown := [name for name in self._columns if name not in names]:
+            raise SupersetErrorException(
+                SupersetError(
+                    message=__(
+                        "Columns not found in the results: %(columns)s",
+                        columns=", ".join(unknown),
+                    ),
+                    error_type=SupersetErrorType.COLUMN_DOES_NOT_EXIST_ERROR,
+                    level=ErrorLevel.ERROR,
+                ),
+                status=400,
+            )
+
     def run(
         self,
     ) -> dict[str, Any]:
         """Runs arbitrary sql and returns data as json"""
         self.validate()
-        payload = utils.zlib_decompress(
-            self._blob, decode=not results_backend_use_msgpack
-        )
+        payload = decompress_results(self._blob, decode=not results_backend_use_msgpack)
         try:
             obj = _deserialize_results_payload(
-                payload, self._query, cast(bool, results_backend_use_msgpack)
+                payload,
+                self._query,
+                cast(bool, results_backend_use_msgpack),
+                rows=self._rows,
+                chunk=self._chunk,
+                as_arrow=self._as_arrow,
+                offset=self._offset,
+                columns=self._columns,
             )
         except SerializationError as ex:
             raise SupersetErrorException(
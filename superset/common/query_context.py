@@ -20,6 +20,8 @@ import logging
 from typing import Any, ClassVar, TYPE_CHECKING
 
 import pandas as pd
+import pyarrow as pa
+from flask import current_app
 
 from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
 from superset.common.query_context_processor import QueryContextProcessor
@@ -87,7 +89,7 @@ class QueryContext:
         self,
         df: pd.DataFrame,
         coltypes: list[GenericDataType],
-    ) -> str | list[dict[str, Any]]:
+    ) -> str | list[dict[str, Any]] | pa.Table:
         return self._processor.get_data(df, coltypes)
 
     def get_payload(
@@ -118,6 +120,27 @@ class QueryContext:
             return self.slice_.cache_timeout
         return self.datasource.cache_timeout
 
+    def get_stale_cache_timeout(self) -> int | None:
+        """
+        Get for how long results are served after their cache timeout, while they
+        are refreshed in the background.
+
+        Priority order:
+        1. Chart-level `stale_cache_timeout` parameter
+        2. Datasource-level `stale_cache_timeout` in its extra
+        3. System default (`DATA_CACHE_STALE_TIMEOUT`)
+        """
+        if (
+            self.slice_
+            and (timeout := self.slice_.params_dict.get("stale_cache_timeout"))
+            is not None
+        ):
+            return timeout
+        extra = getattr(self.datasource, "extra_dict", None) or {}
+        if (timeout := extra.get("stale_cache_timeout")) is not None:
+            return timeout
+        return current_app.config["DATA_CACHE_STALE_TIMEOUT"]
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> str | None:
         return self._processor.query_cache_key(query_obj, **kwargs)
 
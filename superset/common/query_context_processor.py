@@ -18,16 +18,20 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import partial
 from typing import Any, cast, ClassVar, Sequence, TYPE_CHECKING
 
 import pandas as pd
+import pyarrow as pa
 from flask import current_app
 from flask_babel import gettext as _
 
 from superset.common.chart_data import ChartDataResultFormat
 from superset.common.db_query_status import QueryStatus
 from superset.common.query_actions import get_query_results
+from superset.common.utils.cache_generation import get_cache_generation
 from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.common.utils.single_flight import single_flight
 from superset.common.utils.time_range_utils import get_since_until_from_time_range
 from superset.constants import CACHE_DISABLED_TIMEOUT, CacheRegion
 from superset.daos.annotation_layer import AnnotationLayerDAO
@@ -41,7 +45,9 @@ from superset.extensions import cache_manager, security_manager
 from superset.models.helpers import QueryResult
 from superset.superset_typing import AdhocColumn, AdhocMetric
 from superset.utils import csv, excel
+from superset.utils.arrow import df_to_arrow
 from superset.utils.cache import generate_cache_key, set_and_log_cache
+from superset.utils.concurrency import run_concurrently
 from superset.utils.core import (
     DatasourceType,
     DTTM_ALIAS,
@@ -49,9 +55,12 @@ from superset.utils.core import (
     GenericDataType,
     get_column_names_from_columns,
     get_column_names_from_metrics,
+    get_user_id,
     is_adhoc_column,
     is_adhoc_metric,
 )
+from superset.utils.hashing import hash_cache_key
+from superset.utils.json import json_int_dttm_ser
 from superset.utils.pandas_postprocessing.utils import unescape_separator
 from superset.views.utils import get_viz
 from superset.viz import viz_types
@@ -71,10 +80,12 @@ class QueryContextProcessor:
 
     _query_context: QueryContext
     _qc_datasource: Explorable
+    _datasource_cache_keys: dict[str, Any] | None
 
     def __init__(self, query_context: QueryContext):
         self._query_context = query_context
         self._qc_datasource = query_context.datasource
+        self._datasource_cache_keys = None
 
     cache_type: ClassVar[str] = "df"
     enforce_numerical_metrics: ClassVar[bool] = True
@@ -96,40 +107,30 @@ class QueryContextProcessor:
             region=CacheRegion.DATA,
             force_query=force_query,
             force_cached=force_cached,
+            datasource_uid=self._qc_datasource.uid,
         )
+        if (
+            cache_key
+            and cache.is_stale
+            and not (
+                (stale_timeout := self.get_stale_cache_timeout())
+                and self._refresh_stale_cache(stale_timeout)
+            )
+        ):
+            # the stale result can't be served while it's refreshed
+            cache = QueryCacheManager()
 
         if query_obj and cache_key and not cache.is_loaded:
-            try:
-                if invalid_columns := [
-                    col
-                    for col in get_column_names_from_columns(query_obj.columns)
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if (
-                        col not in self._qc_datasource.column_names
-                        and col != DTTM_ALIAS
-                    )
-                ]:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in dataset: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
-                        )
-                    )
-
-                query_result = self.get_query_result(query_obj)
-                annotation_data = self.get_annotation_data(query_obj)
-                cache.set_query_result(
-                    key=cache_key,
-                    query_result=query_result,
-                    annotation_data=annotation_data,
-                    force_query=force_query,
-                    timeout=self.get_cache_timeout(),
-                    datasource_uid=self._qc_datasource.uid,
-                    region=CacheRegion.DATA,
-                )
-            except QueryObjectValidationError as ex:
-                cache.error_message = str(ex)
-                cache.status = QueryStatus.FAILED
+            with single_flight(
+                cache_key,
+                enabled=not force_query,
+                cache_timeout=timeout,
+            ) as cached:
+                if cached is not None:
+                    # an identical query was run and cached by another worker
+                    cache = cached
+                else:
+                    self._load_query_result(query_obj, cache, cache_key, force_query)
 
         # the N-dimensional DataFrame has converted into flat DataFrame
         # by `flatten operator`, "comma" in the column is escaped by `escape_separator`
@@ -189,6 +190,7 @@ class QueryContextProcessor:
             "annotation_data": cache.annotation_data,
             "error": cache.error_message,
             "is_cached": cache.is_cached,
+            "is_stale": cache.is_stale,
             "query": cache.query,
             "status": cache.status,
             "stacktrace": cache.stacktrace,
@@ -199,6 +201,49 @@ class QueryContextProcessor:
             "label_map": label_map,
         }
 
+    def _load_query_result(
+        self,
+        query_obj: QueryObject,
+        cache: QueryCacheManager,
+        cache_key: str,
+        force_query: bool,
+    ) -> None:
+        """Run the query and cache its result"""
+        try:
+            if invalid_columns := [
+                col
+                for col in get_column_names_from_columns(query_obj.columns)
+                + get_column_names_from_metrics(query_obj.metrics or [])
+                if (col not in self._qc_datasource.column_names and col != DTTM_ALIAS)
+            ]:
+                raise QueryObjectValidationError(
+                    _(
+                        "Columns missing in dataset: %(invalid_columns)s",
+                        invalid_columns=invalid_columns,
+                    )
+                )
+
+            query_result = self.get_query_result(query_obj)
+            annotation_data = self.get_annotation_data(query_obj)
+            timeout = self.get_cache_timeout()
+            stale_after = None
+            if timeout > 0 and (stale_timeout := self.get_stale_cache_timeout()):
+                # keep the result for longer, to serve it while it's refreshed
+                timeout, stale_after = timeout + stale_timeout, timeout
+            cache.set_query_result(
+                key=cache_key,
+                query_result=query_result,
+                annotation_data=annotation_data,
+                force_query=force_query,
+                timeout=timeout,
+                datasource_uid=self._qc_datasource.uid,
+                region=CacheRegion.DATA,
+                stale_after=stale_after,
+            )
+        except QueryObjectValidationError as ex:
+            cache.error_message = str(ex)
+            cache.status = QueryStatus.FAILED
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> str | None:
         """
         Returns a QueryObject cache key for objects in self.queries
@@ -208,10 +253,8 @@ class QueryContextProcessor:
 
         cache_key = (
             query_obj.cache_key(
-                datasource=datasource.uid,
                 extra_cache_keys=extra_cache_keys,
-                rls=security_manager.get_rls_cache_key(datasource),
-                changed_on=datasource.changed_on,
+                **self.get_datasource_cache_keys(),
                 **kwargs,
             )
             if query_obj
@@ -219,6 +262,37 @@ class QueryContextProcessor:
         )
         return cache_key
 
+    def get_datasource_cache_keys(self) -> dict[str, Any]:
+        """
+        Returns the parts of the QueryObject cache keys that only depend on the
+        datasource, computed once for all the queries and time offsets
+
+        Unless the legacy encoding of cache keys is enabled, the parts are hashed
+        into a single one, so that they are only serialized once.
+        """
+        if self._datasource_cache_keys is None:
+            datasource = self._qc_datasource
+            cache_keys: dict[str, Any] = {
+                "datasource": datasource.uid,
+                "rls": security_manager.get_rls_cache_key(datasource),
+                "changed_on": datasource.changed_on,
+            }
+            if generation := get_cache_generation(
+                datasource.uid, getattr(datasource, "database_id", None)
+            ):
+                cache_keys["cache_generation"] = generation
+
+            if not current_app.config["CACHE_KEY_LEGACY_ENCODING"]:
+                cache_keys = {
+                    "datasource": datasource.uid,
+                    "datasource_key": hash_cache_key(
+                        cache_keys, default=json_int_dttm_ser
+                    ),
+                }
+            self._datasource_cache_keys = cache_keys
+
+        return self._datasource_cache_keys
+
     def get_query_result(self, query_object: QueryObject) -> QueryResult:
         """
         Returns a pandas dataframe based on the query object.
@@ -231,11 +305,14 @@ class QueryContextProcessor:
 
     def get_data(
         self, df: pd.DataFrame, coltypes: list[GenericDataType]
-    ) -> str | list[dict[str, Any]]:
+    ) -> str | list[dict[str, Any]] | pa.Table:
+        if self._query_context.result_format == ChartDataResultFormat.ARROW:
+            return df_to_arrow(df)
+
         if self._query_context.result_format in ChartDataResultFormat.table_like():
             include_index = not isinstance(df.index, pd.RangeIndex)
             columns = list(df.columns)
-            verbose_map = self._qc_datasource.data.get("verbose_map", {})
+            verbose_map = self._qc_datasource.get_data_field("verbose_map")
             if verbose_map:
                 df.columns = [verbose_map.get(column, column) for column in columns]
 
@@ -335,15 +412,23 @@ class QueryContextProcessor:
                 )
             ]
 
-        query_results = [
-            get_query_results(
-                query_obj.result_type or self._query_context.result_type,
-                self._query_context,
-                query_obj,
-                force_cached,
-            )
-            for query_obj in self._query_context.queries
-        ]
+        # load the relationships of the datasource before the queries run in other
+        # threads, which must not lazy load them from the session of this one
+        for attr in ("database", "columns", "metrics"):
+            getattr(self._qc_datasource, attr, None)
+
+        query_results = run_concurrently(
+            [
+                partial(
+                    get_query_results,
+                    query_obj.result_type or self._query_context.result_type,
+                    self._query_context,
+                    query_obj,
+                    force_cached,
+                )
+                for query_obj in self._query_context.queries
+            ]
+        )
 
         return_value = {"queries": query_results}
 
@@ -378,6 +463,46 @@ class QueryContextProcessor:
             return data_cache_timeout
         return current_app.config["CACHE_DEFAULT_TIMEOUT"]
 
+    def get_stale_cache_timeout(self) -> int | None:
+        return self._query_context.get_stale_cache_timeout()
+
+    def _refresh_stale_cache(self, stale_timeout: int) -> bool:
+        """
+        Refresh the stale cached results of the query context in the background,
+        with a Celery task.
+
+        The task runs all the queries of the query context, so the refresh is
+        claimed once for the query context, rather than for each stale result. The
+        claim is per user, as results may differ between users, eg, with RLS.
+
+        :returns: Whether the results are being refreshed, so that they can be
+            served meanwhile
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.tasks.async_queries import refresh_chart_data_cache
+
+        if (user_id := get_user_id()) is None:
+            # the task can't run as guest or anonymous users
+            return False
+
+        stats_logger = current_app.config["STATS_LOGGER"]
+        refresh_key = self.cache_key(user_id=user_id)
+        if QueryCacheManager.claim_refresh(refresh_key, stale_timeout):
+            try:
+                refresh_chart_data_cache.delay(
+                    {"user_id": user_id},
+                    self._query_context.cache_values,
+                    refresh_key,
+                )
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Could not refresh cache key %s: %s", refresh_key, ex)
+                QueryCacheManager.release_refresh(refresh_key)
+                return False
+            stats_logger.incr("data_cache.stale.refresh")
+
+        stats_logger.incr("data_cache.stale.hit")
+        return True
+
     def cache_key(self, **extra: Any) -> str:
         """
         The QueryContext cache key is made out of the key/values from
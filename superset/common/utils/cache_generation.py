@@ -0,0 +1,139 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Generations of the cached query results of datasources and databases.
+
+Each datasource and database has a generation, stored in the data cache, which is
+part of the cache keys of their query results. Bumping a generation invalidates all
+the results of a datasource, or of all the datasources of a database, at once: their
+cache keys change, and the previous entries are left to expire.
+
+Generations can be evicted like any other entry. A missing generation is replaced
+with a new one, rather than dropped from the cache keys, so that the results it
+invalidated can't be matched again.
+
+Generations are read once per request, however many query contexts it processes.
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+from collections.abc import Iterable
+from typing import Any
+
+from flask import current_app, g, has_request_context
+
+from superset.extensions import cache_manager
+
+logger = logging.getLogger(__name__)
+
+DATASOURCE_PREFIX = "cache_generation:datasource:"
+DATABASE_PREFIX = "cache_generation:database:"
+
+
+class CacheGenerationError(Exception):
+    pass
+
+
+def _datasource_key(datasource_uid: str) -> str:
+    return f"{DATASOURCE_PREFIX}{datasource_uid}"
+
+
+def _database_key(database_id: int) -> str:
+    return f"{DATABASE_PREFIX}{database_id}"
+
+
+def get_cache_generation(
+    datasource_uid: str,
+    database_id: int | None = None,
+) -> list[str | None] | None:
+    """
+    Get the generations of a datasource and of its database.
+
+    Both are read in a single round trip to the data cache.
+
+    Missing generations, never set or evicted, are set to new ones first.
+
+    :param datasource_uid: The UID of the datasource
+    :param database_id: The ID of the database of the datasource, if any
+    :returns: The generations to add to the cache key, or None if they can't be
+        stored (or generations are disabled), so that the cache key is unchanged
+    """
+    if not current_app.config["DATA_CACHE_GENERATIONS"]:
+        return None
+
+    request_cache: dict[tuple[str, int | None], list[str | None] | None] = (
+        g.setdefault("cache_generations", {}) if has_request_context() else {}
+    )
+    if (key := (datasource_uid, database_id)) not in request_cache:
+        request_cache[key] = _get_cache_generation(datasource_uid, database_id)
+    return request_cache[key]
+
+
+def _get_cache_generation(
+    datasource_uid: str,
+    database_id: int | None,
+) -> list[str | None] | None:
+    keys = [_datasource_key(datasource_uid)]
+    if database_id is not None:
+        keys.append(_database_key(database_id))
+
+    try:
+        generations = cache_manager.data_cache.get_many(*keys)
+        if None in generations:
+            for key, generation in zip(keys, generations, strict=True):
+                if generation is None:
+                    # another worker may have set it in the meantime
+                    cache_manager.data_cache.add(key, secrets.token_hex(8), timeout=0)
+            generations = cache_manager.data_cache.get_many(*keys)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Could not read the cache generations of %s", datasource_uid)
+        return None
+
+    # eg, a NullCache, which doesn't cache results either
+    if None in generations:
+        return None
+    return list(generations)
+
+
+def _bump(keys: list[str]) -> None:
+    if not keys:
+        return
+
+    # Generations are random rather than incremented, so that bumping them needs
+    # neither a read nor an atomic increment from the cache backend
+    values: dict[str, Any] = {key: secrets.token_hex(8) for key in keys}
+    if has_request_context():
+        g.pop("cache_generations", None)
+    if len(cache_manager.data_cache.set_many(values, timeout=0)) < len(values):
+        raise CacheGenerationError("Could not store the cache generations")
+    current_app.config["STATS_LOGGER"].incr("data_cache.generation.bump")
+
+
+def bump_datasource_generations(datasource_uids: Iterable[str]) -> None:
+    """
+    Invalidate the cached query results of datasources.
+    """
+    _bump([_datasource_key(uid) for uid in set(datasource_uids)])
+
+
+def bump_database_generations(database_ids: Iterable[int]) -> None:
+    """
+    Invalidate the cached query results of all the datasources of databases.
+    """
+    _bump([_database_key(database_id) for database_id in set(database_ids)])
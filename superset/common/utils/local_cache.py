@@ -0,0 +1,182 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Per-process cache of query results, in front of the data cache.
+
+Entries are evicted in least recently used order to stay within a budget in bytes,
+and expire after a timeout. They are tagged with the UID of their datasource, so
+that they can be invalidated when it changes.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from flask import current_app
+from pandas import DataFrame
+
+_instance: LocalCache | None = None
+_instance_lock = threading.Lock()
+
+
+@dataclass
+class LocalCacheEntry:
+    value: dict[str, Any]
+    size: int
+    expires: float
+    datasource_uid: str | None
+
+
+def estimate_size(value: dict[str, Any]) -> int:
+    """
+    Estimate the memory used by a cache value, in bytes.
+
+    DataFrames and serialized DataFrames account for most of it; other values are
+    counted shallowly.
+    """
+    size = sys.getsizeof(value)
+    for item in value.values():
+        if isinstance(item, DataFrame):
+            size += int(item.memory_usage(index=True, deep=True).sum())
+        else:
+            size += sys.getsizeof(item)
+    return size
+
+
+class LocalCache:
+    """
+    A thread-safe LRU cache bounded by the size of its values.
+    """
+
+    def __init__(self, max_bytes: int, timeout: int) -> None:
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, LocalCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Get a value, if present and not expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: dict[str, Any],
+        timeout: int | None = None,
+        datasource_uid: str | None = None,
+    ) -> None:
+        """
+        Add a value, evicting the least recently used ones if needed.
+
+        :param key: The cache key
+        :param value: The cache value
+        :param timeout: Time to live of the value in the data cache, in seconds; the
+            value expires from this cache no later than that
+        :param datasource_uid: UID of the datasource of the value
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        ttl = min(self.timeout, timeout) if timeout else self.timeout
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self.size + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = LocalCacheEntry(
+                value=value,
+                size=size,
+                expires=time.monotonic() + ttl,
+                datasource_uid=datasource_uid,
+            )
+            self.size += size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self, datasource_uids: set[str]) -> int:
+        """
+        Remove the values of datasources.
+
+        :returns: The number of removed values
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if entry.datasource_uid in datasource_uids
+            ]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: str) -> None:
+        self.size -= self._entries.pop(key).size
+
+
+def get_local_cache() -> LocalCache | None:
+    """
+    Get the cache of this process, if enabled by ``DATA_CACHE_LOCAL_MAX_BYTES``.
+    """
+    global _instance  # pylint: disable=global-statement
+
+    max_bytes = current_app.config["DATA_CACHE_LOCAL_MAX_BYTES"]
+    timeout = current_app.config["DATA_CACHE_LOCAL_TIMEOUT"]
+    if not max_bytes:
+        return None
+
+    with _instance_lock:
+        if (
+            _instance is None
+            or _instance.max_bytes != max_bytes
+            or _instance.timeout != timeout
+        ):
+            _instance = LocalCache(max_bytes, timeout)
+        return _instance
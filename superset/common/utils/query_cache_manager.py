@@ -17,19 +17,28 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta
 from typing import Any
 
+import pyarrow as pa
 from flask import current_app
 from flask_caching import Cache
+from flask_caching.backends import NullCache
 from pandas import DataFrame
 
 from superset.common.db_query_status import QueryStatus
+from superset.common.utils.local_cache import get_local_cache
 from superset.constants import CacheRegion
 from superset.exceptions import CacheLoadError
 from superset.extensions import cache_manager
 from superset.models.helpers import QueryResult
 from superset.stats_logger import BaseStatsLogger
 from superset.superset_typing import Column
+from superset.utils.arrow import (
+    deserialize_dataframe,
+    is_serialized_dataframe,
+    serialize_dataframe,
+)
 from superset.utils.cache import set_and_log_cache
 from superset.utils.core import error_msg_from_exception, get_stacktrace
 
@@ -67,6 +76,7 @@ class QueryCacheManager:
         cache_dttm: str | None = None,
         cache_value: dict[str, Any] | None = None,
         sql_rowcount: int | None = None,
+        is_stale: bool = False,
     ) -> None:
         self.df = df
         self.query = query
@@ -83,6 +93,7 @@ class QueryCacheManager:
         self.cache_dttm = cache_dttm
         self.cache_value = cache_value
         self.sql_rowcount = sql_rowcount
+        self.is_stale = is_stale
 
     # pylint: disable=too-many-arguments
     def set_query_result(
@@ -94,9 +105,13 @@ class QueryCacheManager:
         timeout: int | None = None,
         datasource_uid: str | None = None,
         region: CacheRegion = CacheRegion.DEFAULT,
+        stale_after: int | None = None,
     ) -> None:
         """
         Set dataframe of query-result to specific cache region
+
+        :param stale_after: Number of seconds after which the result is stale, when
+            it's cached for longer to be served while being refreshed
         """
         try:
             self.status = query_result.status
@@ -118,7 +133,9 @@ class QueryCacheManager:
                 self.is_loaded = True
 
             value = {
-                "df": self.df,
+                "df": self._serialize_df(self.df)
+                if region == CacheRegion.DATA
+                else self.df,
                 "query": self.query,
                 "applied_template_filters": self.applied_template_filters,
                 "applied_filter_columns": self.applied_filter_columns,
@@ -126,6 +143,8 @@ class QueryCacheManager:
                 "annotation_data": self.annotation_data,
                 "sql_rowcount": self.sql_rowcount,
             }
+            if stale_after is not None:
+                value["stale_after"] = stale_after
             if self.is_loaded and key and self.status != QueryStatus.FAILED:
                 self.set(
                     key=key,
@@ -148,21 +167,32 @@ class QueryCacheManager:
         region: CacheRegion = CacheRegion.DEFAULT,
         force_query: bool | None = False,
         force_cached: bool | None = False,
+        columns: list[str] | None = None,
+        datasource_uid: str | None = None,
     ) -> QueryCacheManager:
         """
         Initialize QueryCacheManager by query-cache key
+
+        :param columns: Only read these columns of the cached DataFrame, if it was
+            stored as Arrow
+        :param datasource_uid: UID of the datasource, to invalidate the value when
+            it's kept in the local cache
         """
         query_cache = cls()
         if not key or not _cache[region] or force_query:
             return query_cache
 
-        if cache_value := _cache[region].get(key):
+        if cache_value := cls._get_value(key, region, datasource_uid):
             logger.debug("Cache key: %s", key)
             # Log cache hit for debugging
             logger.debug("CACHE GET - Key: %s, Region: %s", key, region)
             current_app.config["STATS_LOGGER"].incr("loading_from_cache")
             try:
-                query_cache.df = cache_value["df"]
+                df = cache_value["df"]
+                if is_serialized_dataframe(df):
+                    df = deserialize_dataframe(df, columns)
+                    cache_value = {**cache_value, "df": df}
+                query_cache.df = df
                 query_cache.query = cache_value["query"]
                 query_cache.annotation_data = cache_value.get("annotation_data", {})
                 query_cache.applied_template_filters = cache_value.get(
@@ -182,8 +212,9 @@ class QueryCacheManager:
                     cache_value["dttm"] if cache_value is not None else None
                 )
                 query_cache.cache_value = cache_value
+                query_cache.is_stale = cls._is_stale(cache_value)
                 current_app.config["STATS_LOGGER"].incr("loaded_from_cache")
-            except KeyError as ex:
+            except (KeyError, ValueError, pa.ArrowException) as ex:
                 logger.exception(ex)
                 logger.error(
                     "Error reading cache: %s",
@@ -199,6 +230,69 @@ class QueryCacheManager:
             raise CacheLoadError("Error loading data from cache")
         return query_cache
 
+    @staticmethod
+    def _is_stale(cache_value: dict[str, Any]) -> bool:
+        """
+        Check if a cached value is past its soft timeout.
+        """
+        stale_after = cache_value.get("stale_after")
+        if stale_after is None or "dttm" not in cache_value:
+            return False
+
+        cached = datetime.fromisoformat(cache_value["dttm"])
+        return datetime.utcnow() >= cached + timedelta(seconds=stale_after)
+
+    @staticmethod
+    def _get_value(
+        key: str,
+        region: CacheRegion,
+        datasource_uid: str | None,
+    ) -> dict[str, Any] | None:
+        """
+        Get a cache value, from the local cache first for the data region.
+        """
+        local_cache = get_local_cache() if region == CacheRegion.DATA else None
+        if local_cache is None:
+            return _cache[region].get(key)
+
+        stats_logger = current_app.config["STATS_LOGGER"]
+        if cache_value := local_cache.get(key):
+            stats_logger.incr("data_cache.l1.hit")
+            if isinstance(cache_value["df"], DataFrame):
+                # pickled DataFrames are shared by the readers of the local cache
+                cache_value = {**cache_value, "df": cache_value["df"].copy()}
+            return cache_value
+
+        stats_logger.incr("data_cache.l1.miss")
+        if cache_value := _cache[region].get(key):
+            stats_logger.incr("data_cache.l2.hit")
+            local_cache.set(
+                key,
+                cache_value,
+                cache_value.get("cache_timeout"),
+                datasource_uid,
+            )
+        else:
+            stats_logger.incr("data_cache.l2.miss")
+        return cache_value
+
+    @staticmethod
+    def _serialize_df(df: DataFrame) -> DataFrame | bytes:
+        """
+        Serialize a DataFrame for the data cache, as configured.
+        """
+        if current_app.config["DATA_CACHE_DATAFRAME_FORMAT"] != "arrow":
+            return df
+
+        try:
+            return serialize_dataframe(
+                df, current_app.config["DATA_CACHE_ARROW_COMPRESSION"]
+            )
+        except (pa.ArrowException, ValueError) as ex:
+            logger.debug("Caching the pickled DataFrame: %s", ex)
+            current_app.config["STATS_LOGGER"].incr("data_cache.dataframe_pickled")
+            return df
+
     @staticmethod
     def set(
         key: str | None,
@@ -210,8 +304,27 @@ class QueryCacheManager:
         """
         set value to specify cache region, proxy for `set_and_log_cache`
         """
-        if key:
-            set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
+        if not key:
+            return
+
+        local_cache = get_local_cache() if region == CacheRegion.DATA else None
+        if local_cache is not None:
+            # so that other processes know when to expire the value from their cache
+            timeout = (
+                timeout
+                if timeout is not None
+                else current_app.config["CACHE_DEFAULT_TIMEOUT"]
+            )
+            value = {**value, "cache_timeout": timeout}
+
+        cached_value = set_and_log_cache(
+            _cache[region], key, value, timeout, datasource_uid
+        )
+        if local_cache is not None and cached_value is not None:
+            if isinstance(cached_value.get("df"), DataFrame):
+                # the writer keeps using its DataFrame, eg, renaming its columns
+                cached_value = {**cached_value, "df": cached_value["df"].copy()}
+            local_cache.set(key, cached_value, timeout, datasource_uid)
 
     @staticmethod
     def delete(
@@ -220,6 +333,8 @@ class QueryCacheManager:
     ) -> None:
         if key:
             _cache[region].delete(key)
+            if region == CacheRegion.DATA and (local_cache := get_local_cache()):
+                local_cache.delete(key)
 
     @staticmethod
     def has(
@@ -227,3 +342,57 @@ class QueryCacheManager:
         region: CacheRegion = CacheRegion.DEFAULT,
     ) -> bool:
         return bool(_cache[region].get(key)) if key else False
+
+    @staticmethod
+    def is_null_cache(region: CacheRegion = CacheRegion.DEFAULT) -> bool:
+        """Check if nothing is cached in the region (`NullCache`)"""
+        return isinstance(_cache[region].cache, NullCache)
+
+    @staticmethod
+    def invalidate_local(datasource_uids: set[str]) -> None:
+        """Remove the values of datasources from the local cache of this process"""
+        if local_cache := get_local_cache():
+            count = local_cache.invalidate(datasource_uids)
+            logger.debug("Removed %s values from the local cache", count)
+
+    @staticmethod
+    def acquire_lease(
+        key: str,
+        timeout: int,
+        region: CacheRegion = CacheRegion.DATA,
+    ) -> bool:
+        """
+        Take the lease on running the query of a key, so that it runs only once.
+
+        :param key: The cache key of the query
+        :param timeout: Number of seconds after which the lease expires
+        :param region: The cache region
+        :returns: Whether the lease was taken by the caller
+        """
+        return bool(_cache[region].add(f"{key}-lease", True, timeout))
+
+    @staticmethod
+    def is_leased(key: str, region: CacheRegion = CacheRegion.DATA) -> bool:
+        """Check if the lease on running the query of a key is held"""
+        return bool(_cache[region].get(f"{key}-lease"))
+
+    @staticmethod
+    def release_lease(key: str, region: CacheRegion = CacheRegion.DATA) -> None:
+        """Release the lease on running the query of a key"""
+        _cache[region].delete(f"{key}-lease")
+
+    @staticmethod
+    def claim_refresh(key: str, timeout: int) -> bool:
+        """
+        Claim the refresh of a stale value, so that it's refreshed only once.
+
+        :param key: The cache key of the value
+        :param timeout: Number of seconds after which the claim expires
+        :returns: Whether the refresh was claimed by the caller
+        """
+        return bool(_cache[CacheRegion.DATA].add(f"{key}-refresh", True, timeout))
+
+    @staticmethod
+    def release_refresh(key: str) -> None:
+        """Release the claim on the refresh of a value"""
+        _cache[CacheRegion.DATA].delete(f"{key}-refresh")
@@ -0,0 +1,123 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Single-flight execution of identical queries across workers.
+
+The first worker to miss the cache for a key takes a lease on it, and runs the
+query. Workers missing the cache for the same key while the lease is held wait for
+the result to be cached, instead of running the query again.
+
+The lease is an entry of the data cache, added atomically next to the result, so
+taking it doesn't touch the metastore nor the session of the request.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from flask import current_app
+
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.constants import CACHE_DISABLED_TIMEOUT, CacheRegion
+from superset.utils.dates import now_as_float
+
+logger = logging.getLogger(__name__)
+
+
+def wait_for_query_result(
+    key: str,
+    region: CacheRegion = CacheRegion.DATA,
+) -> QueryCacheManager | None:
+    """
+    Wait for the worker holding the lease on a key to cache its result.
+
+    :param key: The cache key
+    :param region: The cache region
+    :returns: The cached result, or None if the lease was released without caching
+        a result (eg, the query failed) or the wait timed out
+    """
+    config = current_app.config
+    deadline = time.monotonic() + config["DATA_CACHE_SINGLE_FLIGHT_TIMEOUT"]
+    while time.monotonic() < deadline:
+        time.sleep(config["DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL"])
+        cache = QueryCacheManager.get(key, region)
+        if cache.is_loaded:
+            return cache
+
+        if not QueryCacheManager.is_leased(key, region):
+            # the result may have been cached right before the lease was released
+            cache = QueryCacheManager.get(key, region)
+            return cache if cache.is_loaded else None
+
+    return None
+
+
+@contextmanager
+def single_flight(
+    key: str,
+    region: CacheRegion = CacheRegion.DATA,
+    enabled: bool = True,
+    cache_timeout: int | None = None,
+) -> Iterator[QueryCacheManager | None]:
+    """
+    Deduplicate the execution of a query missing the cache.
+
+    Yields None when the caller should run the query and cache its result, while
+    holding the lease on the key if it could be taken. Yields the cached result when
+    another worker held the lease and cached it in time.
+
+    :param key: The cache key of the query
+    :param region: The cache region
+    :param enabled: Whether to deduplicate the query, eg, not when it's forced
+    :param cache_timeout: The cache timeout of the result of the query
+    """
+    config = current_app.config
+    if (
+        not enabled
+        or not config["DATA_CACHE_SINGLE_FLIGHT"]
+        # the result won't be cached, so waiters would run the query anyway
+        or cache_timeout == CACHE_DISABLED_TIMEOUT
+        # waiters could never read the result
+        or QueryCacheManager.is_null_cache(region)
+    ):
+        yield None
+        return
+
+    stats_logger = config["STATS_LOGGER"]
+    # waiters stop waiting when the lease expires
+    timeout = math.ceil(config["DATA_CACHE_SINGLE_FLIGHT_TIMEOUT"])
+    if QueryCacheManager.acquire_lease(key, timeout, region):
+        stats_logger.incr("data_cache.single_flight.lease")
+        try:
+            yield None
+        finally:
+            QueryCacheManager.release_lease(key, region)
+        return
+
+    start = now_as_float()
+    cache = wait_for_query_result(key, region)
+    stats_logger.timing("data_cache.single_flight.wait_time", now_as_float() - start)
+    if cache is None:
+        logger.debug("No result for cache key %s, running query", key)
+        stats_logger.incr("data_cache.single_flight.fallback")
+    else:
+        stats_logger.incr("data_cache.single_flight.hit")
+    yield cache
@@ -168,6 +168,16 @@ NATIVE_FILTER_DEFAULT_ROW_LIMIT = 1000
 # max rows retrieved by filter select auto complete
 FILTER_SELECT_ROW_LIMIT = 10000
 
+# Number of threads running the queries of a chart data request concurrently: its
+# query objects, or the time comparisons of a query object. 1 runs them one after
+# another. The threads share the datasource and its relationships, which are bound to
+# the SQLAlchemy session of the request; that session isn't thread-safe, so only
+# enable this once the datasources in use don't lazy load through it.
+CHART_DATA_MAX_WORKERS = 1
+# Maximum number of queries run concurrently on a database by these threads, per
+# process
+CHART_DATA_MAX_QUERIES_PER_DATABASE = 4
+
 # SupersetClient HTTP retry configuration
 # Controls retry behavior for all HTTP requests made through SupersetClient
 # This helps handle transient server errors (like 502 Bad Gateway) automatically
@@ -225,6 +235,16 @@ HASH_ALGORITHM: Literal["md5", "sha256"] = "sha256"
 # Set to empty list to disable fallback (strict mode - only use HASH_ALGORITHM)
 HASH_ALGORITHM_FALLBACKS: list[Literal["md5", "sha256"]] = ["md5"]
 
+# Hash algorithm of the cache keys of chart data and other cached values, defaults
+# to HASH_ALGORITHM when None. Cache keys aren't persisted, so faster algorithms
+# can be used: 'blake2b', or 'xxh3_128' if the `xxhash` package is installed.
+CACHE_KEY_HASH_ALGORITHM: Literal["md5", "sha256", "blake2b", "xxh3_128"] | None = None
+
+# Cache keys are hashed from a canonical serialization of the query, and the parts
+# that only depend on the dataset are hashed once per request. Set to True to keep
+# the cache keys of previous versions, eg, to keep the cache warm during an upgrade.
+CACHE_KEY_LEGACY_ENCODING = False
+
 # ---------------------------------------------------------
 
 # Your App secret key. Make sure you override it on superset_config.py
@@ -862,6 +882,16 @@ EXTRA_SEQUENTIAL_COLOR_SCHEMES: list[dict[str, Any]] = []
 # CACHE_WARMUP_EXECUTORS = [ExecutorType.OWNER, FixedExecutor("admin")]
 CACHE_WARMUP_EXECUTORS = [ExecutorType.OWNER]
 
+# Warm up the cache in the Celery workers, which run the queries of the charts
+# directly, instead of sending a request per chart to the web servers. Charts are
+# warmed up in batches of CACHE_WARMUP_BATCH_SIZE per Celery task, and
+# CACHE_WARMUP_MAX_WORKERS at a time in each task, while
+# CHART_DATA_MAX_QUERIES_PER_DATABASE bounds the queries run on each database.
+# Charts whose data is already cached are skipped.
+CACHE_WARMUP_IN_WORKER = True
+CACHE_WARMUP_BATCH_SIZE = 50
+CACHE_WARMUP_MAX_WORKERS = 4
+
 # ---------------------------------------------------
 # Thumbnail config (behind feature flag)
 # ---------------------------------------------------
@@ -953,9 +983,71 @@ CACHE_DEFAULT_TIMEOUT = int(timedelta(days=1).total_seconds())
 # Default cache for Superset objects
 CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
+# Number of seconds for which the row level security filters of each set of roles and
+# table are kept in the cache above, in addition to the duration of a request. They
+# are invalidated when RLS filters are modified through the ORM; filters modified
+# directly in the metadata database only apply once they expire. The cache must be
+# shared by the processes, eg, Redis: filters are never cached across requests with a
+# NullCache or a SimpleCache. None disables the cache across requests.
+RLS_FILTERS_CACHE_TIMEOUT: int | None = None
+
+# The permissions of each set of roles are compiled with a single query, and kept in
+# the cache above and in the memory of each process, PERMISSIONS_LOCAL_CACHE_SIZE sets
+# of roles at most for PERMISSIONS_LOCAL_CACHE_TIMEOUT seconds. They are invalidated
+# when roles or permissions are modified through the ORM or the security manager.
+# The cache must be shared by the processes, eg, Redis: permissions are never cached
+# with a NullCache or a SimpleCache. None disables the cache, checking each
+# permission in the metadata database.
+PERMISSIONS_CACHE_TIMEOUT: int | None = None
+PERMISSIONS_LOCAL_CACHE_SIZE = 128
+PERMISSIONS_LOCAL_CACHE_TIMEOUT = 60
+
+# The payloads of the datasets of a dashboard, trimmed to its charts, are kept in the
+# cache above, keyed on when the dashboard, datasets, databases and charts were last
+# changed. None disables the cache.
+DASHBOARD_DATASETS_CACHE_TIMEOUT: int | None = int(timedelta(days=1).total_seconds())
+
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
+# Format of the query results (DataFrames) stored in the data cache. 'arrow' stores
+# them as Arrow IPC streams, which are faster to read and write than pickled pandas
+# objects; 'pickle' stores the DataFrames as they are. DataFrames that can't be
+# converted to Arrow, eg, with columns of mixed types, are always pickled. Both
+# formats are read regardless of this setting, but older versions only read pickled
+# DataFrames: only switch to 'arrow' once every web server and worker is upgraded.
+DATA_CACHE_DATAFRAME_FORMAT: Literal["arrow", "pickle"] = "pickle"
+# Compression of the Arrow buffers of cached DataFrames: 'lz4', 'zstd' or None
+DATA_CACHE_ARROW_COMPRESSION: Literal["lz4", "zstd"] | None = "lz4"
+
+# Number of seconds for which chart data is still served from the cache after its
+# cache timeout, flagged as `is_stale`, while a Celery task refreshes it. The cache
+# timeout becomes a soft timeout, and stale data is never served once this window
+# has passed. Datasets and charts can override it with a `stale_cache_timeout` key
+# in their `extra` and `params`, respectively. None (or 0) disables it: viewers wait
+# for the query once the cache timeout has passed.
+DATA_CACHE_STALE_TIMEOUT: int | None = None
+
+# Per-process cache of chart data in front of the data cache, to skip the network
+# round trip and unpickling of the values recently read or written by the process.
+# Values are evicted in least recently used order to keep the cache under
+# DATA_CACHE_LOCAL_MAX_BYTES (0 disables it), and expire after
+# DATA_CACHE_LOCAL_TIMEOUT seconds, or with their data cache entry if earlier. Values
+# are removed when their dataset is updated or its cache is invalidated, but only in
+# the process doing so: keep the timeout short when running several processes.
+DATA_CACHE_LOCAL_MAX_BYTES = 0
+DATA_CACHE_LOCAL_TIMEOUT = int(timedelta(minutes=1).total_seconds())
+
+# Run identical chart data queries only once when they are requested at the same
+# time, eg, by everyone opening a popular dashboard: the first request takes a lease
+# on the cache key, in the data cache, and the other requests, from any web or Celery
+# worker sharing the data cache, wait for its result to be cached while holding their
+# worker. Waiters give up after DATA_CACHE_SINGLE_FLIGHT_TIMEOUT seconds, or when the
+# lease is released without a cached result, and run the query themselves.
+DATA_CACHE_SINGLE_FLIGHT = False
+DATA_CACHE_SINGLE_FLIGHT_TIMEOUT = 60
+DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL = 0.5
+
 # Cache for dashboard filter state. `CACHE_TYPE` defaults to `SupersetMetastoreCache`
 # that stores the values in the key-value table in the Superset metastore, as it's
 # required for Superset to operate correctly, but can be replaced by any
@@ -987,6 +1079,15 @@ EXPLORE_FORM_DATA_CACHE_CONFIG: CacheConfig = {
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
+# Add the generations of the datasource and of its database, kept in the data cache,
+# to the cache keys of chart data, at the cost of a read from the data cache per
+# query. Bumping them, with the `/api/v1/cachekey/invalidate` endpoint or the
+# `superset invalidate-cache` command, eg, after an ETL load, invalidates all the
+# cached results of a dataset or database at once, without storing the cache keys
+# in the metadata database. Enabling it changes the cache keys, so the results
+# cached until then are not used anymore.
+DATA_CACHE_GENERATIONS = False
+
 # CORS Options
 # NOTE: enabling this requires installing the cors-related python dependencies
 # `pip install .[cors]` or `pip install apache_superset[cors]`, depending
@@ -1360,6 +1461,26 @@ RESULTS_BACKEND: BaseCache | None = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Codec used to compress the entries stored in the results backend: 'zlib', 'zstd',
+# 'lz4' or 'none'. zstd and lz4 are much faster than zlib on large results, and fall
+# back to zlib if PyArrow was built without them. Entries record their codec, so
+# changing this doesn't invalidate the stored results. zlib entries are stored as
+# before codecs were configurable; only switch to another codec once every web node
+# and worker can read it.
+RESULTS_BACKEND_CODEC: Literal["zlib", "zstd", "lz4", "none"] = "zlib"
+
+# Compress the buffers of the Arrow IPC streams stored in the results backend
+# ('zstd' or 'lz4'). Requires RESULTS_BACKEND_USE_MSGPACK. Since the data is then
+# already compressed, RESULTS_BACKEND_CODEC can be set to 'none'.
+RESULTS_BACKEND_IPC_COMPRESSION: Literal["zstd", "lz4"] | None = None
+
+# When set, async query results are fetched from the cursor in batches of this many
+# rows and stored in the results backend as separate chunks, instead of being
+# fetched and serialized in a single payload. This bounds the memory used by the
+# worker, and lets SQL Lab read the first rows without loading the whole result.
+# Requires RESULTS_BACKEND_USE_MSGPACK.
+SQLLAB_RESULTS_BACKEND_CHUNK_ROWS: int | None = None
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -1568,6 +1689,14 @@ DB_CONNECTION_MUTATOR = None
 #
 DB_SQLA_URI_VALIDATOR: Callable[[URL], None] | None = None
 
+# The number of parsed SQL scripts kept in the memory of each process, keyed on the
+# engine and the script. The same SQL is parsed many times in a request, to check
+# access, extract tables, and apply limits and RLS. 0 disables the cache. Scripts
+# longer than SQL_PARSE_CACHE_MAX_SCRIPT_LENGTH characters, eg, large SQL Lab
+# scripts, aren't cached, which bounds the memory used by the cache.
+SQL_PARSE_CACHE_SIZE = 512
+SQL_PARSE_CACHE_MAX_SCRIPT_LENGTH = 20_000
+
 # A set of disallowed SQL functions per engine. This is used to restrict the use of
 # unsafe SQL functions in SQL Lab and Charts. The keys of the dictionary are the engine
 # names, and the values are sets of disallowed functions.
@@ -18,11 +18,12 @@
 from __future__ import annotations
 
 import builtins
+import copy
 import logging
 from collections import defaultdict
-from collections.abc import Hashable
+from collections.abc import Hashable, Iterable
 from dataclasses import dataclass, field
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any, Callable, cast, Optional, Union
 
 import pandas as pd
@@ -58,6 +59,7 @@ from sqlalchemy.orm import (
     reconstructor,
     relationship,
     RelationshipProperty,
+    Session,
 )
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.schema import UniqueConstraint
@@ -71,6 +73,7 @@ from superset_core.api.models import Dataset as CoreDataset
 from superset import db, is_feature_enabled, security_manager
 from superset.commands.dataset.exceptions import DatasetNotFoundError
 from superset.common.db_query_status import QueryStatus
+from superset.common.utils.query_cache_manager import QueryCacheManager
 from superset.connectors.sqla.utils import (
     get_columns_description,
     get_physical_table_metadata,
@@ -185,6 +188,21 @@ class BaseDatasource(
     # Only some datasources support Row Level Security
     is_rls_supported: bool = False
 
+    # Fields of `data` computed on their own by `get_data_field`, by attribute
+    data_field_attributes: dict[str, str] = {
+        "id": "id",
+        "uid": "uid",
+        "name": "name",
+        "type": "type",
+        "column_formats": "column_formats",
+        "verbose_map": "verbose_map",
+        "order_by_choices": "order_by_choices",
+        "select_star": "select_star",
+        "cache_timeout": "cache_timeout",
+        "offset": "offset",
+        "perm": "perm",
+    }
+
     @property
     def name(self) -> str:
         # can be a Column or a property pointing to one
@@ -437,7 +455,46 @@ class BaseDatasource(
 
     @property
     def data(self) -> ExplorableData:
-        """Data representation of the datasource sent to the frontend"""
+        """
+        Data representation of the datasource sent to the frontend.
+
+        It's built once per instance, until the datasource, its columns or metrics
+        are modified, and copied as callers may modify it.
+        """
+        data = self.__dict__.get("_data")
+        if data is None or self.has_unflushed_changes():
+            data = self.build_data()
+            if not self.has_unflushed_changes():
+                self.__dict__["_data"] = data
+        return copy.deepcopy(data)
+
+    def get_data_field(self, field: str) -> Any:
+        """
+        Get a field of `data`, without building the whole payload for the fields
+        of `data_field_attributes`.
+
+        :param field: The key of the field in `data`
+        :returns: The value of the field, or None if it's missing
+        """
+        if attribute := self.data_field_attributes.get(field):
+            return getattr(self, attribute)
+        return self.data.get(field)
+
+    def has_unflushed_changes(self) -> bool:
+        """
+        Whether the datasource, its columns or metrics were modified since they were
+        loaded or last flushed.
+        """
+        return any(
+            sa.inspect(obj).modified for obj in (self, *self.columns, *self.metrics)
+        )
+
+    def clear_data(self) -> None:
+        """Forget the memoized `data` of the datasource"""
+        self.__dict__.pop("_data", None)
+
+    def build_data(self) -> ExplorableData:
+        """Build the data representation of the datasource"""
         return {
             # simple fields
             "id": self.id,
@@ -1441,9 +1498,8 @@ class SqlaTable(
     def time_grain_sqla(self) -> list[tuple[Any, Any]]:
         return [(g.duration, g.name) for g in self.database.grains() or []]
 
-    @property
-    def data(self) -> ExplorableData:
-        data_ = super().data
+    def build_data(self) -> ExplorableData:
+        data_ = super().build_data()
         if self.type == "table":
             data_["granularity_sqla"] = self.granularity_sqla
             data_["time_grain_sqla"] = self.time_grain_sqla
@@ -1522,6 +1578,38 @@ class SqlaTable(
 
         return super().get_from_clause(template_processor)
 
+    def get_time_filter(  # pylint: disable=too-many-arguments
+        self,
+        time_col: TableColumn,
+        start_dttm: datetime | None,
+        end_dttm: datetime | None,
+        time_grain: str | None = None,
+        label: str | None = "__time",
+        template_processor: BaseTemplateProcessor | None = None,
+    ) -> ColumnElement:
+        time_filter = super().get_time_filter(
+            time_col,
+            start_dttm,
+            end_dttm,
+            time_grain=time_grain,
+            label=label,
+            template_processor=template_processor,
+        )
+        if self.is_virtual or time_col.expression:
+            return time_filter
+
+        partition_filter = self.db_engine_spec.get_time_partition_filter(
+            self.database,
+            Table(self.table_name, self.schema, self.catalog),
+            time_col.column_name,
+            start_dttm,
+            end_dttm,
+            time_grain=time_grain,
+        )
+        if partition_filter is None:
+            return time_filter
+        return and_(time_filter, partition_filter)
+
     def adhoc_metric_to_sqla(
         self,
         metric: AdhocMetric,
@@ -1889,6 +1977,26 @@ class SqlaTable(
             .one()
         )
 
+    @classmethod
+    def get_eager_sqlatable_datasources(
+        cls, datasource_ids: Iterable[int]
+    ) -> list[SqlaTable]:
+        """
+        Returns SqlaTables with their columns, metrics, owners and database, in a
+        constant number of queries.
+        """
+        return (
+            db.session.query(cls)
+            .options(
+                sa.orm.subqueryload(cls.columns),
+                sa.orm.subqueryload(cls.metrics),
+                sa.orm.subqueryload(cls.owners),
+                sa.orm.joinedload(cls.database),
+            )
+            .filter(cls.id.in_(datasource_ids))
+            .all()
+        )
+
     @classmethod
     def get_all_datasources(cls) -> list[SqlaTable]:
         qry = db.session.query(cls)
@@ -2018,6 +2126,48 @@ class SqlaTable(
         target.load_database()
         security_manager.dataset_after_insert(mapper, connection, target)
 
+    @staticmethod
+    def after_update(
+        mapper: Mapper,
+        connection: Connection,
+        target: SqlaTable,
+    ) -> None:
+        """
+        Remove the chart data of the dataset from the local cache after update
+        """
+        target.clear_data()
+        QueryCacheManager.invalidate_local({target.uid})
+
+    @staticmethod
+    def after_expire(target: SqlaTable, attrs: Iterable[str] | None) -> None:
+        """
+        Forget the memoized data of the dataset once it's expired, eg, on commit
+        """
+        target.clear_data()
+
+    @staticmethod
+    def after_refresh(
+        target: SqlaTable, context: Any, attrs: Iterable[str] | None
+    ) -> None:
+        """
+        Forget the memoized data of the dataset once it's refreshed
+        """
+        target.clear_data()
+
+    @staticmethod
+    def after_child_change(
+        mapper: Mapper,
+        connection: Connection,
+        target: TableColumn | SqlMetric,
+    ) -> None:
+        """
+        Forget the memoized data of the dataset of a column or metric once it's
+        flushed
+        """
+        # the dataset must not be loaded while flushing
+        if table := target.__dict__.get("table"):
+            table.clear_data()
+
     @staticmethod
     def after_delete(
         mapper: Mapper,
@@ -2028,6 +2178,7 @@ class SqlaTable(
         Update dataset permissions after delete
         """
         security_manager.dataset_after_delete(mapper, connection, sqla_table)
+        QueryCacheManager.invalidate_local({sqla_table.uid})
 
     def load_database(self: SqlaTable) -> None:
         # somehow the database attribute is not loaded on access
@@ -2048,7 +2199,16 @@ class SqlaTable(
 
 sa.event.listen(SqlaTable, "before_update", SqlaTable.before_update)
 sa.event.listen(SqlaTable, "after_insert", SqlaTable.after_insert)
+sa.event.listen(SqlaTable, "after_update", SqlaTable.after_update)
 sa.event.listen(SqlaTable, "after_delete", SqlaTable.after_delete)
+sa.event.listen(SqlaTable, "expire", SqlaTable.after_expire)
+sa.event.listen(SqlaTable, "refresh", SqlaTable.after_refresh)
+sa.event.listen(TableColumn, "after_insert", SqlaTable.after_child_change)
+sa.event.listen(TableColumn, "after_update", SqlaTable.after_child_change)
+sa.event.listen(TableColumn, "after_delete", SqlaTable.after_child_change)
+sa.event.listen(SqlMetric, "after_insert", SqlaTable.after_child_change)
+sa.event.listen(SqlMetric, "after_update", SqlaTable.after_child_change)
+sa.event.listen(SqlMetric, "after_delete", SqlaTable.after_child_change)
 
 RLSFilterRoles = DBTable(
     "rls_filter_roles",
@@ -2095,3 +2255,41 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
         backref="row_level_security_filters",
     )
     clause = Column(utils.MediumText(), nullable=False)
+
+    @staticmethod
+    def after_change(
+        mapper: Mapper,
+        connection: Connection,
+        target: RowLevelSecurityFilter,
+    ) -> None:
+        """
+        Flag the session to invalidate the cached RLS filters once it's committed.
+
+        Changes to the roles and tables of a filter mark it as updated too.
+        Invalidating the cache before the commit would let other requests fill it
+        again with the filters before the change.
+        """
+        if session := sa.inspect(target).session:
+            session.info["rls_filters_changed"] = True
+
+    @staticmethod
+    def after_commit(session: Session) -> None:
+        if session.info.pop("rls_filters_changed", False):
+            security_manager.invalidate_rls_filters_cache()
+
+    @staticmethod
+    def after_rollback(session: Session) -> None:
+        session.info.pop("rls_filters_changed", None)
+
+
+sa.event.listen(
+    RowLevelSecurityFilter, "after_insert", RowLevelSecurityFilter.after_change
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_update", RowLevelSecurityFilter.after_change
+)
+sa.event.listen(
+    RowLevelSecurityFilter, "after_delete", RowLevelSecurityFilter.after_change
+)
+sa.event.listen(Session, "after_commit", RowLevelSecurityFilter.after_commit)
+sa.event.listen(Session, "after_rollback", RowLevelSecurityFilter.after_rollback)
@@ -21,6 +21,7 @@ from __future__ import annotations
 import logging
 import re
 import warnings
+from collections.abc import Iterator
 from datetime import datetime
 from inspect import signature
 from re import Match, Pattern
@@ -55,7 +56,13 @@ from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import URL
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import literal_column, quoted_name, text
-from sqlalchemy.sql.expression import BinaryExpression, ColumnClause, Select, TextClause
+from sqlalchemy.sql.expression import (
+    BinaryExpression,
+    ColumnClause,
+    ColumnElement,
+    Select,
+    TextClause,
+)
 from sqlalchemy.types import TypeEngine
 
 from superset import db
@@ -822,6 +829,28 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         """  # noqa: E501
         return database.get_sqla_engine(catalog=catalog, schema=schema, source=source)
 
+    @classmethod
+    def get_or_create_engine(  # pylint: disable=too-many-arguments, unused-argument
+        cls,
+        database: Database,
+        url: URL,
+        engine_kwargs: dict[str, Any],
+        create: Callable[[URL, dict[str, Any]], Engine],
+        catalog: str | None = None,
+        schema: str | None = None,
+        effective_username: str | None = None,
+    ) -> Engine:
+        """
+        Return the SQLAlchemy engine for a fully resolved URL and engine kwargs.
+
+        By default a new engine is built on every call by calling ``create``. DB engine
+        specs for databases where establishing a connection is expensive can override
+        this to reuse engines (and their connection pools) across calls; the catalog,
+        schema and effective username are passed so that cached engines can be keyed
+        on them.
+        """
+        return create(url, engine_kwargs)
+
     @classmethod
     def get_timestamp_expr(
         cls,
@@ -984,32 +1013,86 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             if cls.limit_method == LimitMethod.FETCH_MANY and limit:
                 return cursor.fetchmany(limit)
             data = cursor.fetchall()
-            description = cursor.description or []
-            # Create a mapping between column name and a mutator function to normalize
-            # values with. The first two items in the description row are
-            # the column name and type.
-            column_mutators = {
-                row[0]: func
-                for row in description
-                if (
-                    func := cls.column_type_mutators.get(
-                        type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
-                    )
-                )
-            }
-            if column_mutators:
-                indexes = {row[0]: idx for idx, row in enumerate(description)}
-                for row_idx, row in enumerate(data):
-                    new_row = list(row)
-                    for col, func in column_mutators.items():
-                        col_idx = indexes[col]
-                        new_row[col_idx] = func(row[col_idx])
-                    data[row_idx] = tuple(new_row)
-
-            return data
+            return cls._mutate_rows(data, cursor.description or [])
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex) from ex
 
+    @classmethod
+    def _mutate_rows(
+        cls,
+        data: list[tuple[Any, ...]],
+        description: Any,
+    ) -> list[tuple[Any, ...]]:
+        # Create a mapping between column name and a mutator function to normalize
+        # values with. The first two items in the description row are
+        # the column name and type.
+        column_mutators = {
+            row[0]: func
+            for row in description
+            if (
+                func := cls.column_type_mutators.get(
+                    type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
+                )
+            )
+        }
+        if column_mutators:
+            indexes = {row[0]: idx for idx, row in enumerate(description)}
+            for row_idx, row in enumerate(data):
+                new_row = list(row)
+                for col, func in column_mutators.items():
+                    col_idx = indexes[col]
+                    new_row[col_idx] = func(row[col_idx])
+                data[row_idx] = tuple(new_row)
+
+        return data
+
+    @classmethod
+    def fetch_data_batches(
+        cls,
+        cursor: Any,
+        batch_size: int,
+        limit: int | None = None,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        """
+        Fetch the result of a query in batches of at most ``batch_size`` rows.
+
+        Engine specs that override ``fetch_data`` get the whole result as a single
+        batch, since their post-processing might expect it.
+
+        :param cursor: Cursor instance
+        :param batch_size: Maximum number of rows per batch
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator of batches of rows
+        """
+        if cls.fetch_data.__func__ is not BaseEngineSpec.fetch_data.__func__:  # type: ignore
+            yield cls.fetch_data(cursor, limit)
+            return
+
+        yield from cls._fetchmany_batches(cursor, batch_size, limit)
+
+    @classmethod
+    def _fetchmany_batches(
+        cls,
+        cursor: Any,
+        batch_size: int,
+        limit: int | None = None,
+    ) -> Iterator[list[tuple[Any, ...]]]:
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+
+        fetched = 0
+        while limit is None or fetched < limit:
+            size = batch_size if limit is None else min(batch_size, limit - fetched)
+            try:
+                data = cursor.fetchmany(size)
+            except Exception as ex:
+                raise cls.get_dbapi_mapped_exception(ex) from ex
+            if not data:
+                break
+
+            fetched += len(data)
+            yield cls._mutate_rows(list(data), cursor.description or [])
+
     @classmethod
     def expand_data(
         cls, columns: list[ResultSetColumnType], data: list[dict[Any, Any]]
@@ -1635,6 +1718,34 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         # TODO: Fix circular import caused by importing Database, TableColumn
         return None
 
+    @classmethod
+    def get_time_partition_filter(  # pylint: disable=too-many-arguments, unused-argument
+        cls,
+        database: Database,
+        table: Table,
+        column_name: str,
+        start_dttm: datetime | None,
+        end_dttm: datetime | None,
+        time_grain: str | None = None,
+    ) -> ColumnElement | None:
+        """
+        Return an extra filter that lets the database prune partitions.
+
+        The filter is added to the time range filter on a column of a physical table,
+        so it must never exclude rows matched by the time range filter itself; it
+        exists because the time range filter might not be in a form the database can
+        use for pruning (eg, when the column is wrapped in a time grain expression).
+
+        :param database: Database instance
+        :param table: Table instance
+        :param column_name: Name of the column being filtered
+        :param start_dttm: Start of the time range (inclusive)
+        :param end_dttm: End of the time range (exclusive)
+        :param time_grain: Time grain applied to the column, if any
+        :return: SqlAlchemy clause, or ``None``
+        """
+        return None
+
     @classmethod
     def _get_fields(cls, cols: list[ResultSetColumnType]) -> list[Any]:
         return [
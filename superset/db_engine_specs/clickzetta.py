@@ -1,51 +1,352 @@
 """
-ClickZetta DB Engine Spec - Monkey patch dialect to disable backticks
+ClickZetta DB Engine Spec
 """
+
+import logging
 import re
-from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+from weakref import WeakKeyDictionary
+
+import pyarrow as pa
+from sqlalchemy import and_, column, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.engine.url import URL
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.sql.compiler import IdentifierPreparer
+from sqlalchemy.sql.expression import ColumnElement, Select
 
 from superset.db_engine_specs.base import BaseEngineSpec, LimitMethod
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from superset.extensions import stats_logger_manager
+from superset.sql.parse import Table
+from superset.superset_typing import ResultSetColumnType
+from superset.utils.hashing import hash_from_dict
 
 if TYPE_CHECKING:
     from superset.models.core import Database
 
+logger = logging.getLogger(__name__)
+
+# Error listing the partitions of a table that is not partitioned
+NOT_PARTITIONED_REGEX = re.compile(r"not (a )?partitioned", re.IGNORECASE)
+
+# Formats of date-like partition values, in which they also sort chronologically
+PARTITION_DATE_FORMATS = [
+    (re.compile(r"^\d{4}-\d{2}-\d{2}$"), "%Y-%m-%d"),
+    (re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$"), "%Y-%m-%d %H:%M:%S"),
+    (re.compile(r"^\d{4}-\d{2}$"), "%Y-%m"),
+    (re.compile(r"^\d{8}$"), "%Y%m%d"),
+    (re.compile(r"^\d{10}$"), "%Y%m%d%H"),
+]
+
+
+class QuoteWhenRequiredMixin:
+    """
+    Identifier preparer mixin that only quotes identifiers when necessary.
+
+    The ClickZetta SQLAlchemy driver wraps every identifier in backticks. ClickZetta
+    identifiers are case-insensitive, so here (unlike the SQLAlchemy default) mixed
+    case names are left unquoted, and only reserved words or names with special
+    characters are quoted. SQLAlchemy caches the result per identifier, so this costs
+    nothing at execution time.
+    """
+
+    def quote(self, ident: str, force: Optional[bool] = None) -> str:
+        return IdentifierPreparer.quote(self, ident)  # type: ignore
+
+    def _requires_quotes(self, value: str) -> bool:
+        return (
+            value.lower() in self.reserved_words  # type: ignore
+            or value[0] in self.illegal_initial_characters  # type: ignore
+            or not self.legal_characters.match(str(value))  # type: ignore
+        )
+
 
-# Monkey patch to remove backticks from ClickZetta dialect
-def patch_clickzetta_dialect():
+def patch_clickzetta_dialect() -> None:
     """
-    Patch ClickZetta dialect to not use backticks for identifiers
+    Make the ClickZetta SQLAlchemy dialect only quote identifiers when required.
     """
     try:
         from clickzetta.connector.sqlalchemy.base import ClickZettaDialect
+    except ImportError:
+        return
 
-        # Store original identifier preparer
-        original_preparer = ClickZettaDialect.identifier_preparer_class
+    if issubclass(ClickZettaDialect.preparer, QuoteWhenRequiredMixin):
+        return
 
-        # Create a custom preparer that doesn't quote identifiers
-        class NoQuoteIdentifierPreparer(original_preparer):
-            def quote(self, ident, force=None):
-                """Override to not quote identifiers"""
-                # Just return the identifier without quotes
-                return ident
+    ClickZettaDialect.preparer = type(
+        "ClickZettaIdentifierPreparer",
+        (QuoteWhenRequiredMixin, ClickZettaDialect.preparer),
+        {},
+    )
+    logger.debug("Patched ClickZetta dialect to quote identifiers only if required")
 
-            def quote_identifier(self, value):
-                """Override to not quote identifiers"""
-                return value
 
-        # Replace the preparer class
-        ClickZettaDialect.identifier_preparer_class = NoQuoteIdentifierPreparer
+patch_clickzetta_dialect()
+
 
-        print("✅ ClickZetta dialect patched to disable backticks")
-        return True
-    except Exception as e:
-        print(f"⚠️  Could not patch ClickZetta dialect: {e}")
-        return False
+def get_type_name(obj: Any) -> str:
+    """
+    Identify a value that can't be serialized, eg, a function or an SSL context in
+    ``connect_args``, by its name or the name of its type, without its address.
+    """
+    if not hasattr(obj, "__qualname__"):
+        obj = type(obj)
+    return f"{obj.__module__}.{obj.__qualname__}"
 
 
-# Apply the patch when this module is imported
-patch_clickzetta_dialect()
+class EngineKey(NamedTuple):
+    """
+    Identifies a cached engine.
+
+    The fingerprint is a hash of the fully resolved URL and engine kwargs, so that
+    editing the database connection (or a ``DB_CONNECTION_MUTATOR`` producing a
+    different URL) never returns an engine built from stale parameters. The engine
+    built from the previous parameters is then disposed.
+    """
+
+    database_id: Optional[int]
+    catalog: Optional[str]
+    schema: Optional[str]
+    username: Optional[str]
+    fingerprint: str
+
+
+class ClickZettaEngineRegistry:
+    """
+    Process-wide registry of pooled ClickZetta engines.
+
+    Establishing a ClickZetta connection requires a full authentication handshake, so
+    instead of building a ``NullPool`` engine per call we keep one pooled engine per
+    (database, catalog, schema, effective user). Engines that have not been handed out
+    for ``idle_timeout`` seconds are disposed, and the registry never holds more than
+    ``max_size`` engines, evicting the least recently used one first.
+    """
+
+    def __init__(self, idle_timeout: float = 600, max_size: int = 64) -> None:
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self._engines: "OrderedDict[EngineKey, Engine]" = OrderedDict()
+        self._last_used: Dict[EngineKey, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def get_or_create(
+        self,
+        key: EngineKey,
+        create: Callable[[], Engine],
+    ) -> Engine:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            if (engine := self._engines.get(key)) is not None:
+                self._engines.move_to_end(key)
+                self._last_used[key] = now
+                stats_logger_manager.instance.incr("clickzetta.engine.reused")
+                return engine
+
+            # the connection was edited: engines built from its previous parameters
+            # are never handed out again
+            for stale_key in [k for k in self._engines if k[:-1] == key[:-1]]:
+                self._dispose(stale_key)
+
+            engine = create()
+            self._engines[key] = engine
+            self._last_used[key] = now
+            stats_logger_manager.instance.incr("clickzetta.engine.created")
+
+            while len(self._engines) > self.max_size:
+                self._dispose(next(iter(self._engines)))
+
+            stats_logger_manager.instance.gauge(
+                "clickzetta.engine.count", len(self._engines)
+            )
+            return engine
+
+    def _evict_idle(self, now: float) -> None:
+        expired = [
+            key
+            for key, last_used in self._last_used.items()
+            if now - last_used > self.idle_timeout
+        ]
+        for key in expired:
+            self._dispose(key)
+
+    def _dispose(self, key: EngineKey) -> None:
+        engine = self._engines.pop(key)
+        del self._last_used[key]
+        # connections that are currently checked out are closed when returned
+        engine.dispose()
+        stats_logger_manager.instance.incr("clickzetta.engine.evicted")
+
+
+def register_pool_metrics(engine: Engine) -> None:
+    """
+    Send connection pool events for an engine to ``STATS_LOGGER``.
+    """
+    pool = engine.pool
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        stats_logger_manager.instance.incr("clickzetta.pool.connect")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(
+        dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        stats_logger_manager.instance.incr("clickzetta.pool.checkout")
+        if isinstance(pool, QueuePool):
+            stats_logger_manager.instance.gauge(
+                "clickzetta.pool.checked_out", pool.checkedout()
+            )
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+        stats_logger_manager.instance.incr("clickzetta.pool.checkin")
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(
+        dbapi_connection: Any, connection_record: Any, exception: Any
+    ) -> None:
+        stats_logger_manager.instance.incr("clickzetta.pool.invalidate")
+
+
+class SchemaMetadata(NamedTuple):
+    """
+    Tables, views and columns of a schema, loaded from ``information_schema``.
+    """
+
+    tables: List[str]
+    views: List[str]
+    materialized_views: List[str]
+    columns: Dict[str, List[ResultSetColumnType]]
+
+
+class MetadataScope(NamedTuple):
+    database_id: Optional[int]
+    catalog: Optional[str]
+    # ``None`` or ``0`` means that the table cache is disabled for the database
+    timeout: Optional[int]
+
+
+class ClickZettaMetadataCache:
+    """
+    Process-wide TTL cache of schema metadata.
+
+    The cache is only used for databases with a non-zero ``table_cache_timeout`` set
+    in their metadata cache settings, and entries expire after that timeout. Engines
+    are bound to a scope when they're handed out, so that methods which only receive
+    an inspector can find the database they belong to.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, tuple[float, SchemaMetadata]]" = OrderedDict()
+        self._scopes: "WeakKeyDictionary[Engine, MetadataScope]" = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def bind(self, engine: Engine, scope: MetadataScope) -> None:
+        self._scopes[engine] = scope
+
+    def get_scope(self, engine: Any) -> Optional[MetadataScope]:
+        try:
+            return self._scopes.get(engine)
+        except TypeError:
+            return None
+
+    def get_or_load(
+        self,
+        scope: MetadataScope,
+        schema: Optional[str],
+        load: Callable[[], SchemaMetadata],
+    ) -> SchemaMetadata:
+        if not scope.timeout:
+            return load()
+
+        key = (scope.database_id, scope.catalog, schema)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                stats_logger_manager.instance.incr("clickzetta.metadata_cache.hit")
+                return entry[1]
+            self.misses += 1
+
+        stats_logger_manager.instance.incr("clickzetta.metadata_cache.miss")
+        metadata = load()
+        with self._lock:
+            self._entries[key] = (now + scope.timeout, metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return metadata
+
+    def invalidate(self, scope: MetadataScope, schema: Optional[str]) -> None:
+        with self._lock:
+            self._entries.pop((scope.database_id, scope.catalog, schema), None)
+
+
+# partition columns of a table, and their latest values
+PartitionInfo = Tuple[List[str], Optional[List[str]]]
+
+
+class ClickZettaPartitionCache:
+    """
+    Process-wide TTL cache of the partition columns of tables and their latest values.
+
+    Only definitive answers are cached: the partitions of a table, or the fact that
+    it's not partitioned. Errors listing the partitions are not, so that a transient
+    failure doesn't disable partition pruning for a table until the entry expires.
+    """
+
+    def __init__(self, timeout: float = 300, max_size: int = 1024) -> None:
+        self.timeout = timeout
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, tuple[float, PartitionInfo]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[PartitionInfo]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: PartitionInfo) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+engine_registry = ClickZettaEngineRegistry()
+metadata_cache = ClickZettaMetadataCache()
+partition_cache = ClickZettaPartitionCache()
 
 
 class ClickZettaEngineSpec(BaseEngineSpec):
@@ -63,6 +364,12 @@ class ClickZettaEngineSpec(BaseEngineSpec):
     max_column_name_length = 255
     limit_method = LimitMethod.WRAP_SQL
 
+    # Pool settings for cached engines; any of them can be overridden through
+    # ``engine_params`` in the database extra.
+    pool_size = 5
+    max_overflow = 10
+    pool_recycle = 3600
+
     _time_grain_expressions = {
         None: "{col}",
         "PT1S": "DATE_TRUNC('SECOND', {col})",
@@ -91,137 +398,448 @@ class ClickZettaEngineSpec(BaseEngineSpec):
                 return f"CAST('{dttm.date().isoformat()}' AS DATE)"
         return None
 
-    @staticmethod
-    def remove_backticks(sql: str) -> str:
-        """Remove backticks and ANSI escape sequences"""
-        sql = re.sub(r'\x1b\[[0-9;]*m', '', sql)
-        sql = re.sub(r'`([^`]+)`', r'\1', sql)
-        return sql
+    @classmethod
+    def get_schema_metadata(
+        cls,
+        inspector: Inspector,
+        schema: Optional[str],
+    ) -> SchemaMetadata:
+        """
+        Return all tables, views and columns of a schema.
+
+        The metadata is read from ``information_schema`` with two queries per schema,
+        instead of one query per table, and cached for databases that have a table
+        cache timeout configured.
+        """
+        schema = schema or inspector.default_schema_name
+        scope = metadata_cache.get_scope(inspector.bind) or MetadataScope(
+            None, None, None
+        )
+        return metadata_cache.get_or_load(
+            scope,
+            schema,
+            lambda: cls._load_schema_metadata(inspector, schema),
+        )
 
     @classmethod
-    def get_table_names(
-        cls, database: Any, inspector: Any, schema: Optional[str] = None
-    ) -> List[str]:
+    def _list_tables(
+        cls,
+        conn: Connection,
+        schema: Optional[str],
+    ) -> tuple[List[str], List[str], List[str]]:
+        """
+        Return the tables, views and materialized views of a schema.
+        """
+        tables: List[str] = []
+        views: List[str] = []
+        materialized_views: List[str] = []
+        for table_name, table_type in conn.execute(
+            text(
+                "SELECT table_name, table_type "
+                "FROM information_schema.tables "
+                "WHERE table_schema = :schema"
+            ),
+            {"schema": schema},
+        ):
+            table_type = (table_type or "").upper()
+            if "MATERIALIZED" in table_type:
+                materialized_views.append(table_name)
+            elif "VIEW" in table_type:
+                views.append(table_name)
+            else:
+                tables.append(table_name)
+        return tables, views, materialized_views
+
+    @classmethod
+    def _load_schema_metadata(
+        cls,
+        inspector: Inspector,
+        schema: Optional[str],
+    ) -> SchemaMetadata:
+        columns: Dict[str, List[ResultSetColumnType]] = {}
+
         try:
-            tables = inspector.get_table_names(schema=schema)
-            # ClickZetta returns tuples like (table_name, schema, catalog)
-            # We need to extract just the table name
-            result = []
-            for t in tables:
-                if isinstance(t, tuple):
-                    # Extract first element (table name)
-                    result.append(str(t[0]))
-                elif isinstance(t, str):
-                    result.append(t)
-                else:
-                    result.append(str(t))
-            return result
-        except Exception as e:
-            print(f"Error in get_table_names: {e}")
-            return []
+            with inspector.bind.connect() as conn:
+                tables, views, materialized_views = cls._list_tables(conn, schema)
+                for row in conn.execute(
+                    text(
+                        "SELECT table_name, column_name, data_type, is_nullable, "
+                        "column_default, comment "
+                        "FROM information_schema.columns "
+                        "WHERE table_schema = :schema "
+                        "ORDER BY table_name, ordinal_position"
+                    ),
+                    {"schema": schema},
+                ):
+                    columns.setdefault(row[0], []).append(
+                        {
+                            "column_name": row[1],
+                            "name": row[1],
+                            "type": cls.get_sqla_column_type(row[2]) or row[2],
+                            "nullable": str(row[3]).upper() in {"YES", "TRUE", "1"},
+                            "default": row[4],
+                            "comment": row[5],
+                        }
+                    )
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
+        return SchemaMetadata(tables, views, materialized_views, columns)
 
     @classmethod
-    def get_view_names(
-        cls, database: Any, inspector: Any, schema: Optional[str] = None
-    ) -> List[str]:
+    def list_tables(
+        cls,
+        inspector: Inspector,
+        schema: Optional[str],
+    ) -> tuple[List[str], List[str], List[str]]:
+        """
+        Return the tables, views and materialized views of a schema, without their
+        columns.
+
+        The table lists are cached by the database models, so this only runs when
+        they expire or are refreshed: the cached columns of the schema are dropped
+        along with them, so that refreshing the table list refreshes the columns.
+        The listing is loaded once per schema and inspector, and split by type.
+        """
+        schema = schema or inspector.default_schema_name
+        key = ("clickzetta_list_tables", schema)
+        if (listing := inspector.info_cache.get(key)) is not None:
+            return listing
+
+        if scope := metadata_cache.get_scope(inspector.bind):
+            metadata_cache.invalidate(scope, schema)
+
         try:
-            views = inspector.get_view_names(schema=schema)
-            # ClickZetta may return tuples like (view_name, schema, catalog)
-            result = []
-            for v in views:
-                if isinstance(v, tuple):
-                    result.append(str(v[0]))
-                elif isinstance(v, str):
-                    result.append(v)
-                else:
-                    result.append(str(v))
-            return result
-        except Exception as e:
-            print(f"Error in get_view_names: {e}")
-            return []
+            with inspector.bind.connect() as conn:
+                listing = cls._list_tables(conn, schema)
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
+        inspector.info_cache[key] = listing
+        return listing
+
+    @classmethod
+    def get_table_names(
+        cls,
+        database: "Database",
+        inspector: Inspector,
+        schema: Optional[str],
+    ) -> Set[str]:
+        return set(cls.list_tables(inspector, schema)[0])
+
+    @classmethod
+    def get_view_names(
+        cls,
+        database: "Database",
+        inspector: Inspector,
+        schema: Optional[str],
+    ) -> Set[str]:
+        return set(cls.list_tables(inspector, schema)[1])
+
+    @classmethod
+    def get_materialized_view_names(
+        cls,
+        database: "Database",
+        inspector: Inspector,
+        schema: Optional[str],
+    ) -> Set[str]:
+        return set(cls.list_tables(inspector, schema)[2])
 
     @classmethod
     def get_columns(
-        cls, inspector: Any, table: Any, options: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
-        try:
-            # Extract table name and schema from Table object
-            table_name = table.table if hasattr(table, 'table') else str(table)
-            schema = table.schema if hasattr(table, 'schema') else None
-
-            table_str = str(table_name) if not isinstance(table_name, str) else table_name
-            columns = inspector.get_columns(table_str, schema=schema)
-
-            normalized_columns = []
-            for col in columns:
-                if isinstance(col, dict):
-                    normalized_col = {
-                        'column_name': col.get('name', col.get('column_name', 'unknown')),
-                        'name': col.get('name', col.get('column_name', 'unknown')),
-                        'type': col.get('type', 'VARCHAR'),
-                        'nullable': col.get('nullable', True),
-                        'default': col.get('default'),
-                        'autoincrement': col.get('autoincrement', False),
-                        'comment': col.get('comment'),
-                    }
-                    normalized_columns.append(normalized_col)
-                else:
-                    try:
-                        col_name = str(col.name if hasattr(col, 'name') else col)
-                        normalized_columns.append({
-                            'column_name': col_name,
-                            'name': col_name,
-                            'type': col.type if hasattr(col, 'type') else 'VARCHAR',
-                            'nullable': True
-                        })
-                    except Exception:
-                        continue
-            return normalized_columns
-        except Exception as e:
-            print(f"Error getting columns for {table_name}: {e}")
-            return []
+        cls,
+        inspector: Inspector,
+        table: Table,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> List[ResultSetColumnType]:
+        """
+        Return the columns of a table.
+
+        When the table cache is enabled the columns of the whole schema are loaded
+        at once, so that syncing many datasets doesn't cost a query per table. Tables
+        missing from the cached metadata, e.g. created since it was loaded, are
+        inspected directly.
+        """
+        scope = metadata_cache.get_scope(inspector.bind)
+        if scope is None or not scope.timeout:
+            return super().get_columns(inspector, table, options)
+
+        columns = cls.get_schema_metadata(inspector, table.schema).columns
+        table_columns = columns.get(table.table)
+        if table_columns is None:
+            # identifiers are case-insensitive
+            table_name = table.table.lower()
+            table_columns = next(
+                (
+                    value
+                    for name, value in columns.items()
+                    if name.lower() == table_name
+                ),
+                None,
+            )
+        if table_columns is None:
+            return super().get_columns(inspector, table, options)
+
+        return [dict(column) for column in table_columns]  # type: ignore
 
     @classmethod
-    def fetch_data(cls, cursor: Any, limit: Optional[int] = None) -> List[Any]:
+    def fetch_data(  # type: ignore[override]
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Union[List[Any], pa.Table]:
+        """
+        Fetch results as Arrow if the driver supports it, falling back to tuples.
+
+        An Arrow table is used directly by ``SupersetResultSet``, skipping the
+        conversion to and from Python objects. Errors are raised, including errors
+        fetching Arrow, since the rows read so far can't be fetched again as tuples.
+        """
+        try:
+            table = cls.fetch_arrow_data(cursor, limit)
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+        if table is not None:
+            return table
+
         try:
             if limit:
                 return cursor.fetchmany(limit)
             return cursor.fetchall()
-        except Exception:
-            return []
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
+    @classmethod
+    def fetch_arrow_data(
+        cls, cursor: Any, limit: Optional[int] = None
+    ) -> Optional[pa.Table]:
+        """
+        Fetch results as an Arrow table, or return ``None`` if not supported: the
+        cursor doesn't have the methods below, or raises ``NotImplementedError``
+        before returning any rows.
+
+        Drivers can either stream record batches through ``fetch_arrow_batches``, in
+        which case batches past the limit are never read, or return the whole result
+        through ``fetch_arrow_table``.
+        """
+        if fetch_batches := getattr(cursor, "fetch_arrow_batches", None):
+            batches: List[pa.RecordBatch] = []
+            num_rows = 0
+            try:
+                for batch in fetch_batches():
+                    batches.append(batch)
+                    num_rows += batch.num_rows
+                    if limit and num_rows >= limit:
+                        break
+            except NotImplementedError:
+                if batches:
+                    raise
+                return None
+            table = pa.Table.from_batches(batches) if batches else None
+        elif fetch_table := getattr(cursor, "fetch_arrow_table", None):
+            try:
+                table = fetch_table()
+            except NotImplementedError:
+                return None
+        else:
+            return None
+
+        if table is not None and limit:
+            table = table.slice(0, limit)
+        return table
+
+    @classmethod
+    def fetch_data_batches(  # type: ignore[override]
+        cls,
+        cursor: Any,
+        batch_size: int,
+        limit: Optional[int] = None,
+    ) -> Iterator[Union[List[Any], pa.Table]]:
+        """
+        Fetch results in batches, as Arrow tables if the driver supports it.
+
+        Record batches from the driver are grouped until there are at least
+        ``batch_size`` rows, so a batch can be larger by up to one record batch.
+        """
+        fetch_batches = getattr(cursor, "fetch_arrow_batches", None)
+        if fetch_batches is None:
+            yield from cls._fetchmany_batches(cursor, batch_size, limit)
+            return
+
+        buffered: List[pa.RecordBatch] = []
+        buffered_rows = fetched = 0
+        for batch in fetch_batches():
+            if limit is not None:
+                batch = batch.slice(0, limit - fetched)
+            buffered.append(batch)
+            buffered_rows += batch.num_rows
+            fetched += batch.num_rows
+            if buffered_rows >= batch_size:
+                yield pa.Table.from_batches(buffered)
+                buffered, buffered_rows = [], 0
+            if limit is not None and fetched >= limit:
+                break
+
+        if buffered_rows:
+            yield pa.Table.from_batches(buffered)
 
     @classmethod
     def get_catalog_names(cls, database: Any, inspector: Any) -> List[str]:
         return []
 
     @classmethod
-    def select_star(
-        cls, database: "Database", table: Any, engine: Any,
-        limit: int = 100, show_cols: bool = False,
-        indent: bool = True, latest_partition: bool = True,
-        cols: Optional[List[Dict[str, Any]]] = None,
-    ) -> str:
-        # Extract table name and schema from Table object
-        table_name = table.table if hasattr(table, 'table') else str(table)
-        schema = table.schema if hasattr(table, 'schema') else None
+    def _partition_query(cls, database: "Database", table: Table) -> str:
+        full_table_name = cls.quote_table(
+            Table(table.table, table.schema), database.get_dialect()
+        )
+        return f"SHOW PARTITIONS {full_table_name}"
 
-        if schema:
-            full_table = f"{schema}.{table_name}"
-        else:
-            full_table = table_name
+    @staticmethod
+    def _parse_partition(partition: str) -> Dict[str, str]:
+        """
+        Parse a partition spec like ``dt=2024-01-01/region=cn``.
+        """
+        return dict(
+            part.split("=", 1) for part in str(partition).split("/") if "=" in part
+        )
 
-        if show_cols and cols:
-            col_list = ", ".join([col["column_name"] for col in cols])
-            return f"SELECT {col_list}\nFROM {full_table}\nLIMIT {limit}"
-        else:
-            return f"SELECT *\nFROM {full_table}\nLIMIT {limit}"
+    @staticmethod
+    def _partition_sort_key(values: List[str]) -> List[Any]:
+        # compare numeric values (eg, an ``hour`` partition) as numbers
+        return [
+            (0, int(value), "") if value.isdigit() else (1, 0, value)
+            for value in values
+        ]
 
     @classmethod
-    def apply_limit_to_sql(
-        cls, sql: str, limit: int, database: "Database", force: bool = False
-    ) -> str:
-        sql = cls.remove_backticks(sql)
-        return f"SELECT * FROM (\n{sql}\n) AS _limit_subquery\nLIMIT {limit}"
+    def latest_partition(
+        cls,
+        database: "Database",
+        table: Table,
+    ) -> PartitionInfo:
+        """
+        Return the partition columns of a table and their latest (max) values.
+
+        Tables that are not partitioned, or whose partitions can't be listed, return
+        no columns and no values. Results are cached in the process, except when
+        listing the partitions fails for another reason than the table not being
+        partitioned.
+
+        >>> latest_partition(database, Table("events", "analytics"))
+        (['dt', 'hour'], ['2024-01-01', '23'])
+        """
+        key = (database.id, table.catalog, table.schema, table.table)
+        if (info := partition_cache.get(key)) is not None:
+            return info
+
+        try:
+            df = database.get_df(
+                cls._partition_query(database, table),
+                catalog=table.catalog,
+                schema=table.schema,
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            if NOT_PARTITIONED_REGEX.search(str(ex)):
+                partition_cache.set(key, ([], None))
+            else:
+                logger.warning("Unable to list partitions of %s", table, exc_info=True)
+            return [], None
+
+        info = cls._get_latest_partition(df)
+        partition_cache.set(key, info)
+        return info
+
+    @classmethod
+    def _get_latest_partition(cls, df: Any) -> PartitionInfo:
+        partitions = [
+            partition
+            for spec in (df.iloc[:, 0] if len(df.columns) else [])
+            if (partition := cls._parse_partition(spec))
+        ]
+        if not partitions:
+            return [], None
+
+        column_names = list(partitions[0])
+        latest = max(
+            (
+                [partition.get(name, "") for name in column_names]
+                for partition in partitions
+            ),
+            key=cls._partition_sort_key,
+        )
+        return column_names, latest
+
+    @classmethod
+    def where_latest_partition(
+        cls,
+        database: "Database",
+        table: Table,
+        query: Select,
+        columns: Optional[List[ResultSetColumnType]] = None,
+    ) -> Optional[Select]:
+        column_names, values = cls.latest_partition(database, table)
+        if not values:
+            return None
+
+        for column_name, value in zip(column_names, values, strict=False):
+            query = query.where(column(column_name) == value)
+        return query
+
+    @classmethod
+    def get_extra_table_metadata(
+        cls,
+        database: "Database",
+        table: Table,
+    ) -> Dict[str, Any]:
+        column_names, values = cls.latest_partition(database, table)
+        if not column_names:
+            return {}
+
+        return {
+            "partitions": {
+                "cols": column_names,
+                "latest": dict(zip(column_names, values or [], strict=False)),
+                "partitionQuery": cls._partition_query(database, table),
+            }
+        }
+
+    @classmethod
+    def get_time_partition_filter(  # pylint: disable=too-many-arguments
+        cls,
+        database: "Database",
+        table: Table,
+        column_name: str,
+        start_dttm: Optional[datetime],
+        end_dttm: Optional[datetime],
+        time_grain: Optional[str] = None,
+    ) -> Optional[ColumnElement]:
+        """
+        Filter the raw partition column when a time range is applied to it.
+
+        Partition values are compared in the format the latest partition uses, so
+        string partitions (``dt='2024-01-01'``) are pruned too. When a time grain is
+        applied only the lower bound is safe to push down, since the truncated value
+        of a partition can be before the end of the range while the partition itself
+        is after it.
+        """
+        column_names, values = cls.latest_partition(database, table)
+        if not values or column_name not in column_names:
+            return None
+
+        latest = values[column_names.index(column_name)]
+        date_format = next(
+            (fmt for pattern, fmt in PARTITION_DATE_FORMATS if pattern.match(latest)),
+            None,
+        )
+        if date_format is None:
+            return None
+
+        partition_column = column(column_name)
+        clauses = []
+        if start_dttm:
+            clauses.append(partition_column >= start_dttm.strftime(date_format))
+        if end_dttm and not time_grain:
+            # inclusive, since the end is truncated to the partition format
+            clauses.append(partition_column <= end_dttm.strftime(date_format))
+        return and_(*clauses) if clauses else None
 
     @classmethod
     def get_prequeries(
@@ -239,48 +857,60 @@ class ClickZettaEngineSpec(BaseEngineSpec):
         return prequeries
 
     @classmethod
-    def get_sqla_engine(
-        cls, database: "Database", catalog: Optional[str] = None,
-        schema: Optional[str] = None, source: Optional[str] = None,
-    ) -> Any:
-        engine = super().get_sqla_engine(database, catalog, schema, source)
-
-        # Add event listener to remove backticks from all queries
-        @event.listens_for(engine, "before_cursor_execute", retval=True)
-        def remove_backticks_from_statement(
-            conn, cursor, statement, parameters, context, executemany
-        ):
-            # Remove backticks from the statement
-            cleaned_statement = cls.remove_backticks(statement)
-            return cleaned_statement, parameters
+    def get_or_create_engine(  # pylint: disable=too-many-arguments
+        cls,
+        database: "Database",
+        url: URL,
+        engine_kwargs: Dict[str, Any],
+        create: Callable[[URL, Dict[str, Any]], Engine],
+        catalog: Optional[str] = None,
+        schema: Optional[str] = None,
+        effective_username: Optional[str] = None,
+    ) -> Engine:
+        """
+        Return a pooled engine from the registry, creating it on first use.
 
+        ``Database._get_sqla_engine`` asks for a ``NullPool`` by default; here it is
+        replaced with a ``QueuePool`` that pings connections before handing them out,
+        so that every chart on a dashboard does not pay for a new connection.
+        """
+        engine_kwargs = dict(engine_kwargs)
+        if engine_kwargs.get("poolclass", NullPool) is NullPool:
+            engine_kwargs["poolclass"] = QueuePool
+        engine_kwargs.setdefault("pool_size", cls.pool_size)
+        engine_kwargs.setdefault("max_overflow", cls.max_overflow)
+        engine_kwargs.setdefault("pool_recycle", cls.pool_recycle)
+        engine_kwargs.setdefault("pool_pre_ping", True)
+
+        fingerprint = hash_from_dict(
+            {
+                "url": url.render_as_string(hide_password=False),
+                "engine_kwargs": engine_kwargs,
+            },
+            default=get_type_name,
+            algorithm="sha256",
+        )
+        key = EngineKey(
+            database_id=database.id,
+            catalog=catalog,
+            schema=schema,
+            username=effective_username if database.impersonate_user else None,
+            fingerprint=fingerprint,
+        )
+
+        def create_engine() -> Engine:
+            engine = create(url, engine_kwargs)
+            register_pool_metrics(engine)
+            return engine
+
+        engine = engine_registry.get_or_create(key, create_engine)
+        metadata_cache.bind(
+            engine,
+            MetadataScope(
+                database_id=database.id,
+                catalog=catalog,
+                # 0 disables the cache, rather than keeping the metadata forever
+                timeout=database.table_cache_timeout or None,
+            ),
+        )
         return engine
-
-    @classmethod
-    def validate_sql(
-        cls, sql: str, catalog: Optional[str] = None, schema: Optional[str] = None,
-    ) -> Set[Any]:
-        try:
-            cleaned_sql = cls.remove_backticks(sql)
-            return super().validate_sql(cleaned_sql, catalog, schema)
-        except Exception:
-            return set()
-
-    @classmethod
-    def get_table_names_from_sql(cls, sql: str, database: "Database") -> Set[str]:
-        try:
-            cleaned_sql = cls.remove_backticks(sql)
-            return super().get_table_names_from_sql(cleaned_sql, database)
-        except Exception:
-            return set()
-
-    @classmethod
-    def parse_sql(
-        cls, sql: str, strip_comments: bool = False, engine: Optional[str] = None,
-    ) -> Any:
-        try:
-            cleaned_sql = cls.remove_backticks(sql)
-            return super().parse_sql(cleaned_sql, strip_comments, engine)
-        except Exception as e:
-            print(f"SQL parsing skipped for ClickZetta: {e}")
-            return None
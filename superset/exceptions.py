@@ -488,5 +488,11 @@ class SupersetResultsBackendNotConfigureException(SupersetErrorException):
         super().__init__(error)
 
 
+class SupersetQueryResultsException(SupersetErrorException):
+    """
+    The results of a query are too large, or can't be stored in the results backend.
+    """
+
+
 class ScreenshotImageNotAvailableException(SupersetException):
     status = 404
@@ -203,6 +203,18 @@ class Explorable(Protocol):
         :return: Dictionary with complete explorable metadata
         """
 
+    def get_data_field(self, field: str) -> Any:
+        """
+        Get a single field of `data`.
+
+        Hot paths, like chart data requests, read fields such as the ID or the
+        verbose map on their own. Implementations should compute them without
+        building the whole `data` payload when possible.
+
+        :param field: The key of the field in `data`
+        :return: The value of the field, or None if it's missing
+        """
+
     # =========================================================================
     # Caching
     # =========================================================================
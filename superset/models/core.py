@@ -542,7 +542,15 @@ class Database(CoreDatabase, AuditMixinNullable, ImportExportMixin):  # pylint:
                 source,
             )
         try:
-            return create_engine(sqlalchemy_url, **engine_kwargs)
+            return self.db_engine_spec.get_or_create_engine(
+                database=self,
+                url=sqlalchemy_url,
+                engine_kwargs=engine_kwargs,
+                create=lambda url, kwargs: create_engine(url, **kwargs),
+                catalog=catalog,
+                schema=schema,
+                effective_username=effective_username,
+            )
         except Exception as ex:
             raise self.db_engine_spec.get_dbapi_mapped_exception(ex) from ex
 
@@ -19,6 +19,7 @@ from __future__ import annotations
 import logging
 import uuid
 from collections import defaultdict, deque
+from collections.abc import Iterable
 from typing import Any, Callable
 
 import sqlalchemy as sqla
@@ -287,19 +288,98 @@ class Dashboard(CoreDashboard, AuditMixinNullable, ImportExportMixin):
         for slc in self.slices:
             slices_by_datasource[(slc.cls_model, slc.datasource_id)].add(slc)
 
+        datasources = self.get_datasources_by_key(slices_by_datasource)
         result: list[dict[str, Any]] = []
 
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
-            )
-
-            if datasource:
+        for key, slices in slices_by_datasource.items():
+            if datasource := datasources.get(key):
                 # Filter out unneeded fields from the datasource payload
-                result.append(datasource.data_for_slices(slices))
+                result.append(self.datasource_data_for_slices(datasource, slices))
 
         return result
 
+    @staticmethod
+    def get_datasources_by_key(
+        keys: Iterable[tuple[type[BaseDatasource], int]],
+    ) -> dict[tuple[type[BaseDatasource], int], BaseDatasource]:
+        """
+        Load datasources in bulk, with one query per type of datasource, and the
+        columns, metrics, owners and database of tables eagerly.
+        """
+        ids_by_model: dict[type[BaseDatasource], set[int]] = defaultdict(set)
+        for cls_model, datasource_id in keys:
+            ids_by_model[cls_model].add(datasource_id)
+
+        datasources: dict[tuple[type[BaseDatasource], int], BaseDatasource] = {}
+        for cls_model, datasource_ids in ids_by_model.items():
+            if issubclass(cls_model, SqlaTable):
+                models = cls_model.get_eager_sqlatable_datasources(datasource_ids)
+            else:
+                models = (
+                    db.session.query(cls_model)
+                    .filter(cls_model.id.in_(datasource_ids))
+                    .all()
+                )
+            datasources.update(
+                ((cls_model, datasource.id), datasource) for datasource in models
+            )
+
+        return datasources
+
+    def datasource_data_for_slices(
+        self, datasource: BaseDatasource, slices: set[Slice]
+    ) -> dict[str, Any]:
+        """
+        The payload of a datasource for the slices of the dashboard, cached until
+        the dashboard, the datasource, its columns and metrics, its database or the
+        slices are changed.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+        from superset.utils.cache import generate_cache_key
+
+        timeout = app.config["DASHBOARD_DATASETS_CACHE_TIMEOUT"]
+        database = getattr(datasource, "database", None)
+        changed_on = [
+            self.changed_on,
+            datasource.changed_on,
+            database.changed_on if database else None,
+            *(slc.changed_on for slc in slices),
+        ]
+        if timeout is None or None in changed_on:
+            return datasource.data_for_slices(slices)
+
+        if isinstance(datasource, SqlaTable):
+            # syncing the columns from the source doesn't change the dataset, and
+            # removing some changes none of the others
+            children = [*datasource.columns, *datasource.metrics]
+            changed_on += [
+                max((child.changed_on for child in children), default=None),
+                len(children),
+            ]
+
+        cache_key = generate_cache_key(
+            {
+                "dashboard_id": self.id,
+                "datasource_uid": datasource.uid,
+                "slice_ids": sorted(slc.id for slc in slices),
+                "changed_on": changed_on,
+            },
+            "dashboard_datasource_",
+        )
+        stats_logger = app.config["STATS_LOGGER"]
+        if (data := cache_manager.cache.get(cache_key)) is not None:
+            stats_logger.incr("dashboard_datasource.cache_hit")
+            return data
+
+        stats_logger.incr("dashboard_datasource.cache_miss")
+        data = datasource.data_for_slices(slices)
+        try:
+            cache_manager.cache.set(cache_key, data, timeout=timeout)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Could not cache the datasource %s", datasource.uid)
+        return data
+
     @property
     def params(self) -> str:
         return self.json_metadata
@@ -27,6 +27,7 @@ import re
 import uuid
 from collections.abc import Hashable
 from datetime import datetime, timedelta
+from functools import partial
 from typing import (
     Any,
     Callable,
@@ -98,6 +99,7 @@ from superset.superset_typing import (
     QueryObjectDict,
 )
 from superset.utils import core as utils, json
+from superset.utils.concurrency import database_query_slot, run_concurrently
 from superset.utils.core import (
     DateColumn,
     DTTM_ALIAS,
@@ -131,6 +133,7 @@ class ValidationResultDict(TypedDict):
 
 if TYPE_CHECKING:
     from superset.common.query_object import QueryObject
+    from superset.common.utils.query_cache_manager import QueryCacheManager
     from superset.connectors.sqla.models import SqlMetric, TableColumn
     from superset.db_engine_specs import BaseEngineSpec
     from superset.models.core import Database
@@ -1312,7 +1315,8 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
         :return: QueryResult with processed dataframe
         """
         # Execute the base query
-        result = self.query(query_object.to_dict())
+        with database_query_slot(self.database.id):
+            result = self.query(query_object.to_dict())
         query = result.query + ";\n\n" if result.query else ""
 
         # Process the dataframe if not empty
@@ -1377,6 +1381,9 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
         queries: list[str] = []
         cache_keys: list[str | None] = []
         offset_dfs: dict[str, pd.DataFrame] = {}
+        # offsets missing the cache, and the position of their query
+        pending: list[tuple[str, int]] = []
+        tasks: list[Callable[[], tuple[pd.DataFrame, str]]] = []
 
         outer_from_dttm, outer_to_dttm = get_since_until_from_query_object(query_object)
         if not outer_from_dttm or not outer_to_dttm:
@@ -1564,7 +1571,12 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
                     time_grain,
                 )
 
-            cache = QueryCacheManager.get(cache_key, CacheRegion.DATA, force_cache)
+            cache = QueryCacheManager.get(
+                cache_key,
+                CacheRegion.DATA,
+                force_cache,
+                datasource_uid=self.uid,
+            )
 
             if cache.is_loaded:
                 offset_dfs[offset] = cache.df
@@ -1587,43 +1599,33 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
                 query_object_clone_dct["row_limit"] = app.config["ROW_LIMIT"]
                 query_object_clone_dct["row_offset"] = 0
 
-            # Call the unified query method on the datasource
-            result = self.query(query_object_clone_dct)
-
-            queries.append(result.query)
-            cache_keys.append(None)
-
-            offset_metrics_df = result.df
-            if offset_metrics_df.empty:
-                offset_metrics_df = pd.DataFrame(
-                    {
-                        col: [np.NaN]
-                        for col in join_keys + list(metrics_mapping.values())
-                    }
-                )
-            else:
-                # 1. normalize df, set dttm column
-                offset_metrics_df = self.normalize_df(
-                    offset_metrics_df, query_object_clone
+            # the offset queries run concurrently once all of them are built; the
+            # clone is copied as it's modified by the next offsets
+            pending.append((offset, len(queries)))
+            tasks.append(
+                partial(
+                    self._query_time_offset,
+                    query_object_clone_dct,
+                    copy.copy(query_object_clone),
+                    metrics_mapping,
+                    join_keys,
+                    cache,
+                    cache_key,
+                    cache_timeout_fn,
                 )
+            )
+            queries.append("")
+            cache_keys.append(None)
+            # placeholder, to join the offsets in order
+            offset_dfs[offset] = df
 
-                # 2. rename extra query columns
-                offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
-
-            # cache df and query if caching is enabled
-            if cache_key and cache_timeout_fn:
-                value = {
-                    "df": offset_metrics_df,
-                    "query": result.query,
-                }
-                cache.set(
-                    key=cache_key,
-                    value=value,
-                    timeout=cache_timeout_fn(),
-                    datasource_uid=self.uid,
-                    region=CacheRegion.DATA,
-                )
+        for (offset, index), (offset_metrics_df, query) in zip(
+            pending,
+            run_concurrently(tasks),
+            strict=True,
+        ):
             offset_dfs[offset] = offset_metrics_df
+            queries[index] = query
 
         if offset_dfs:
             df = self.join_offset_dfs(
@@ -1635,6 +1637,53 @@ class ExploreMixin:  # pylint: disable=too-many-public-methods
 
         return CachedTimeOffset(df=df, queries=queries, cache_keys=cache_keys)
 
+    def _query_time_offset(  # pylint: disable=too-many-arguments
+        self,
+        query_object_dct: dict[str, Any],
+        query_object: QueryObject,
+        metrics_mapping: dict[str, str],
+        join_keys: list[str],
+        cache: QueryCacheManager,
+        cache_key: str | None,
+        cache_timeout_fn: Callable[[], int] | None,
+    ) -> tuple[pd.DataFrame, str]:
+        """
+        Run the query of a time offset, and cache its dataframe.
+
+        :returns: The dataframe of the offset, with renamed metrics, and its query
+        """
+        # Call the unified query method on the datasource
+        with database_query_slot(self.database.id):
+            result = self.query(query_object_dct)
+
+        offset_metrics_df = result.df
+        if offset_metrics_df.empty:
+            offset_metrics_df = pd.DataFrame(
+                {col: [np.NaN] for col in join_keys + list(metrics_mapping.values())}
+            )
+        else:
+            # 1. normalize df, set dttm column
+            offset_metrics_df = self.normalize_df(offset_metrics_df, query_object)
+
+            # 2. rename extra query columns
+            offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
+
+        # cache df and query if caching is enabled
+        if cache_key and cache_timeout_fn:
+            value = {
+                "df": offset_metrics_df,
+                "query": result.query,
+            }
+            cache.set(
+                key=cache_key,
+                value=value,
+                timeout=cache_timeout_fn(),
+                datasource_uid=self.uid,
+                region=CacheRegion.DATA,
+            )
+
+        return offset_metrics_df, result.query
+
     @staticmethod
     def get_time_grain(query_object: QueryObject) -> Any | None:
         if (
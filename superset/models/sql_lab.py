@@ -271,6 +271,21 @@ class Query(
             "verbose_map": {},
         }
 
+    def get_data_field(self, field: str) -> Any:
+        """
+        Get a field of `data`, without building the whole payload when possible.
+
+        :param field: The key of the field in `data`
+        :returns: The value of the field, or None if it's missing
+        """
+        if field == "name":
+            return self.tab_name
+        if field == "verbose_map":
+            return {}
+        if field in {"id", "type"}:
+            return getattr(self, field)
+        return self.data.get(field)
+
     def raise_for_access(self) -> None:
         """
         Raise an exception if the user cannot access the resource.
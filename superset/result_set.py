@@ -17,7 +17,10 @@
 """Superset wrapper around pyarrow.Table."""
 
 import datetime
+import itertools
 import logging
+from collections.abc import Sequence
+from operator import itemgetter
 from typing import Any, Optional
 
 import numpy as np
@@ -63,21 +66,41 @@ def stringify(obj: Any) -> str:
     return json.dumps(obj, default=json.json_iso_dttm_ser)
 
 
+def stringify_value(value: Any) -> str:
+    """
+    Convert a single value to a string, the way ``stringify_values`` does.
+    """
+    obj = np.empty((), dtype=object)
+    obj[()] = value
+    try:
+        # for simple string conversions
+        # this handles odd character types better
+        return str(obj.astype(str))
+    except ValueError:
+        return stringify(obj)
+
+
 def stringify_values(array: NDArray[Any]) -> NDArray[Any]:
-    result = np.copy(array)
-
-    with np.nditer(result, flags=["refs_ok"], op_flags=[["readwrite"]]) as it:
-        for obj in it:
-            if na_obj := pd.isna(obj):
-                # pandas <NA> type cannot be converted to string
-                obj[na_obj] = None
-            else:
-                try:
-                    # for simple string conversions
-                    # this handles odd character types better
-                    obj[...] = obj.astype(str)
-                except ValueError:
-                    obj[...] = stringify(obj)
+    """
+    Convert the values of an object array to strings, keeping nulls as ``None``.
+
+    Nulls are found in a single vectorized pass, and values that are already
+    strings are kept as is, so only the remaining values are converted.
+    """
+    result = np.array(array, dtype=object)
+    if not result.size:
+        return result
+
+    # pandas <NA> type cannot be converted to string
+    nulls = pd.isna(result)
+    result[nulls] = None
+
+    strings = np.fromiter(
+        (isinstance(value, str) for value in result), dtype=bool, count=result.size
+    )
+    offending = ~nulls & ~strings
+    if offending.any():
+        result[offending] = np.frompyfunc(stringify_value, 1, 1)(result[offending])
 
     return result
 
@@ -102,17 +125,18 @@ def convert_to_string(value: Any) -> str:
 class SupersetResultSet:
     def __init__(  # pylint: disable=too-many-locals  # noqa: C901
         self,
-        data: DbapiResult,
+        data: DbapiResult | pa.Table,
         cursor_description: DbapiDescription,
         db_engine_spec: type[BaseEngineSpec],
     ):
         self.db_engine_spec = db_engine_spec
+        if isinstance(data, pa.Table):
+            self._init_from_arrow(data, cursor_description)
+            return
+
         data = data or []
         column_names: list[str] = []
-        pa_data: list[pa.Array] = []
         deduped_cursor_desc: list[tuple[Any, ...]] = []
-        numpy_dtype: list[tuple[str, ...]] = []
-        stringified_arr: NDArray[Any]
 
         if cursor_description:
             # get deduped list of column names
@@ -128,70 +152,160 @@ class SupersetResultSet:
                 )
             ]
 
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-
-        for column in column_names:
-            try:
-                pa_data.append(pa.array(array[column].tolist()))
-            except (
-                pa.lib.ArrowInvalid,
-                pa.lib.ArrowTypeError,
-                pa.lib.ArrowNotImplementedError,
-                ValueError,
-                TypeError,  # this is super hackey,
-                # https://issues.apache.org/jira/browse/ARROW-7855
-            ):
-                # attempt serialization of values as strings
-                stringified_arr = stringify_values(array[column])
-                pa_data.append(pa.array(stringified_arr.tolist()))
-
-        if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
-                if pa.types.is_nested(pa_data[i].type):
-                    # TODO: revisit nested column serialization once nested types
-                    #  are added as a natively supported column type in Superset
-                    #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
-
-                elif pa.types.is_temporal(pa_data[i].type):
-                    # workaround for bug converting
-                    # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
-                    # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
-                    if sample and isinstance(sample, datetime.datetime):
-                        try:
-                            if sample.tzinfo:
-                                tz = sample.tzinfo
-                                series = pd.Series(array[column])
-                                series = pd.to_datetime(series, utc=True)
-                                pa_data[i] = pa.Array.from_pandas(
-                                    series,
-                                    type=pa.timestamp("ns", tz=tz),
-                                )
-                        except Exception as ex:  # pylint: disable=broad-except
-                            logger.exception(ex)
+        pa_data = [
+            self._to_arrow_array(values)
+            for values in self._transpose(data, len(column_names))
+        ]
 
         if not pa_data:
             column_names = []
 
         self.table = pa.Table.from_arrays(pa_data, names=column_names)
-        self._type_dict: dict[str, Any] = {}
+        self._type_dict = self._get_type_dict(column_names, deduped_cursor_desc)
+
+    @staticmethod
+    def _transpose(data: DbapiResult, num_columns: int) -> list[list[Any]]:
+        """
+        Transpose rows into one list of values per column.
+
+        Columns are gathered with ``operator.itemgetter``, which doesn't allocate an
+        object per row; on large results that churn (eg, from ``zip(*data)``) makes
+        the garbage collector repeatedly walk every value of the result.
+        """
+        if not isinstance(data, list):
+            data = list(data)
+        if data and not isinstance(data[0], (tuple, list)):
+            data = [tuple(row) for row in data]
+
+        lengths = set(map(len, data))
+        if len(lengths) > 1:
+            raise ValueError("All rows must have the same number of values")
+        if lengths and lengths != {num_columns}:
+            raise ValueError(
+                f"Expected {num_columns} values per row, got {lengths.pop()}"
+            )
+
+        return [list(map(itemgetter(i), data)) for i in range(num_columns)]
+
+    @staticmethod
+    def _sample_type(values: Sequence[Any]) -> Optional[pa.DataType]:
+        """
+        Infer the Arrow type of a column from its first non-null values.
+        """
+        sample = list(
+            itertools.islice((value for value in values if value is not None), 100)
+        )
+        try:
+            return pa.array(sample).type
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+    def _to_arrow_array(self, values: Sequence[Any]) -> pa.Array:
+        """
+        Convert the values of a column to an Arrow array.
+
+        The type inferred from a sample decides how the column is converted: nested
+        values are serialized as strings directly, and timezone-aware timestamps go
+        through pandas. Columns that Arrow can't convert are stringified.
+        """
+        sample_type = self._sample_type(values)
+        if sample_type is not None and pa.types.is_nested(sample_type):
+            # TODO: revisit nested column serialization once nested types
+            #  are added as a natively supported column type in Superset
+            #  (superset.utils.core.GenericDataType).
+            return self._to_string_array(values)
+
+        if (
+            sample_type is not None
+            and pa.types.is_timestamp(sample_type)
+            and sample_type.tz
+        ):
+            # workaround for bug converting
+            # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
+            # related: https://issues.apache.org/jira/browse/ARROW-5248
+            sample = self.first_nonempty(values)
+            if sample and isinstance(sample, datetime.datetime) and sample.tzinfo:
+                try:
+                    array = np.fromiter(values, dtype=object, count=len(values))
+                    series = pd.to_datetime(pd.Series(array), utc=True)
+                    return pa.Array.from_pandas(
+                        series,
+                        type=pa.timestamp("ns", tz=sample.tzinfo),
+                    )
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.exception(ex)
+
+        try:
+            array = pa.array(values)
+        except (
+            pa.lib.ArrowInvalid,
+            pa.lib.ArrowTypeError,
+            pa.lib.ArrowNotImplementedError,
+            ValueError,
+            TypeError,  # this is super hackey,
+            # https://issues.apache.org/jira/browse/ARROW-7855
+        ):
+            # attempt serialization of values as strings
+            return self._to_string_array(values)
+
+        if pa.types.is_nested(array.type):
+            return self._to_string_array(values)
+        return array
+
+    @staticmethod
+    def _to_string_array(values: Sequence[Any]) -> pa.Array:
+        array = np.fromiter(values, dtype=object, count=len(values))
+        return pa.array(stringify_values(array))
+
+    def _init_from_arrow(
+        self,
+        table: pa.Table,
+        cursor_description: DbapiDescription,
+    ) -> None:
+        """
+        Build the result set from an Arrow table returned by the driver.
+
+        The table is used as is, without going through Python objects; only nested
+        columns are converted to strings, the same way as in the row-based path.
+        """
+        deduped_cursor_desc: list[tuple[Any, ...]] = []
+        if cursor_description and len(cursor_description) == table.num_columns:
+            column_names = dedup(
+                [convert_to_string(col[0]) for col in cursor_description]
+            )
+            deduped_cursor_desc = [
+                (column_name, *list(description)[1:])
+                for column_name, description in zip(
+                    column_names, cursor_description, strict=False
+                )
+            ]
+        else:
+            column_names = dedup(table.column_names)
+        table = table.rename_columns(column_names)
+
+        for i, field in enumerate(table.schema):
+            if pa.types.is_nested(field.type):
+                stringified = self._to_string_array(table.column(i).to_pylist())
+                table = table.set_column(i, field.name, stringified.cast(pa.string()))
+
+        self.table = table
+        self._type_dict = self._get_type_dict(column_names, deduped_cursor_desc)
+
+    def _get_type_dict(
+        self,
+        column_names: list[str],
+        deduped_cursor_desc: list[tuple[Any, ...]],
+    ) -> dict[str, Any]:
         try:
             # The driver may not be passing a cursor.description
-            self._type_dict = {
-                col: db_engine_spec.get_datatype(deduped_cursor_desc[i][1])
+            return {
+                col: self.db_engine_spec.get_datatype(deduped_cursor_desc[i][1])
                 for i, col in enumerate(column_names)
                 if deduped_cursor_desc
             }
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
+            return {}
 
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
@@ -215,7 +329,7 @@ class SupersetResultSet:
             return table.to_pandas(integer_object_nulls=True, timestamp_as_object=True)
 
     @staticmethod
-    def first_nonempty(items: NDArray[Any]) -> Any:
+    def first_nonempty(items: Sequence[Any]) -> Any:
         return next((i for i in items if i), None)
 
     def is_temporal(self, db_type_str: Optional[str]) -> bool:
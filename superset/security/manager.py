@@ -19,11 +19,13 @@
 
 import logging
 import re
+import secrets
 import time
 from collections import defaultdict
+from collections.abc import Iterable
 from typing import Any, Callable, cast, NamedTuple, Optional, TYPE_CHECKING
 
-from flask import current_app, Flask, g, Request
+from flask import current_app, Flask, g, has_app_context, Request
 from flask_appbuilder import Model
 from flask_appbuilder.security.sqla.apis import RoleApi, UserApi
 from flask_appbuilder.security.sqla.manager import SecurityManager
@@ -51,7 +53,6 @@ from sqlalchemy import and_, inspect, or_
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.orm import eagerload
 from sqlalchemy.orm.mapper import Mapper
-from sqlalchemy.orm.query import Query as SqlaQuery
 from sqlalchemy.sql import exists
 
 from superset.constants import RouteMethod
@@ -60,6 +61,7 @@ from superset.exceptions import (
     DatasetInvalidPermissionEvaluationException,
     SupersetSecurityException,
 )
+from superset.security import permissions_cache
 from superset.security.guest_token import (
     GuestToken,
     GuestTokenResources,
@@ -110,6 +112,16 @@ class DatabaseCatalogSchema(NamedTuple):
     schema: str
 
 
+class RLSFilterClause(NamedTuple):
+    id: int
+    group_key: Optional[str]
+    clause: str
+
+
+# key of the version of the RLS filters in the cache, changed when they're modified
+RLS_FILTERS_VERSION_KEY = "rls_filters:version"
+
+
 class SupersetSecurityListWidget(ListWidget):  # pylint: disable=too-few-public-methods
     """
     Redeclaring to avoid circular imports
@@ -489,6 +501,81 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             return self.is_item_public(permission_name, view_name)
         return self._has_view_access(user, permission_name, view_name)
 
+    def get_compiled_permissions(
+        self, role_ids: Iterable[int]
+    ) -> permissions_cache.Permissions:
+        """
+        Get the permissions of a set of roles, as (permission, view menu) pairs.
+
+        They're compiled with a single query, and kept in memory and in the cache
+        until roles or permissions are modified, or `PERMISSIONS_CACHE_TIMEOUT`
+        seconds.
+
+        :param role_ids: The IDs of the roles
+        :returns: The permissions granted by any of the roles
+        """
+        role_key = tuple(sorted(set(role_ids)))
+        stats_logger = get_conf()["STATS_LOGGER"]
+        version = permissions_cache.get_permissions_version()
+        local_cache = permissions_cache.get_local_cache()
+        if (permissions := local_cache.get(version, role_key)) is not None:
+            stats_logger.incr("permissions.local_cache_hit")
+            return permissions
+
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        cache_key = permissions_cache.get_cache_key(version, role_key)
+        if (cached := cache_manager.cache.get(cache_key)) is not None:
+            stats_logger.incr("permissions.cache_hit")
+            permissions = frozenset(tuple(pair) for pair in cached)
+        else:
+            stats_logger.incr("permissions.cache_miss")
+            permissions = self._query_permissions(role_key)
+            cache_manager.cache.set(
+                cache_key,
+                sorted(permissions),
+                timeout=get_conf()["PERMISSIONS_CACHE_TIMEOUT"],
+            )
+
+        local_cache.set(version, role_key, permissions)
+        return permissions
+
+    def _query_permissions(
+        self, role_ids: tuple[int, ...]
+    ) -> permissions_cache.Permissions:
+        return frozenset(
+            (permission_name, view_menu_name)
+            for permission_name, view_menu_name in self.session.query(
+                self.permission_model.name, self.viewmenu_model.name
+            )
+            .select_from(self.permissionview_model)
+            .join(self.permission_model)
+            .join(self.viewmenu_model)
+            .join(assoc_permissionview_role)
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+        )
+
+    def _has_view_access(self, user: Any, permission_name: str, view_name: str) -> bool:
+        if not permissions_cache.is_cache_enabled():
+            return super()._has_view_access(user, permission_name, view_name)
+
+        roles = self.get_user_roles(user)
+
+        # built-in roles are defined in the config, by patterns
+        if any(
+            role.name in self.builtin_roles
+            and self._has_access_builtin_roles(role, permission_name, view_name)
+            for role in roles
+        ):
+            return True
+
+        role_ids = [role.id for role in roles if role.name not in self.builtin_roles]
+        return bool(role_ids) and (
+            permission_name,
+            view_name,
+        ) in self.get_compiled_permissions(role_ids)
+
     def can_access_all_queries(self) -> bool:
         """
         Return True if the user can access all SQL Lab queries, False otherwise.
@@ -728,7 +815,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         """
 
         return (
-            f"This endpoint requires the datasource {datasource.data['id']}, "
+            f"This endpoint requires the datasource {datasource.get_data_field('id')}, "
             "database or `all_datasource_access` permission"
         )
 
@@ -760,8 +847,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             level=ErrorLevel.WARNING,
             extra={
                 "link": self.get_datasource_access_link(datasource),
-                "datasource": datasource.data["id"],
-                "datasource_name": datasource.data["name"],
+                "datasource": datasource.get_data_field("id"),
+                "datasource_name": datasource.get_data_field("name"),
             },
         )
 
@@ -854,6 +941,19 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> set[str]:
+        # guest users have no ID, so they're never granted view menus by their roles
+        if (
+            not g.user.is_anonymous
+            and not self.is_guest_user(g.user)
+            and permissions_cache.is_cache_enabled()
+        ):
+            role_ids = [role.id for role in self.get_user_roles(g.user)]
+            return {
+                view_menu_name
+                for name, view_menu_name in self.get_compiled_permissions(role_ids)
+                if name == permission_name
+            }
+
         base_query = (
             self.session.query(self.viewmenu_model.name)
             .join(self.permissionview_model)
@@ -2191,6 +2291,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being changed
         """
+        permissions_cache.flag_permissions_changed()
 
     def on_view_menu_after_insert(
         self, mapper: Mapper, connection: Connection, target: ViewMenu
@@ -2223,6 +2324,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        permissions_cache.flag_permissions_changed()
 
     def on_permission_after_insert(
         self, mapper: Mapper, connection: Connection, target: Permission
@@ -2255,6 +2357,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        permissions_cache.flag_permissions_changed()
 
     def on_permission_view_after_delete(
         self, mapper: Mapper, connection: Connection, target: PermissionView
@@ -2271,6 +2374,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param connection: The DB-API connection
         :param target: The mapped instance being persisted
         """
+        permissions_cache.flag_permissions_changed()
 
     @staticmethod
     def get_exclude_users_from_lists() -> list[str]:
@@ -2475,7 +2579,8 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                             and dashboard_.json_metadata
                             and (json_metadata := json.loads(dashboard_.json_metadata))
                             and any(
-                                target.get("datasetId") == datasource.data["id"]
+                                target.get("datasetId")
+                                == datasource.get_data_field("id")
                                 for fltr in json_metadata.get(
                                     "native_filter_configuration",
                                     [],
@@ -2593,15 +2698,22 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                 rule
                 for rule in guest_user.rls
                 if not rule.get("dataset")
-                or str(rule.get("dataset")) == str(dataset.data["id"])
+                or str(rule.get("dataset")) == str(dataset.get_data_field("id"))
             ]
         return []
 
-    def get_rls_filters(self, table: "BaseDatasource | Explorable") -> list[SqlaQuery]:
+    def get_rls_filters(
+        self, table: "BaseDatasource | Explorable"
+    ) -> list[RLSFilterClause]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
 
+        The filters only depend on the roles of the user, so they're cached for each
+        set of roles and table: for the duration of the request, and across requests
+        in a shared cache for `RLS_FILTERS_CACHE_TIMEOUT` seconds. Modifying RLS
+        filters invalidates them.
+
         :param table: The table to check against
         :returns: A list of filters
         """
@@ -2609,6 +2721,49 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         if not (hasattr(g, "user") and g.user is not None):
             return []
 
+        role_ids = tuple(sorted({role.id for role in self.get_user_roles(g.user)}))
+        table_id = table.get_data_field("id")
+        stats_logger = get_conf()["STATS_LOGGER"]
+
+        request_cache: dict[tuple[Any, ...], list[RLSFilterClause]] = g.setdefault(
+            "rls_filters", {}
+        )
+        if (key := (role_ids, table_id)) in request_cache:
+            stats_logger.incr("rls_filters.request_cache_hit")
+            return list(request_cache[key])
+
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        cache_timeout = get_conf()["RLS_FILTERS_CACHE_TIMEOUT"]
+        cache_key = None
+        # invalidating the filters only reaches all the processes through a shared
+        # cache
+        if cache_timeout is not None and permissions_cache.is_shared_cache(
+            cache_manager.cache
+        ):
+            version = self._get_rls_filters_version()
+            role_key = ",".join(str(role_id) for role_id in role_ids)
+            cache_key = f"rls_filters:{version}:{role_key}:{table_id}"
+            if (filters := cache_manager.cache.get(cache_key)) is not None:
+                stats_logger.incr("rls_filters.cache_hit")
+                request_cache[key] = [RLSFilterClause(*row) for row in filters]
+                return list(request_cache[key])
+
+        stats_logger.incr("rls_filters.cache_miss")
+        filters = [
+            RLSFilterClause(*row) for row in self._query_rls_filters(role_ids, table_id)
+        ]
+        request_cache[key] = filters
+        if cache_key:
+            cache_manager.cache.set(
+                cache_key, [tuple(row) for row in filters], timeout=cache_timeout
+            )
+        return list(filters)
+
+    def _query_rls_filters(
+        self, role_ids: tuple[int, ...], table_id: Any
+    ) -> list[tuple[int, Optional[str], str]]:
         # pylint: disable=import-outside-toplevel
         from superset.connectors.sqla.models import (
             RLSFilterRoles,
@@ -2616,14 +2771,13 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             RowLevelSecurityFilter,
         )
 
-        user_roles = [role.id for role in self.get_user_roles(g.user)]
         regular_filter_roles = (
             self.session.query(RLSFilterRoles.c.rls_filter_id)
             .join(RowLevelSecurityFilter)
             .filter(
                 RowLevelSecurityFilter.filter_type == RowLevelSecurityFilterType.REGULAR
             )
-            .filter(RLSFilterRoles.c.role_id.in_(user_roles))
+            .filter(RLSFilterRoles.c.role_id.in_(role_ids))
         )
         base_filter_roles = (
             self.session.query(RLSFilterRoles.c.rls_filter_id)
@@ -2631,10 +2785,10 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             .filter(
                 RowLevelSecurityFilter.filter_type == RowLevelSecurityFilterType.BASE
             )
-            .filter(RLSFilterRoles.c.role_id.in_(user_roles))
+            .filter(RLSFilterRoles.c.role_id.in_(role_ids))
         )
         filter_tables = self.session.query(RLSFilterTables.c.rls_filter_id).filter(
-            RLSFilterTables.c.table_id == table.data["id"]
+            RLSFilterTables.c.table_id == table_id
         )
         query = (
             self.session.query(
@@ -2658,7 +2812,46 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
                 )
             )
         )
-        return query.all()
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def _get_rls_filters_version() -> str:
+        """
+        Get the version of the RLS filters, read once per request.
+        """
+        if version := g.get("rls_filters_version"):
+            return version
+
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        version = cache_manager.cache.get(RLS_FILTERS_VERSION_KEY)
+        if version is None:
+            # a missing version, eg, evicted, must not match the entries of an older one
+            version = secrets.token_hex(8)
+            cache_manager.cache.set(RLS_FILTERS_VERSION_KEY, version, timeout=0)
+        g.rls_filters_version = version
+        return version
+
+    @staticmethod
+    def invalidate_rls_filters_cache() -> None:
+        """
+        Invalidate the cached RLS filters, once they've been modified.
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.extensions import cache_manager
+
+        if not has_app_context():
+            return
+
+        g.pop("rls_filters", None)
+        g.pop("rls_filters_version", None)
+        try:
+            cache_manager.cache.set(
+                RLS_FILTERS_VERSION_KEY, secrets.token_hex(8), timeout=0
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Could not invalidate the cached RLS filters")
 
     def get_rls_sorted(
         self, table: "BaseDatasource | Explorable"
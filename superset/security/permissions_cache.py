@@ -0,0 +1,224 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Cache of the permissions of sets of roles.
+
+The permissions of a set of roles, as (permission, view menu) pairs, are compiled
+once per version of the permissions and kept in the memory of each process and in
+the cache. The version is stored in the cache, read once per request, and changed
+once a transaction modifying roles or permissions is committed.
+
+The version can only reach all the processes through a shared cache, so the
+permissions aren't cached with a NullCache or a SimpleCache.
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import sqlalchemy as sa
+from flask import current_app, g, has_app_context
+from flask_appbuilder.security.sqla.models import PermissionView, Role, ViewMenu
+from flask_caching.backends import NullCache, SimpleCache
+from sqlalchemy.engine.base import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.mapper import Mapper
+
+logger = logging.getLogger(__name__)
+
+PERMISSIONS_VERSION_KEY = "permissions:version"
+
+Permissions = frozenset[tuple[str, str]]
+
+
+class LocalPermissionsCache:
+    """
+    A thread-safe LRU cache of the permissions of sets of roles, in this process.
+
+    Entries expire after `timeout` seconds, bounding how long a process can miss a
+    change of the version.
+    """
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries: OrderedDict[
+            tuple[str, tuple[int, ...]], tuple[float, Permissions]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, version: str, role_ids: tuple[int, ...]) -> Permissions | None:
+        with self._lock:
+            entry = self._entries.get((version, role_ids))
+            if entry is None:
+                return None
+            expires_at, permissions = entry
+            if expires_at <= time.monotonic():
+                del self._entries[(version, role_ids)]
+                return None
+            self._entries.move_to_end((version, role_ids))
+            return permissions
+
+    def set(
+        self,
+        version: str,
+        role_ids: tuple[int, ...],
+        permissions: Permissions,
+    ) -> None:
+        with self._lock:
+            self._entries[(version, role_ids)] = (
+                time.monotonic() + self.timeout,
+                permissions,
+            )
+            self._entries.move_to_end((version, role_ids))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = LocalPermissionsCache(128, 60)
+
+
+def get_local_cache() -> LocalPermissionsCache:
+    _local_cache.max_entries = current_app.config["PERMISSIONS_LOCAL_CACHE_SIZE"]
+    _local_cache.timeout = current_app.config["PERMISSIONS_LOCAL_CACHE_TIMEOUT"]
+    return _local_cache
+
+
+def is_shared_cache(cache: Any) -> bool:
+    """
+    Whether a cache is shared by the processes, and keeps what is set in it.
+
+    A NullCache keeps nothing, and a SimpleCache is only seen by the process that
+    set the entries, so invalidating them wouldn't reach the other processes.
+    """
+    backend = getattr(cache, "cache", cache)
+    return not isinstance(backend, (NullCache, SimpleCache))
+
+
+def is_cache_enabled() -> bool:
+    """
+    Whether the permissions are cached, which requires a shared cache.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import cache_manager
+
+    return current_app.config[
+        "PERMISSIONS_CACHE_TIMEOUT"
+    ] is not None and is_shared_cache(cache_manager.cache)
+
+
+def get_permissions_version() -> str:
+    """
+    Get the version of the permissions, read once per request.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import cache_manager
+
+    if version := g.get("permissions_version"):
+        return version
+
+    try:
+        version = cache_manager.cache.get(PERMISSIONS_VERSION_KEY)
+        if version is None:
+            # a missing version, eg, evicted, must not match the entries of an older
+            # one
+            version = secrets.token_hex(8)
+            cache_manager.cache.set(PERMISSIONS_VERSION_KEY, version, timeout=0)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Could not read the version of the permissions")
+        version = secrets.token_hex(8)
+
+    g.permissions_version = version
+    return version
+
+
+def get_cache_key(version: str, role_ids: tuple[int, ...]) -> str:
+    return f"permissions:{version}:{','.join(str(role_id) for role_id in role_ids)}"
+
+
+def invalidate_permissions() -> None:
+    """
+    Invalidate the permissions of all the sets of roles, in all the processes.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import cache_manager
+
+    if not has_app_context():
+        return
+
+    g.pop("permissions_version", None)
+    _local_cache.clear()
+    try:
+        cache_manager.cache.set(
+            PERMISSIONS_VERSION_KEY, secrets.token_hex(8), timeout=0
+        )
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Could not invalidate the cached permissions")
+
+
+def flag_permissions_changed() -> None:
+    """
+    Invalidate the permissions once the current transaction is committed.
+
+    Invalidating them before the commit would let other requests compile them
+    again from the permissions before the change.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import db
+
+    if has_app_context():
+        db.session.info["permissions_changed"] = True
+
+
+def on_change(mapper: Mapper, connection: Connection, target: Any) -> None:
+    flag_permissions_changed()
+
+
+def on_role_update(mapper: Mapper, connection: Connection, target: Role) -> None:
+    # pylint: disable=import-outside-toplevel
+    from superset.extensions import security_manager
+
+    security_manager.on_role_after_update(mapper, connection, target)
+
+
+def after_commit(session: Session) -> None:
+    if session.info.pop("permissions_changed", False):
+        invalidate_permissions()
+
+
+def after_rollback(session: Session) -> None:
+    session.info.pop("permissions_changed", None)
+
+
+sa.event.listen(Session, "after_commit", after_commit)
+sa.event.listen(Session, "after_rollback", after_rollback)
+sa.event.listen(Role, "after_update", on_role_update)
+sa.event.listen(Role, "after_delete", on_change)
+sa.event.listen(PermissionView, "after_delete", on_change)
+sa.event.listen(ViewMenu, "after_update", on_change)
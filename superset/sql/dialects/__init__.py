@@ -15,9 +15,10 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from .clickzetta import ClickZetta
 from .db2 import DB2
 from .dremio import Dremio
 from .firebolt import Firebolt, FireboltOld
 from .pinot import Pinot
 
-__all__ = ["DB2", "Dremio", "Firebolt", "FireboltOld", "Pinot"]
+__all__ = ["ClickZetta", "DB2", "Dremio", "Firebolt", "FireboltOld", "Pinot"]
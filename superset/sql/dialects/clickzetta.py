@@ -0,0 +1,54 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Spark-based dialect for ClickZetta Lakehouse.
+
+ClickZetta accepts backtick-quoted identifiers, but identifiers are case-insensitive
+and quoting every name (as the SQLAlchemy driver does) produces statements that are
+hard to read and, for some clients, hard to run. This dialect parses backticks like
+Spark, and only emits them when an identifier actually needs quoting.
+"""
+
+from __future__ import annotations
+
+import re
+
+from sqlglot import exp
+from sqlglot.dialects.spark import Spark
+
+SAFE_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class ClickZetta(Spark):
+    """
+    ClickZetta Lakehouse dialect.
+    """
+
+    class Generator(Spark.Generator):
+        def identifier_sql(self, expression: exp.Identifier) -> str:
+            """
+            Drop quotes from identifiers that don't need them.
+            """
+            text = expression.name
+            if (
+                expression.quoted
+                and SAFE_IDENTIFIER.match(text)
+                and text.upper() not in self.dialect.tokenizer_class.KEYWORDS
+            ):
+                return text
+            return super().identifier_sql(expression)
@@ -21,12 +21,15 @@ import copy
 import enum
 import logging
 import re
+import threading
 import urllib.parse
+from collections import OrderedDict
 from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any, Generic, Optional, TYPE_CHECKING, TypeVar
 
 import sqlglot
+from flask import current_app, has_app_context
 from jinja2 import nodes, Template
 from sqlglot import exp
 from sqlglot.dialects.dialect import (
@@ -45,7 +48,7 @@ from sqlglot.optimizer.scope import (
 )
 
 from superset.exceptions import QueryClauseValidationException, SupersetParseError
-from superset.sql.dialects import DB2, Dremio, Firebolt, Pinot
+from superset.sql.dialects import ClickZetta, DB2, Dremio, Firebolt, Pinot
 
 if TYPE_CHECKING:
     from superset.models.core import Database
@@ -62,6 +65,7 @@ SQLGLOT_DIALECTS = {
     "bigquery": Dialects.BIGQUERY,
     "clickhouse": Dialects.CLICKHOUSE,
     "clickhousedb": Dialects.CLICKHOUSE,
+    "clickzetta": ClickZetta,
     "cockroachdb": Dialects.POSTGRES,
     "couchbase": Dialects.MYSQL,
     # "crate": ???
@@ -336,6 +340,109 @@ InternalRepresentation = TypeVar("InternalRepresentation")
 TBaseSQLStatement = TypeVar("TBaseSQLStatement")  # pylint: disable=invalid-name
 
 
+class ParsedScriptCache:
+    """
+    A thread-safe LRU cache of the ASTs of parsed scripts.
+
+    Entries are keyed on the engine and the script; comparing scripts, rather than
+    only their hashes, rules out returning the AST of another script. Statements are
+    modified in place, eg, when applying a limit or RLS, so the cache keeps its own
+    copy of the ASTs and returns new copies, which is still much faster than parsing.
+
+    Scripts longer than ``max_script_length`` characters aren't cached, so that the
+    memory used by the cache stays bounded, whatever the size of the scripts.
+    """
+
+    def __init__(self, max_entries: int, max_script_length: int) -> None:
+        self.max_entries = max_entries
+        self.max_script_length = max_script_length
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], list[exp.Expression]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, script: str) -> bool:
+        return bool(self.max_entries) and len(script) <= self.max_script_length
+
+    def get(self, script: str, engine: str) -> list[exp.Expression] | None:
+        """
+        Get a copy of the ASTs of a script, if present.
+        """
+        if not self.is_cacheable(script):
+            return None
+
+        key = (engine, script)
+        with self._lock:
+            statements = self._entries.get(key)
+            if statements is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        self._log_stats("hit" if statements is not None else "miss")
+        if statements is None:
+            return None
+        return [
+            statement.copy() if statement else statement for statement in statements
+        ]
+
+    def set(
+        self,
+        script: str,
+        engine: str,
+        statements: list[exp.Expression],
+    ) -> None:
+        """
+        Add a copy of the ASTs of a script, evicting the least recently used ones if
+        needed.
+        """
+        if not self.is_cacheable(script):
+            return
+
+        key = (engine, script)
+        statements = [
+            statement.copy() if statement else statement for statement in statements
+        ]
+        with self._lock:
+            self._entries[key] = statements
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _log_stats(result: str) -> None:
+        if has_app_context():
+            current_app.config["STATS_LOGGER"].incr(f"sql_parse_cache.{result}")
+
+
+_parsed_script_cache = ParsedScriptCache(512, 20_000)
+
+
+def get_parsed_script_cache() -> ParsedScriptCache:
+    """
+    Get the cache of parsed scripts of this process, sized by
+    ``SQL_PARSE_CACHE_SIZE`` and ``SQL_PARSE_CACHE_MAX_SCRIPT_LENGTH`` when running
+    in the app.
+    """
+    if has_app_context():
+        config = current_app.config
+        _parsed_script_cache.max_entries = config["SQL_PARSE_CACHE_SIZE"]
+        _parsed_script_cache.max_script_length = config[
+            "SQL_PARSE_CACHE_MAX_SCRIPT_LENGTH"
+        ]
+    return _parsed_script_cache
+
+
 class BaseSQLStatement(Generic[InternalRepresentation]):
     """
     Base class for SQL statements.
@@ -556,7 +663,18 @@ class SQLStatement(BaseSQLStatement[exp.Expression]):
     def _parse(cls, script: str, engine: str) -> list[exp.Expression]:
         """
         Parse helper.
+
+        The ASTs of scripts are cached, since the same script is usually parsed many
+        times in a request, eg, to check access, apply a limit and RLS.
         """
+        cache = get_parsed_script_cache()
+        if (statements := cache.get(script, engine)) is None:
+            statements = cls._parse_uncached(script, engine)
+            cache.set(script, engine, statements)
+        return statements
+
+    @classmethod
+    def _parse_uncached(cls, script: str, engine: str) -> list[exp.Expression]:
         dialect = SQLGLOT_DIALECTS.get(engine)
         try:
             statements = sqlglot.parse(script, dialect=dialect)
@@ -21,11 +21,13 @@ import sys
 import uuid
 from contextlib import closing
 from datetime import datetime
+from itertools import chain
 from sys import getsizeof
 from typing import Any, cast, Optional, TYPE_CHECKING, TypeVar, Union
 
 import backoff
 import msgpack
+import pyarrow as pa
 from celery.exceptions import SoftTimeLimitExceeded
 from flask import current_app as app, has_app_context
 from flask_babel import gettext as __
@@ -50,6 +52,7 @@ from superset.exceptions import (
     SupersetErrorsException,
     SupersetInvalidCTASException,
     SupersetInvalidCVASException,
+    SupersetQueryResultsException,
     SupersetResultsBackendNotConfigureException,
 )
 from superset.extensions import celery_app, event_logger
@@ -57,12 +60,16 @@ from superset.models.sql_lab import Query
 from superset.result_set import SupersetResultSet
 from superset.sql.parse import BaseSQLStatement, CTASMethod, SQLScript, Table
 from superset.sqllab.limiting_factor import LimitingFactor
-from superset.sqllab.utils import write_ipc_buffer
+from superset.sqllab.utils import (
+    ResultsChunkWriter,
+    ResultSizeTracker,
+    write_ipc_buffer,
+)
 from superset.utils import json
+from superset.utils.compression import compress_results
 from superset.utils.core import (
     override_user,
     QuerySource,
-    zlib_compress,
 )
 from superset.utils.dates import now_as_float
 from superset.utils.decorators import stats_timing
@@ -73,6 +80,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 BYTES_IN_MB = 1024 * 1024
+# rows fetched at a time when checking the size of results
+PAYLOAD_SIZE_BATCH_ROWS = 10_000
 
 
 class SqlLabException(Exception):  # noqa: N818
@@ -249,8 +258,14 @@ def execute_query(  # pylint: disable=too-many-statements, too-many-locals  # no
     query: Query,
     cursor: Any,
     log_params: Optional[dict[str, Any]] = None,
+    writer: Optional[ResultsChunkWriter] = None,
 ) -> SupersetResultSet:
-    """Executes a single SQL statement"""
+    """
+    Executes a single SQL statement.
+
+    When a ``writer`` is given the results are fetched in batches and written to the
+    results backend as they arrive, and the returned result set has no rows.
+    """
     database: Database = query.database
     db_engine_spec = database.db_engine_spec
 
@@ -282,12 +297,16 @@ def execute_query(  # pylint: disable=too-many-statements, too-many-locals  # no
                     str(query.to_dict()),
                 )
                 increased_limit = None if query.limit is None else query.limit + 1
-                data = db_engine_spec.fetch_data(cursor, increased_limit)
-                if query.limit is None or len(data) <= query.limit:
-                    query.limiting_factor = LimitingFactor.NOT_LIMITED
+                if writer:
+                    data = []
+                    _write_result_batches(query, cursor, writer, increased_limit)
                 else:
-                    # return 1 row less than increased_query
-                    data = data[:-1]
+                    data = _fetch_data(query, cursor, increased_limit)
+                    if query.limit is None or len(data) <= query.limit:
+                        query.limiting_factor = LimitingFactor.NOT_LIMITED
+                    else:
+                        # return 1 row less than increased_query
+                        data = data[:-1]
     except SoftTimeLimitExceeded as ex:
         query.status = QueryStatus.TIMED_OUT
 
@@ -307,6 +326,9 @@ def execute_query(  # pylint: disable=too-many-statements, too-many-locals  # no
     except OAuth2RedirectError:
         # user needs to authenticate with OAuth2 in order to run query
         raise
+    except SupersetQueryResultsException:
+        # results are too large, or can't be stored
+        raise
     except Exception as ex:
         # query is stopped in another thread/worker
         # stopping raises expected exceptions which we should skip
@@ -322,6 +344,77 @@ def execute_query(  # pylint: disable=too-many-statements, too-many-locals  # no
     return SupersetResultSet(data, cursor_description, db_engine_spec)
 
 
+def _fetch_data(
+    query: Query,
+    cursor: Any,
+    limit: Optional[int],
+) -> Union[list[Any], pa.Table]:
+    """
+    Fetch the results of a query.
+
+    When SQLLAB_PAYLOAD_MAX_MB is set the results are fetched in batches, so that the
+    query can be aborted as soon as they're too large, instead of after serializing
+    them.
+    """
+    db_engine_spec = query.database.db_engine_spec
+    sql_lab_payload_max_mb = app.config.get("SQLLAB_PAYLOAD_MAX_MB")
+    if not sql_lab_payload_max_mb:
+        return db_engine_spec.fetch_data(cursor, limit)
+
+    # some drivers know how many rows the query returns before they're fetched
+    expected_rows = getattr(cursor, "rowcount", None)
+    if not isinstance(expected_rows, int) or expected_rows <= 0:
+        expected_rows = None
+    elif limit is not None:
+        expected_rows = min(expected_rows, limit)
+
+    tracker = ResultSizeTracker(
+        sql_lab_payload_max_mb * BYTES_IN_MB,
+        cursor.description,
+        db_engine_spec,
+        expected_rows,
+    )
+    stats_logger = app.config["STATS_LOGGER"]
+    batches: list[Union[list[Any], pa.Table]] = []
+    try:
+        for batch in db_engine_spec.fetch_data_batches(
+            cursor, PAYLOAD_SIZE_BATCH_ROWS, limit
+        ):
+            tracker.add(batch)
+            batches.append(batch)
+    except SupersetQueryResultsException:
+        logger.info("Query %d: Result size exceeds the allowed limit.", query.id)
+        stats_logger.incr("sqllab.query.results_too_large")
+        raise
+    finally:
+        stats_logger.histogram("sqllab.query.results_fetched_bytes", tracker.size)
+
+    if batches and isinstance(batches[0], pa.Table):
+        return pa.concat_tables(batches)
+    return list(chain.from_iterable(batches))
+
+
+def _write_result_batches(
+    query: Query,
+    cursor: Any,
+    writer: ResultsChunkWriter,
+    limit: Optional[int],
+) -> None:
+    db_engine_spec = query.database.db_engine_spec
+    fetched = 0
+    for batch in db_engine_spec.fetch_data_batches(cursor, writer.chunk_rows, limit):
+        rows = len(batch)
+        if query.limit is not None and fetched + rows > query.limit:
+            # return 1 row less than increased_query
+            batch = batch[: max(query.limit - fetched, 0)]
+        fetched += rows
+        if len(batch):
+            writer.write(SupersetResultSet(batch, cursor.description, db_engine_spec))
+
+    if query.limit is None or fetched <= query.limit:
+        query.limiting_factor = LimitingFactor.NOT_LIMITED
+
+
 def _serialize_payload(
     payload: dict[Any, Any], use_msgpack: Optional[bool] = False
 ) -> Union[bytes, str]:
@@ -453,6 +546,28 @@ def execute_sql_statements(  # noqa: C901
             for statement in parsed_script.statements
         ]
 
+    cache_timeout = database.cache_timeout
+    if cache_timeout is None:
+        cache_timeout = app.config["CACHE_DEFAULT_TIMEOUT"]
+
+    # stream the results of async queries into the results backend, in chunks
+    writer: Optional[ResultsChunkWriter] = None
+    chunk_rows = app.config["SQLLAB_RESULTS_BACKEND_CHUNK_ROWS"]
+    if (
+        chunk_rows
+        and store_results
+        and results_backend
+        and results_backend_use_msgpack
+        and not return_results
+    ):
+        sql_lab_payload_max_mb = app.config.get("SQLLAB_PAYLOAD_MAX_MB")
+        writer = ResultsChunkWriter(
+            str(uuid.uuid4()),
+            chunk_rows,
+            cache_timeout,
+            sql_lab_payload_max_mb * BYTES_IN_MB if sql_lab_payload_max_mb else None,
+        )
+
     with database.get_raw_connection(
         catalog=query.catalog,
         schema=query.schema,
@@ -489,11 +604,21 @@ def execute_sql_statements(  # noqa: C901
             query.executed_sql = database.mutate_sql_based_on_config(block)
 
             try:
-                result_set = execute_query(query, cursor, log_params)
+                result_set = execute_query(
+                    query,
+                    cursor,
+                    log_params,
+                    # only the results of the last block are returned
+                    writer if i == block_count - 1 else None,
+                )
             except SqlLabQueryStoppedException:
+                if writer:
+                    writer.discard()
                 payload.update({"status": QueryStatus.STOPPED})
                 return payload
             except Exception as ex:  # pylint: disable=broad-except
+                if writer:
+                    writer.discard()
                 msg = str(ex)
                 prefix_message = (
                     __(
@@ -512,10 +637,13 @@ def execute_sql_statements(  # noqa: C901
             conn.commit()
 
     # Success, updating the query entry in database
-    query.rows = result_set.size
+    # streamed results have no rows, but the columns of an empty result are kept
+    columns = writer.columns if writer and writer.columns else result_set.columns
+    query.rows = writer.rows if writer else result_set.size
+    app.config["STATS_LOGGER"].histogram("sqllab.query.results_rows", query.rows)
     query.progress = 100
     query.set_extra_json_key("progress", None)
-    query.set_extra_json_key("columns", result_set.columns)
+    query.set_extra_json_key("columns", columns)
     if query.select_as_cta:
         query.select_sql = database.select_star(
             Table(query.tmp_table_name, query.tmp_schema_name),
@@ -529,6 +657,9 @@ def execute_sql_statements(  # noqa: C901
     data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
         result_set, db_engine_spec, use_arrow_data, expand_data
     )
+    if writer:
+        # the data is in the chunks, and expanded when loading them
+        selected_columns = all_columns = columns
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
@@ -542,9 +673,11 @@ def execute_sql_statements(  # noqa: C901
         }
     )
     payload["query"]["state"] = QueryStatus.SUCCESS
+    if writer:
+        payload["chunks"] = writer.chunks
 
     if store_results and results_backend:
-        key = str(uuid.uuid4())
+        key = writer.key if writer else str(uuid.uuid4())
         payload["query"]["resultsKey"] = key
         logger.info(
             "Query %s: Storing results in results backend, key: %s", str(query_id), key
@@ -573,15 +706,21 @@ def execute_sql_statements(  # noqa: C901
                             )
                         )
 
-            cache_timeout = database.cache_timeout
-            if cache_timeout is None:
-                cache_timeout = app.config["CACHE_DEFAULT_TIMEOUT"]
-
-            compressed = zlib_compress(serialized_payload)
+            compressed = compress_results(serialized_payload)
             logger.debug(
                 "*** serialized payload size: %i", getsizeof(serialized_payload)
             )
             logger.debug("*** compressed payload size: %i", getsizeof(compressed))
+            stats_logger.histogram(
+                "sqllab.query.results_backend_payload_bytes", len(serialized_payload)
+            )
+            stats_logger.histogram(
+                "sqllab.query.results_backend_compressed_bytes", len(compressed)
+            )
+            if writer:
+                stats_logger.histogram(
+                    "sqllab.query.results_backend_chunks_bytes", writer.size
+                )
 
             # Store results in backend and check if write succeeded
             write_success = results_backend.set(key, compressed, cache_timeout)
@@ -593,6 +732,8 @@ def execute_sql_statements(  # noqa: C901
                     key,
                 )
                 stats_logger.incr("sqllab.results_backend.write_failure")
+                if writer:
+                    writer.discard()
                 # Don't set results_key to prevent 410 errors when fetching
                 query.results_key = None
 
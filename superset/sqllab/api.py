@@ -67,7 +67,13 @@ from superset.sqllab.utils import bootstrap_sqllab_data
 from superset.sqllab.validators import CanAccessQueryValidatorImpl
 from superset.superset_typing import FlaskResponse
 from superset.utils import core as utils, json
-from superset.views.base import CsvResponse, generate_download_headers, json_success
+from superset.utils.arrow import accepts_arrow, write_arrow_streams
+from superset.views.base import (
+    ArrowResponse,
+    CsvResponse,
+    generate_download_headers,
+    json_success,
+)
 from superset.views.base_api import BaseSupersetApi, requires_json, statsd_metrics
 
 logger = logging.getLogger(__name__)
@@ -465,6 +471,10 @@ class SqlLabRestApi(BaseSupersetApi):
                 application/json:
                   schema:
                     $ref: '#/components/schemas/QueryExecutionResponseSchema'
+                application/vnd.apache.arrow.stream:
+                  schema:
+                    type: string
+                    format: binary
             400:
               $ref: '#/components/responses/400'
             401:
@@ -481,7 +491,23 @@ class SqlLabRestApi(BaseSupersetApi):
         params = kwargs["rison"]
         key = params.get("key")
         rows = params.get("rows")
-        result = SqlExecutionResultsCommand(key=key, rows=rows).run()
+        chunk = params.get("chunk")
+        as_arrow = accepts_arrow(request)
+        result = SqlExecutionResultsCommand(
+            key=key,
+            rows=rows,
+            chunk=chunk,
+            as_arrow=as_arrow,
+            offset=params.get("offset", 0),
+            columns=params.get("columns"),
+        ).run()
+
+        if as_arrow:
+            data = result.pop("data")
+            response_data = write_arrow_streams(
+                [(data, result)], default=json.pessimistic_json_iso_dttm_ser
+            )
+            return ArrowResponse(response_data.to_pybytes(), status=200)
 
         # Using pessimistic json serialization since some database drivers can return
         # unserializeable types at times
@@ -22,6 +22,10 @@ sql_lab_get_results_schema = {
     "type": "object",
     "properties": {
         "key": {"type": "string"},
+        "rows": {"type": "integer", "minimum": 0},
+        "chunk": {"type": "integer", "minimum": 0},
+        "offset": {"type": "integer", "minimum": 0},
+        "columns": {"type": "array", "items": {"type": "string"}},
     },
     "required": ["key"],
 }
@@ -16,14 +16,33 @@
 # under the License.
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 import pyarrow as pa
+from flask import has_app_context
+from flask_babel import gettext as __
 
-from superset import db, is_feature_enabled
+from superset import db, is_feature_enabled, results_backend
 from superset.common.db_query_status import QueryStatus
 from superset.daos.database import DatabaseDAO
+from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
+from superset.exceptions import SerializationError, SupersetQueryResultsException
 from superset.models.sql_lab import TabState
+from superset.result_set import SupersetResultSet
+from superset.superset_typing import ResultSetColumnType
+from superset.utils.compression import (
+    compress_results,
+    decompress_results,
+    get_ipc_compression,
+)
+
+if TYPE_CHECKING:
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+BYTES_IN_MB = 1024 * 1024
+
+# number of rows per batch converted to Arrow to estimate the size of a result
+SIZE_SAMPLE_ROWS = 1000
 
 DATABASE_KEYS = [
     "allow_file_upload",
@@ -73,13 +92,209 @@ def apply_display_max_row_configuration_if_require(  # pylint: disable=invalid-n
 
 def write_ipc_buffer(table: pa.Table) -> pa.Buffer:
     sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(
+        compression=get_ipc_compression() if has_app_context() else None
+    )
 
-    with pa.ipc.new_stream(sink, table.schema) as writer:
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
         writer.write_table(table)
 
     return sink.getvalue()
 
 
+def get_results_chunk_key(key: str, index: int) -> str:
+    return f"{key}-{index}"
+
+
+def get_result_too_large_exception(
+    size: float,
+    max_bytes: float,
+) -> SupersetQueryResultsException:
+    return SupersetQueryResultsException(
+        SupersetError(
+            message=__(
+                "Result size (%(size).2f MB) exceeds the allowed limit of "
+                "%(limit).2f MB.",
+                size=size / BYTES_IN_MB,
+                limit=max_bytes / BYTES_IN_MB,
+            ),
+            error_type=SupersetErrorType.RESULT_TOO_LARGE_ERROR,
+            level=ErrorLevel.ERROR,
+        )
+    )
+
+
+class ResultSizeTracker:
+    """
+    Track the size of a result while it's fetched, to abort as soon as it's too large.
+
+    The size of batches fetched as Arrow tables is known. For batches of rows, a
+    sample is converted to Arrow to estimate the size of a row, and the estimate is
+    projected onto the batch. When the cursor reports how many rows the query
+    returns, the size of the whole result is projected from the first batch, so that
+    a result that can't fit is rejected before fetching the rest.
+    """
+
+    def __init__(
+        self,
+        max_bytes: float,
+        description: Any,
+        db_engine_spec: type[BaseEngineSpec],
+        expected_rows: int | None = None,
+        sample_rows: int = SIZE_SAMPLE_ROWS,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.description = description
+        self.db_engine_spec = db_engine_spec
+        self.expected_rows = expected_rows
+        self.sample_rows = sample_rows
+        self.rows = 0
+        self.size = 0.0
+
+    def add(self, batch: list[Any] | pa.Table) -> None:
+        """
+        Account for a fetched batch.
+
+        :raises SupersetQueryResultsException: If the result exceeds the size limit
+        """
+        rows = len(batch)
+        if not rows:
+            return
+
+        if isinstance(batch, pa.Table):
+            size = float(batch.nbytes)
+        else:
+            sample = list(batch[: self.sample_rows])
+            result_set = SupersetResultSet(
+                sample, self.description, self.db_engine_spec
+            )
+            size = result_set.pa_table.nbytes * rows / len(sample)
+
+        self.size += size
+        self.rows += rows
+        if self.size > self.max_bytes:
+            raise get_result_too_large_exception(self.size, self.max_bytes)
+
+        if self.expected_rows and self.expected_rows > self.rows:
+            projected_size = self.size * self.expected_rows / self.rows
+            if projected_size > self.max_bytes:
+                raise get_result_too_large_exception(projected_size, self.max_bytes)
+
+
+class ResultsChunkWriter:
+    """
+    Stream a query result into the results backend, one chunk at a time.
+
+    Each chunk is a compressed Arrow IPC stream stored under its own key. The payload
+    stored under the results key lists the chunks instead of holding the data, so
+    readers only fetch and decompress the chunks they need.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        chunk_rows: int,
+        cache_timeout: int,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.key = key
+        self.chunk_rows = chunk_rows
+        self.cache_timeout = cache_timeout
+        self.max_bytes = max_bytes
+        self.chunks: list[dict[str, Any]] = []
+        self.columns: list[ResultSetColumnType] = []
+        self.rows = 0
+        self.size = 0
+
+    def write(self, result_set: SupersetResultSet) -> None:
+        """
+        Store a chunk, and merge its column types into the ones seen so far.
+        """
+        if not self.columns:
+            self.columns = result_set.columns
+        else:
+            # a chunk where a column is all null doesn't tell its type
+            for column, chunk_column in zip(
+                self.columns, result_set.columns, strict=False
+            ):
+                if column["type"] is None:
+                    column.update(chunk_column)
+
+        data = write_ipc_buffer(result_set.pa_table).to_pybytes()
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise get_result_too_large_exception(self.size, self.max_bytes)
+
+        chunk_key = get_results_chunk_key(self.key, len(self.chunks))
+        if not results_backend.set(
+            chunk_key, compress_results(data), self.cache_timeout
+        ):
+            raise SupersetQueryResultsException(
+                SupersetError(
+                    message=__("Failed to store query results. Please try again."),
+                    error_type=SupersetErrorType.RESULTS_BACKEND_ERROR,
+                    level=ErrorLevel.ERROR,
+                )
+            )
+
+        self.chunks.append({"key": chunk_key, "rows": result_set.size})
+        self.rows += result_set.size
+
+    def discard(self) -> None:
+        """
+        Remove the chunks written so far, eg, when the query fails.
+        """
+        for chunk in self.chunks:
+            results_backend.delete(chunk["key"])
+        self.chunks = []
+
+
+def read_results_chunks(
+    chunks: list[dict[str, Any]],
+    rows: int | None = None,
+    chunk: int | None = None,
+    offset: int = 0,
+) -> list[pa.Table]:
+    """
+    Read chunks of a result from the results backend.
+
+    The row counts listed in the payload index the chunks, so only the chunks that
+    hold the requested rows are fetched and decompressed.
+
+    :param chunks: The chunks listed in the results payload
+    :param rows: The maximum number of rows to read
+    :param chunk: Read only the chunk with this index
+    :param offset: The number of rows to skip
+    :returns: The rows read, as Arrow tables
+    """
+    if chunk is not None:
+        if not 0 <= chunk < len(chunks):
+            raise SerializationError(f"Chunk {chunk} does not exist")
+        chunks = [chunks[chunk]]
+
+    end = offset + rows if rows is not None else None
+    tables: list[pa.Table] = []
+    start = 0
+    for entry in chunks:
+        if end is not None and start >= end:
+            break
+        stop = start + entry["rows"]
+        if stop > offset:
+            blob = results_backend.get(entry["key"])
+            if not blob:
+                raise SerializationError(f"Chunk {entry['key']} is missing")
+            reader = pa.BufferReader(decompress_results(blob, decode=False))
+            table = pa.ipc.open_stream(reader).read_all()
+            first = max(offset - start, 0)
+            last = min(end, stop) - start if end is not None else entry["rows"]
+            if first or last < entry["rows"]:
+                table = table.slice(first, last - first)
+            tables.append(table)
+        start = stop
+
+    return tables
+
+
 def bootstrap_sqllab_data(user_id: int | None) -> dict[str, Any]:
     tabs_state: list[Any] = []
     active_tab: Any = None
@@ -48,6 +48,10 @@ class BaseStatsLogger:
         """Setup a gauge"""
         raise NotImplementedError()
 
+    def histogram(self, key: str, value: float) -> None:
+        """Record a value in a distribution, eg, a size"""
+        self.timing(key, value)
+
 
 class DummyStatsLogger(BaseStatsLogger):
     def incr(self, key: str) -> None:
@@ -70,6 +74,15 @@ class DummyStatsLogger(BaseStatsLogger):
             "%s[stats_logger] (gauge) %s%s%s", Fore.CYAN, key, value, Style.RESET_ALL
         )
 
+    def histogram(self, key: str, value: float) -> None:
+        logger.debug(
+            "%s[stats_logger] (histogram) %s | %s %s",
+            Fore.CYAN,
+            key,
+            value,
+            Style.RESET_ALL,
+        )
+
 
 try:
     from statsd import StatsClient
@@ -113,6 +113,39 @@ def load_chart_data_into_cache(
             raise
 
 
+@celery_app.task(name="refresh_chart_data_cache", soft_time_limit=query_timeout)
+def refresh_chart_data_cache(
+    job_metadata: dict[str, Any],
+    form_data: dict[str, Any],
+    cache_key: str,
+) -> None:
+    """
+    Run the queries of a query context again, to refresh its stale cached results.
+
+    :param job_metadata: Metadata with the ID of the user the queries run as
+    :param form_data: The query context
+    :param cache_key: The key the refresh of the query context was claimed on
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.commands.chart.data.get_data_command import ChartDataCommand
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+
+    with override_user(_load_user_from_job_metadata(job_metadata), force=False):
+        try:
+            set_form_data(form_data)
+            query_context = _create_query_context_from_form(
+                {**form_data, "force": True}
+            )
+            command = ChartDataCommand(query_context)
+            command.validate()
+            command.run()
+        except SoftTimeLimitExceeded as ex:
+            logger.warning("A timeout occurred while refreshing chart data: %s", ex)
+            raise
+        finally:
+            QueryCacheManager.release_refresh(cache_key)
+
+
 @celery_app.task(name="load_explore_json_into_cache", soft_time_limit=query_timeout)
 def load_explore_json_into_cache(  # pylint: disable=too-many-locals
     job_metadata: dict[str, Any],
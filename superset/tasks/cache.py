@@ -17,6 +17,11 @@
 from __future__ import annotations
 
 import logging
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Optional, TypedDict, Union
 from urllib import request
 from urllib.error import URLError
@@ -27,6 +32,8 @@ from flask import current_app
 from sqlalchemy import and_, func
 
 from superset import db, security_manager
+from superset.commands.chart.warm_up_cache import ChartWarmUpCacheCommand
+from superset.commands.exceptions import CommandException
 from superset.extensions import celery_app
 from superset.models.core import Log
 from superset.models.dashboard import Dashboard
@@ -35,7 +42,10 @@ from superset.tags.models import Tag, TaggedObject
 from superset.tasks.exceptions import ExecutorNotFoundError, InvalidExecutorError
 from superset.tasks.utils import fetch_csrf_token, get_executor
 from superset.utils import json
+from superset.utils.concurrency import run_concurrently
+from superset.utils.core import error_msg_from_exception, override_user
 from superset.utils.date_parser import parse_human_datetime
+from superset.utils.dates import now_as_float
 from superset.utils.machine_auth import MachineAuthProvider
 from superset.utils.urls import get_url_path, is_secure_url
 
@@ -46,6 +56,8 @@ logger.setLevel(logging.INFO)
 class CacheWarmupPayload(TypedDict, total=False):
     chart_id: int
     dashboard_id: int | None
+    # query context sent to the chart data API, to run instead of the saved one
+    query_context: dict[str, Any]
 
 
 class CacheWarmupTask(TypedDict):
@@ -53,6 +65,41 @@ class CacheWarmupTask(TypedDict):
     username: str | None
 
 
+class FilterStateRequest(TypedDict):
+    key: tuple[int, int, str]
+    dttm: datetime
+    is_cached: bool
+
+
+class CacheWarmupReport(TypedDict):
+    start: str
+    end: str
+    hours: list[int]
+    # query contexts warmed up
+    predicted: int
+    # chart data requests from dashboards, during the hours of the window
+    requests: int
+    hits: int
+    hit_rate: float | None
+    # requests of the query contexts warmed up
+    predicted_requests: int
+    predicted_hits: int
+    predicted_hit_rate: float | None
+    # share of the requests that were predicted
+    coverage: float | None
+    # share of the predictions that were requested
+    precision: float | None
+
+
+class CacheWarmupResult(TypedDict):
+    chart_id: int
+    dashboard_id: int | None
+    error: str | None
+    status: str | None
+    is_cached: bool
+    duration_ms: float
+
+
 def get_task(chart: Slice, dashboard: Optional[Dashboard] = None) -> CacheWarmupTask:
     """Return task for warming up a given chart/table cache."""
     executors = current_app.config["CACHE_WARMUP_EXECUTORS"]
@@ -74,8 +121,9 @@ class Strategy:  # pylint: disable=too-few-public-methods
     """
     A cache warm up strategy.
 
-    Each strategy defines a `get_tasks` method that returns a list of tasks to
-    send to the `/api/v1/chart/warm_up_cache` endpoint.
+    Each strategy defines a `get_tasks` method that returns a list of tasks, run by
+    the Celery workers, or sent to the `/api/v1/chart/warm_up_cache` endpoint if
+    `CACHE_WARMUP_IN_WORKER` is disabled.
 
     Strategies can be configured in `superset/config.py`:
 
@@ -233,7 +281,357 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         return tasks
 
 
-strategies = [DummyStrategy, TopNDashboardsStrategy, DashboardTagsStrategy]
+class TopNFilterStatesStrategy(Strategy):  # pylint: disable=too-few-public-methods
+    """
+    Warm up the charts of dashboards with the filters people actually use.
+
+    The chart data requests made from dashboards are read from the logs, and the
+    top-n most frequent ones are run again as the user who made them. Only the
+    combinations of chart and dashboard filters that were requested are warmed up,
+    with the same cache keys. This strategy needs `CACHE_WARMUP_IN_WORKER`: the
+    `/api/v1/chart/warm_up_cache` endpoint only warms up the default filters.
+
+        beat_schedule = {
+            'cache-warmup-hourly': {
+                'task': 'cache-warmup',
+                'schedule': crontab(minute=1, hour='*'),  # @hourly
+                'kwargs': {
+                    'strategy_name': 'top_n_filter_states',
+                    'top_n': 100,
+                    'since': '1 day ago',
+                },
+            },
+        }
+
+    """
+
+    name = "top_n_filter_states"
+
+    def __init__(self, top_n: int = 100, since: str = "1 day ago") -> None:
+        super().__init__()
+        self.top_n = top_n
+        self.since = parse_human_datetime(since) if since else None
+        self.until: datetime | None = None
+
+    @staticmethod
+    def get_query_context(record: str | None) -> dict[str, Any] | None:
+        """
+        Return the query context of a logged chart data request from a dashboard.
+        """
+        try:
+            payload = json.loads(record or "")
+        except json.JSONDecodeError:
+            return None
+        return TopNFilterStatesStrategy._get_query_context(payload)
+
+    @staticmethod
+    def _get_query_context(payload: Any) -> dict[str, Any] | None:
+        if not isinstance(payload, dict):
+            return None
+
+        form_data = payload.get("form_data")
+        if (
+            not isinstance(form_data, dict)
+            or not form_data.get("dashboardId")
+            or not payload.get("datasource")
+            or not payload.get("queries")
+            or payload.get("result_format", "json") != "json"
+            or payload.get("result_type", "full") != "full"
+        ):
+            return None
+
+        return {
+            key: payload[key]
+            for key in ("datasource", "queries", "form_data", "result_type")
+            if key in payload
+        }
+
+    @classmethod
+    def get_requests(
+        cls,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Iterator[FilterStateRequest]:
+        """
+        Read the chart data requests made from dashboards from the logs.
+
+        Requests of the same user with the same query context share the same key.
+        """
+        query = db.session.query(Log.user_id, Log.slice_id, Log.dttm, Log.json).filter(
+            Log.action == "ChartRestApi.data",
+            Log.slice_id.isnot(None),
+            Log.user_id.isnot(None),
+        )
+        if since:
+            query = query.filter(Log.dttm >= since)
+        if until:
+            query = query.filter(Log.dttm < until)
+
+        for user_id, chart_id, dttm, record in query.yield_per(1000):
+            try:
+                payload = json.loads(record or "")
+            except json.JSONDecodeError:
+                continue
+            if query_context := cls._get_query_context(payload):
+                is_cached = payload.get("is_cached")
+                yield {
+                    "key": (
+                        user_id,
+                        chart_id,
+                        json.dumps(query_context, sort_keys=True),
+                    ),
+                    "dttm": dttm,
+                    # the API logs one value per query, or a single one
+                    "is_cached": bool(is_cached)
+                    and (not isinstance(is_cached, list) or all(is_cached)),
+                }
+
+    def weight(self, dttm: datetime) -> float:
+        """
+        The weight of a logged request in the ranking of the query contexts.
+        """
+        return 1.0
+
+    def get_top_n(self) -> list[tuple[int, int, str]]:
+        """
+        Return the keys of the top-n query contexts, by their weighted requests.
+        """
+        scores: Counter[tuple[int, int, str]] = Counter()
+        for record in self.get_requests(self.since, self.until):
+            if weight := self.weight(record["dttm"]):
+                scores[record["key"]] += weight
+        return [key for key, _ in scores.most_common(self.top_n)]
+
+    def get_tasks(self) -> list[CacheWarmupTask]:
+        top = self.get_top_n()
+        user_ids = {user_id for user_id, _, _ in top}
+        usernames = dict(
+            db.session.query(
+                security_manager.user_model.id, security_manager.user_model.username
+            )
+            .filter(security_manager.user_model.id.in_(user_ids))
+            .all()
+        )
+
+        tasks: list[CacheWarmupTask] = []
+        for user_id, chart_id, key in top:
+            query_context = json.loads(key)
+            tasks.append(
+                {
+                    "payload": {
+                        "chart_id": chart_id,
+                        "dashboard_id": query_context["form_data"]["dashboardId"],
+                        "query_context": query_context,
+                    },
+                    "username": usernames.get(user_id),
+                }
+            )
+        return tasks
+
+
+class PredictiveStrategy(TopNFilterStatesStrategy):
+    """
+    Warm up the charts and filters likely to be requested in the next hours.
+
+    Like `top_n_filter_states`, but the logged requests are weighted to predict the
+    ones of a window of hours of the day, eg, the business hours: only the requests
+    made at those hours on the same kind of day (weekday or weekend) count, and
+    their weight halves every `half_life_days`. By default, the window is the next
+    `window_hours` hours, so that the warm up runs just before it. Requests are
+    logged in UTC, so `now` and the hours of the window are in UTC too:
+
+        beat_schedule = {
+            'cache-warmup-morning': {
+                'task': 'cache-warmup',
+                'schedule': crontab(minute=30, hour=7),  # 07:30 for 08:00-12:00 UTC
+                'kwargs': {
+                    'strategy_name': 'predictive',
+                    'top_n': 200,
+                    'lookback_days': 28,
+                    'window_hours': 4,
+                },
+            },
+        }
+
+    The effectiveness of the warm up is reported by `superset cache-warmup-report`.
+    """
+
+    name = "predictive"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        top_n: int = 100,
+        lookback_days: int = 28,
+        hours: Optional[list[int]] = None,
+        window_hours: int = 4,
+        half_life_days: float = 7.0,
+        now: Optional[datetime] = None,
+    ) -> None:
+        super().__init__(top_n=top_n, since="")
+        self.now = now or datetime.utcnow()
+        self.since = self.now - timedelta(days=lookback_days)
+        self.until = self.now
+        self.half_life_days = half_life_days
+
+        next_hour = self.now.replace(minute=0, second=0, microsecond=0) + timedelta(
+            hours=1
+        )
+        if hours is None:
+            hours = [(next_hour + timedelta(hours=i)).hour for i in range(window_hours)]
+        if not hours or not all(0 <= hour < 24 for hour in hours):
+            raise ValueError("Hours of the day must be between 0 and 23")
+        self.hours = set(hours)
+
+        # the day of the window is the next one with its first hour
+        start = self.now.replace(hour=hours[0], minute=0, second=0, microsecond=0)
+        if start < self.now:
+            start += timedelta(days=1)
+        self.window_start = start
+        self.is_weekend = start.weekday() >= 5
+
+    def weight(self, dttm: datetime) -> float:
+        if dttm.hour not in self.hours or (dttm.weekday() >= 5) != self.is_weekend:
+            return 0.0
+        age = (self.now - dttm).total_seconds() / 86400
+        return 0.5 ** (age / self.half_life_days)
+
+    def get_report(self, end: Optional[datetime] = None) -> CacheWarmupReport:
+        """
+        Report how effective the warm up was, from the requests logged since.
+
+        The predictions are compared with the requests made at the hours of the
+        window, until `end`, one day after the predictions by default.
+
+        :param end: The end of the period of the report
+        :returns: The report
+        """
+        end = end or self.now + timedelta(days=1)
+        predicted = set(self.get_top_n())
+        requested: set[tuple[int, int, str]] = set()
+        requests = hits = predicted_requests = predicted_hits = 0
+        for record in self.get_requests(self.now, end):
+            if record["dttm"].hour not in self.hours:
+                continue
+            requests += 1
+            hits += record["is_cached"]
+            if record["key"] in predicted:
+                requested.add(record["key"])
+                predicted_requests += 1
+                predicted_hits += record["is_cached"]
+
+        def ratio(numerator: int, denominator: int) -> float | None:
+            return numerator / denominator if denominator else None
+
+        return {
+            "start": self.now.isoformat(),
+            "end": end.isoformat(),
+            "hours": sorted(self.hours),
+            "predicted": len(predicted),
+            "requests": requests,
+            "hits": hits,
+            "hit_rate": ratio(hits, requests),
+            "predicted_requests": predicted_requests,
+            "predicted_hits": predicted_hits,
+            "predicted_hit_rate": ratio(predicted_hits, predicted_requests),
+            "coverage": ratio(predicted_requests, requests),
+            "precision": ratio(len(requested), len(predicted)),
+        }
+
+
+strategies = [
+    DummyStrategy,
+    TopNDashboardsStrategy,
+    DashboardTagsStrategy,
+    TopNFilterStatesStrategy,
+    PredictiveStrategy,
+]
+
+
+def warm_up_chart(task: CacheWarmupTask, force: bool = False) -> CacheWarmupResult:
+    """
+    Warm up the cache of a chart, as the user of the task.
+
+    :param task: The chart to warm up
+    :param force: Whether to run the queries even if their results are cached
+    :returns: The outcome of the warm up
+    """
+    payload = task["payload"]
+    start = now_as_float()
+    command = ChartWarmUpCacheCommand(
+        payload["chart_id"],
+        payload.get("dashboard_id"),
+        None,
+        force=force,
+        query_context=payload.get("query_context"),
+    )
+    try:
+        user = security_manager.get_user_by_username(task["username"])
+        with override_user(user):
+            result = command.run()
+        error, status = result["viz_error"], result["viz_status"]
+    except CommandException as ex:
+        error, status = error_msg_from_exception(ex), None
+
+    return {
+        "chart_id": payload["chart_id"],
+        "dashboard_id": payload.get("dashboard_id"),
+        "error": error,
+        "status": status,
+        "is_cached": command.is_cached,
+        "duration_ms": now_as_float() - start,
+    }
+
+
+@celery_app.task(name="cache-warmup-charts")
+def warm_up_charts(
+    tasks: list[CacheWarmupTask], force: bool = False
+) -> list[CacheWarmupResult]:
+    """
+    Celery job to warm up the cache of charts in the worker.
+
+    Charts are warmed up `CACHE_WARMUP_MAX_WORKERS` at a time, and their queries
+    are bounded by `CHART_DATA_MAX_QUERIES_PER_DATABASE` per database. Charts whose
+    data is already cached are skipped, unless `force` is set.
+    """
+    stats_logger = current_app.config["STATS_LOGGER"]
+    lock = threading.Lock()
+    done = 0
+
+    def run(task: CacheWarmupTask) -> CacheWarmupResult:
+        nonlocal done
+        result = warm_up_chart(task, force)
+        with lock:
+            done += 1
+            progress = done
+
+        stats_logger.timing("cache_warmup.chart", result["duration_ms"])
+        if result["error"]:
+            stats_logger.incr("cache_warmup.error")
+            logger.warning(
+                "Error warming up chart %s (%s/%s): %s",
+                result["chart_id"],
+                progress,
+                len(tasks),
+                result["error"],
+            )
+        else:
+            stats_logger.incr(
+                "cache_warmup.cached" if result["is_cached"] else "cache_warmup.warmed"
+            )
+            logger.info(
+                "Warmed up chart %s (%s/%s) in %.0f ms%s",
+                result["chart_id"],
+                progress,
+                len(tasks),
+                result["duration_ms"],
+                ", already cached" if result["is_cached"] else "",
+            )
+        return result
+
+    return run_concurrently(
+        [partial(run, task) for task in tasks],
+        max_workers=current_app.config["CACHE_WARMUP_MAX_WORKERS"],
+    )
 
 
 @celery_app.task(name="fetch_url")
@@ -278,6 +676,32 @@ def fetch_url(data: str, headers: dict[str, str]) -> dict[str, str]:
     return result
 
 
+def schedule_warm_up_charts(tasks: list[CacheWarmupTask]) -> dict[str, list[str]]:
+    """
+    Split the warm up tasks in batches of `CACHE_WARMUP_BATCH_SIZE`, each run by a
+    Celery job.
+    """
+    results: dict[str, list[str]] = {"scheduled": [], "errors": []}
+    batch_size = current_app.config["CACHE_WARMUP_BATCH_SIZE"]
+    for task in tasks:
+        if not task["username"]:
+            logger.warning("Executor not found for %s", task["payload"])
+
+    tasks = [task for task in tasks if task["username"]]
+    for i in range(0, len(tasks), batch_size):
+        batch = tasks[i : i + batch_size]
+        chart_ids = [str(task["payload"]["chart_id"]) for task in batch]
+        try:
+            logger.info("Scheduling the warm up of charts %s", ", ".join(chart_ids))
+            warm_up_charts.delay(batch)
+            results["scheduled"].extend(chart_ids)
+        except SchedulingError:
+            logger.exception("Error scheduling the warm up of charts %s", chart_ids)
+            results["errors"].extend(chart_ids)
+
+    return results
+
+
 @celery_app.task(name="cache-warmup")
 def cache_warmup(
     strategy_name: str, *args: Any, **kwargs: Any
@@ -307,10 +731,20 @@ def cache_warmup(
         logger.exception(message)
         return message
 
+    tasks = strategy.get_tasks()
+    if current_app.config["CACHE_WARMUP_IN_WORKER"]:
+        return schedule_warm_up_charts(tasks)
+
     results: dict[str, list[str]] = {"scheduled": [], "errors": []}
-    for task in strategy.get_tasks():
+    for task in tasks:
         username = task["username"]
-        payload = json.dumps(task["payload"])
+        payload = json.dumps(
+            {
+                key: value
+                for key, value in task["payload"].items()
+                if key != "query_context"
+            }
+        )
         if username:
             try:
                 user = security_manager.get_user_by_username(username)
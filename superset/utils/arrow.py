@@ -0,0 +1,217 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Arrow IPC serialization of query results.
+
+Clients that send ``Accept: application/vnd.apache.arrow.stream`` receive results as
+Arrow IPC streams instead of JSON rows. A response holds one stream per query, one
+after the other; the metadata that JSON responses carry next to the rows (column
+types, cache status, etc.) is stored as JSON in the schema metadata of each stream,
+under the ``superset`` key.
+
+DataFrames stored in the data cache are also serialized as Arrow IPC streams, see
+``serialize_dataframe``.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable, Iterable, Literal, Optional
+
+import pandas as pd
+import pyarrow as pa
+from flask import Request
+
+from superset.utils import json
+
+ARROW_STREAM_MIMETYPE = "application/vnd.apache.arrow.stream"
+METADATA_KEY = "superset"
+
+DataFrameCompression = Literal["lz4", "zstd"]
+
+# magic, version and length of the JSON header of serialized DataFrames
+_DATAFRAME_MAGIC = b"\xffSDF"
+_DATAFRAME_VERSION = 1
+_DATAFRAME_HEADER = struct.Struct("<4sBI")
+
+
+def accepts_arrow(request: Request) -> bool:
+    """
+    Check if the client prefers Arrow IPC streams to JSON.
+
+    Clients accepting anything (``*/*``) get JSON.
+    """
+    best_match = request.accept_mimetypes.best_match(
+        ["application/json", ARROW_STREAM_MIMETYPE]
+    )
+    return best_match == ARROW_STREAM_MIMETYPE
+
+
+def df_to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table, without materializing rows.
+
+    As with JSON records the index is dropped. Columns that Arrow can't convert, eg,
+    because their values have mixed types, are converted to strings.
+
+    :param df: The DataFrame to convert
+    :returns: The Arrow table
+    """
+    arrays = []
+    for _, series in df.items():
+        try:
+            arrays.append(pa.Array.from_pandas(series))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+            arrays.append(
+                pa.Array.from_pandas(series.astype(str).where(series.notna()))
+            )
+
+    return pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+
+
+def write_arrow_streams(
+    results: Iterable[tuple[Optional[pa.Table], dict[str, Any]]],
+    default: Callable[[Any], Any] = json.json_int_dttm_ser,
+) -> pa.Buffer:
+    """
+    Write results as consecutive Arrow IPC streams.
+
+    :param results: Tables with their metadata; results without a table are written
+        as an empty stream, to keep their metadata
+    :param default: Serializer for metadata values that aren't JSON serializable
+    :returns: The streams
+    """
+    sink = pa.BufferOutputStream()
+    for table, metadata in results:
+        if table is None:
+            table = pa.table({})
+        table = table.replace_schema_metadata(
+            {METADATA_KEY: json.dumps(metadata, default=default, ignore_nan=True)}
+        )
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    return sink.getvalue()
+
+
+def read_arrow_streams(
+    buffer: pa.Buffer | bytes,
+) -> list[tuple[pa.Table, dict[str, Any]]]:
+    """
+    Read results written by ``write_arrow_streams``.
+    """
+    source = pa.BufferReader(buffer)
+    results = []
+    while source.tell() < source.size():
+        table = pa.ipc.open_stream(source).read_all()
+        metadata = table.schema.metadata or {}
+        results.append(
+            (
+                table.replace_schema_metadata(None),
+                json.loads(metadata.get(METADATA_KEY.encode(), b"{}")),
+            )
+        )
+
+    return results
+
+
+def serialize_dataframe(
+    df: pd.DataFrame,
+    compression: Optional[DataFrameCompression] = None,
+) -> bytes:
+    """
+    Serialize a DataFrame as an Arrow IPC stream, with a small header.
+
+    The header describes the columns and the number of rows, so that they can be
+    read without decoding the stream. The index and the dtypes are kept in the pandas
+    metadata of the schema.
+
+    :param df: The DataFrame to serialize
+    :param compression: Compression of the Arrow buffers
+    :returns: The serialized DataFrame
+    :raises pa.ArrowException: If a column can't be converted, eg, mixed types
+    :raises ValueError: If the column names aren't unique
+    """
+    table = pa.Table.from_pandas(df)
+    header = json.dumps(
+        {
+            "fields": table.schema.names,
+            "index_columns": [
+                column
+                for column in table.schema.pandas_metadata["index_columns"]
+                if isinstance(column, str)
+            ],
+            "rows": table.num_rows,
+        }
+    ).encode("utf-8")
+
+    sink = pa.BufferOutputStream()
+    sink.write(
+        _DATAFRAME_HEADER.pack(_DATAFRAME_MAGIC, _DATAFRAME_VERSION, len(header))
+    )
+    sink.write(header)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def is_serialized_dataframe(value: Any) -> bool:
+    return isinstance(value, bytes) and value[:4] == _DATAFRAME_MAGIC
+
+
+def read_dataframe_header(data: bytes) -> tuple[dict[str, Any], int]:
+    """
+    Read the header of a serialized DataFrame, without decoding it.
+
+    :returns: The header, and the offset of the Arrow stream
+    """
+    _, version, length = _DATAFRAME_HEADER.unpack_from(data)
+    if version != _DATAFRAME_VERSION:
+        raise ValueError(f"Unsupported serialized DataFrame version: {version}")
+    offset = _DATAFRAME_HEADER.size + length
+    return json.loads(data[_DATAFRAME_HEADER.size : offset]), offset
+
+
+def deserialize_dataframe(
+    data: bytes,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """
+    Deserialize a DataFrame written by ``serialize_dataframe``.
+
+    The Arrow stream is read in place, without copying the data. When ``columns``
+    is given only those columns (and the index) are decoded.
+
+    :param data: The serialized DataFrame
+    :param columns: Columns to read, all by default
+    :returns: The DataFrame
+    """
+    header, offset = read_dataframe_header(data)
+
+    options = None
+    if columns is not None:
+        fields = header["fields"]
+        included = set(columns) | set(header["index_columns"])
+        options = pa.ipc.IpcReadOptions(
+            included_fields=[i for i, name in enumerate(fields) if name in included]
+        )
+
+    buffer = pa.py_buffer(data)[offset:]
+    table = pa.ipc.open_stream(buffer, options=options).read_all()
+    return table.to_pandas()
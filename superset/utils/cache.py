@@ -31,14 +31,14 @@ from superset import db
 from superset.constants import CACHE_DISABLED_TIMEOUT
 from superset.extensions import cache_manager
 from superset.models.cache import CacheKey
-from superset.utils.hashing import hash_from_dict
+from superset.utils.hashing import hash_cache_key
 from superset.utils.json import json_int_dttm_ser
 
 logger = logging.getLogger(__name__)
 
 
 def generate_cache_key(values_dict: dict[str, Any], key_prefix: str = "") -> str:
-    hash_str = hash_from_dict(values_dict, default=json_int_dttm_ser)
+    hash_str = hash_cache_key(values_dict, default=json_int_dttm_ser)
     cache_key = f"{key_prefix}{hash_str}"
 
     if logger.isEnabledFor(logging.DEBUG):
@@ -58,9 +58,14 @@ def set_and_log_cache(
     cache_value: dict[str, Any],
     cache_timeout: int | None = None,
     datasource_uid: str | None = None,
-) -> None:
+) -> dict[str, Any] | None:
+    """
+    Set a value in a cache, with the time it was cached.
+
+    :returns: The cached value, or None if it wasn't cached
+    """
     if isinstance(cache_instance.cache, NullCache):
-        return
+        return None
 
     timeout = (
         cache_timeout
@@ -70,7 +75,7 @@ def set_and_log_cache(
 
     # Skip caching if timeout is CACHE_DISABLED_TIMEOUT (no caching requested)
     if timeout == CACHE_DISABLED_TIMEOUT:
-        return
+        return None
     try:
         dttm = datetime.utcnow().isoformat().split(".")[0]
         value = {**cache_value, "dttm": dttm}
@@ -93,11 +98,13 @@ def set_and_log_cache(
                 datasource_uid=datasource_uid,
             )
             db.session.add(ck)
+        return value
     except Exception as ex:  # pylint: disable=broad-except
         # cache.set call can fail if the backend is down or if
         # the key is too large or whatever other reasons
         logger.warning("Could not cache key %s", cache_key)
         logger.exception(ex)
+        return None
 
 
 # If a user sets `max_age` to 0, for long the browser should cache the
@@ -0,0 +1,170 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compression of the entries stored in the results backend.
+
+Entries compressed with zlib, the default codec, are plain zlib streams, as written
+before codecs were configurable, so that they can still be read by older versions,
+eg, during a rolling deploy. Entries compressed with the other codecs start with a
+header identifying the codec and the size of the uncompressed data, so that the
+codec can be changed without invalidating existing entries.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import zlib
+from typing import Callable, Literal, Optional, Union
+
+import pyarrow as pa
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+ResultsCodec = Literal["zlib", "zstd", "lz4", "none"]
+IpcCompression = Literal["zstd", "lz4"]
+
+# zlib streams never start with 0xff, so the header can't be mistaken for one
+_MAGIC = b"\xffSR"
+# magic, codec id, uncompressed size
+_HEADER = struct.Struct("<3sBQ")
+
+
+def _arrow_compress(name: str) -> Callable[[bytes], bytes]:
+    def compress(data: bytes) -> bytes:
+        return pa.Codec(name).compress(data, asbytes=True)
+
+    return compress
+
+
+def _arrow_decompress(name: str) -> Callable[[memoryview, int], bytes]:
+    def decompress(data: memoryview, size: int) -> bytes:
+        return pa.Codec(name).decompress(data, decompressed_size=size, asbytes=True)
+
+    return decompress
+
+
+# Codec lookup table: id stored in the header, compress and decompress functions
+_CODECS: dict[
+    str,
+    tuple[int, Callable[[bytes], bytes], Callable[[memoryview, int], bytes]],
+] = {
+    "none": (0, bytes, lambda data, size: bytes(data)),
+    "zlib": (1, zlib.compress, lambda data, size: zlib.decompress(data)),
+    "zstd": (2, _arrow_compress("zstd"), _arrow_decompress("zstd")),
+    "lz4": (3, _arrow_compress("lz4"), _arrow_decompress("lz4")),
+}
+_CODECS_BY_ID = {codec[0]: codec for codec in _CODECS.values()}
+
+
+def is_codec_available(codec: str) -> bool:
+    """
+    Check if a codec is supported by this build of PyArrow.
+    """
+    if codec not in _CODECS:
+        return False
+    return codec in {"none", "zlib"} or pa.Codec.is_available(codec)
+
+
+def get_results_codec() -> ResultsCodec:
+    """
+    Get the configured codec for the results backend.
+
+    Falls back to zlib when the configured codec is not available.
+
+    Returns:
+        Codec name ('zlib', 'zstd', 'lz4' or 'none')
+    """
+    codec = current_app.config["RESULTS_BACKEND_CODEC"]
+    if codec not in _CODECS:
+        raise ValueError(f"Unsupported results backend codec: {codec}")
+
+    if not is_codec_available(codec):
+        logger.warning("Codec %s is not available, falling back to zlib", codec)
+        return "zlib"
+
+    return codec
+
+
+def get_ipc_compression() -> Optional[IpcCompression]:
+    """
+    Get the compression used for the buffers of Arrow IPC streams, if any.
+    """
+    compression = current_app.config["RESULTS_BACKEND_IPC_COMPRESSION"]
+    if compression and not is_codec_available(compression):
+        logger.warning("Codec %s is not available for Arrow IPC", compression)
+        return None
+
+    return compression
+
+
+def compress_results(
+    data: Union[bytes, str],
+    codec: Optional[ResultsCodec] = None,
+) -> bytes:
+    """
+    Compress a results backend entry, prefixed with the codec header unless it's
+    compressed with zlib.
+
+    Args:
+        data: Serialized payload; strings are encoded as UTF-8
+        codec: Codec to use (defaults to configured codec)
+
+    Returns:
+        The compressed entry
+    """
+    if codec is None:
+        codec = get_results_codec()
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    if codec == "zlib":
+        return zlib.compress(data)
+
+    codec_id, compress, _ = _CODECS[codec]
+    return _HEADER.pack(_MAGIC, codec_id, len(data)) + compress(data)
+
+
+def decompress_results(
+    blob: Union[bytes, str],
+    decode: Optional[bool] = True,
+) -> Union[bytes, str]:
+    """
+    Decompress a results backend entry, with any codec.
+
+    Args:
+        blob: The compressed entry
+        decode: Whether to decode the payload as a UTF-8 string
+
+    Returns:
+        The serialized payload
+    """
+    if isinstance(blob, str):
+        blob = blob.encode("utf-8")
+
+    if blob[: len(_MAGIC)] == _MAGIC:
+        _, codec_id, size = _HEADER.unpack_from(blob)
+        if codec_id not in _CODECS_BY_ID:
+            raise ValueError(f"Unsupported results backend codec id: {codec_id}")
+        decompress = _CODECS_BY_ID[codec_id][2]
+        data = decompress(memoryview(blob)[_HEADER.size :], size)
+    else:
+        data = zlib.decompress(blob)
+
+    return data.decode("utf-8") if decode else data
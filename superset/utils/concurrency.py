@@ -0,0 +1,121 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Concurrent execution of the queries of a chart data request.
+
+Tasks run in worker threads with the application context, the request context (if
+any) and the ``g`` object of the caller, so that they see the same user, feature
+flags and configuration. Each worker gets its own SQLAlchemy session, but the ORM
+objects shared with the caller, eg, the datasource, stay bound to the session of the
+caller, which isn't thread-safe: their lazy loads run on it from several threads.
+This is why running the queries concurrently is opt-in.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+from typing import Any, Callable, TypeVar
+
+from flask import current_app, g, has_request_context
+from flask.globals import request_ctx
+
+T = TypeVar("T")
+
+_local = threading.local()
+_semaphores: dict[Any, threading.BoundedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+def _in_context(func: Callable[[], T]) -> Callable[[], T]:
+    """
+    Wrap a function to run it in a copy of the current Flask contexts.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    g_values = dict(g.__dict__)
+    request_context = (
+        request_ctx.copy() if has_request_context() and request_ctx.app is app else None
+    )
+
+    def wrapped() -> T:
+        with ExitStack() as stack:
+            stack.enter_context(app.app_context())
+            g.__dict__.update(g_values)
+            if request_context is not None:
+                stack.enter_context(request_context)
+            _local.is_worker = True
+            try:
+                return func()
+            finally:
+                _local.is_worker = False
+
+    return wrapped
+
+
+def run_concurrently(
+    tasks: Sequence[Callable[[], T]],
+    max_workers: int | None = None,
+) -> list[T]:
+    """
+    Run tasks in a bounded thread pool, and return their results in order.
+
+    Tasks run in the calling thread when there is only one, when the pool has a
+    single worker, or when called from a worker thread, so that nested calls don't
+    multiply the number of threads. The first exception raised by a task, in order,
+    is raised once every task is done.
+
+    :param tasks: Functions without arguments
+    :param max_workers: Size of the pool, defaults to ``CHART_DATA_MAX_WORKERS``
+    :returns: The results of the tasks
+    """
+    max_workers = min(
+        len(tasks), max_workers or current_app.config["CHART_DATA_MAX_WORKERS"]
+    )
+    if max_workers <= 1 or getattr(_local, "is_worker", False):
+        return [task() for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_in_context(task)) for task in tasks]
+
+    return [future.result() for future in futures]
+
+
+@contextmanager
+def database_query_slot(database_id: Any) -> Iterator[None]:
+    """
+    Limit the number of queries run concurrently on a database by worker threads.
+
+    Queries run outside of ``run_concurrently`` are not limited, so that the
+    sequential execution of queries is unchanged.
+
+    :param database_id: Identifier of the database the query runs on
+    """
+    if not getattr(_local, "is_worker", False):
+        yield
+        return
+
+    with _semaphores_lock:
+        if database_id not in _semaphores:
+            _semaphores[database_id] = threading.BoundedSemaphore(
+                current_app.config["CHART_DATA_MAX_QUERIES_PER_DATABASE"]
+            )
+        semaphore = _semaphores[database_id]
+
+    with semaphore:
+        yield
@@ -24,9 +24,15 @@ from flask import current_app
 
 from superset.utils import json
 
+try:
+    import xxhash
+except ImportError:  # xxhash is an optional dependency
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
 HashAlgorithm = Literal["md5", "sha256"]
+CacheKeyHashAlgorithm = Literal["md5", "sha256", "blake2b", "xxh3_128"]
 
 # Hash function lookup table for efficient dispatch
 _HASH_FUNCTIONS: dict[str, Callable[[bytes], str]] = {
@@ -34,6 +40,15 @@ _HASH_FUNCTIONS: dict[str, Callable[[bytes], str]] = {
     "md5": lambda data: hashlib.md5(data).hexdigest(),  # noqa: S324
 }
 
+# Cache keys don't need to be stable across the other uses of hashes, eg, UUIDs,
+# so they can use faster algorithms
+_CACHE_KEY_HASH_FUNCTIONS: dict[str, Callable[[bytes], str]] = {
+    **_HASH_FUNCTIONS,
+    "blake2b": lambda data: hashlib.blake2b(data, digest_size=16).hexdigest(),
+}
+if xxhash is not None:
+    _CACHE_KEY_HASH_FUNCTIONS["xxh3_128"] = xxhash.xxh3_128_hexdigest
+
 
 def get_hash_algorithm() -> HashAlgorithm:
     """
@@ -95,3 +110,52 @@ def hash_from_dict(
     )
 
     return hash_from_str(json_data, algorithm=algorithm)
+
+
+def get_cache_key_hash_algorithm() -> CacheKeyHashAlgorithm:
+    """
+    Get the configured hash algorithm for cache keys.
+
+    Returns:
+        Hash algorithm name, HASH_ALGORITHM unless CACHE_KEY_HASH_ALGORITHM is set
+    """
+    return current_app.config["CACHE_KEY_HASH_ALGORITHM"] or get_hash_algorithm()
+
+
+def hash_cache_key(
+    obj: dict[Any, Any],
+    ignore_nan: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+    algorithm: Optional[CacheKeyHashAlgorithm] = None,
+) -> str:
+    """
+    Generate a cache key from a dictionary.
+
+    The dictionary is serialized to its canonical form, unless
+    CACHE_KEY_LEGACY_ENCODING is set, in which case the cache key is the same as
+    with `hash_from_dict`.
+
+    Args:
+        obj: Dictionary to hash
+        ignore_nan: Whether to ignore NaN values, with the legacy encoding only
+        default: Default function for JSON serialization
+        algorithm: Hash algorithm to use (defaults to configured algorithm)
+
+    Returns:
+        Hexadecimal hash digest string
+    """
+    if algorithm is None:
+        algorithm = get_cache_key_hash_algorithm()
+
+    if current_app.config["CACHE_KEY_LEGACY_ENCODING"]:
+        data = json.dumps(
+            obj, sort_keys=True, ignore_nan=ignore_nan, default=default, allow_nan=True
+        ).encode("utf-8")
+    else:
+        data = json.dumps_canonical(obj, default=default)
+
+    hash_func = _CACHE_KEY_HASH_FUNCTIONS.get(algorithm)
+    if hash_func is None:
+        raise ValueError(f"Unsupported cache key hash algorithm: {algorithm}")
+
+    return hash_func(data)
@@ -16,6 +16,7 @@
 # under the License.
 import copy
 import decimal
+import json
 import logging
 import uuid
 from datetime import date, datetime, time, timedelta
@@ -168,6 +169,63 @@ def json_dumps_w_dates(payload: dict[Any, Any], sort_keys: bool = False) -> str:
     return dumps(payload, default=json_int_dttm_ser, sort_keys=sort_keys)
 
 
+def _stringify_keys(obj: Any) -> Any:
+    """
+    Convert the keys of nested dicts to the strings JSON encodes them to.
+    """
+
+    def stringify(key: Any) -> Any:
+        if key is None or isinstance(key, (int, float)):
+            return json.dumps(key)
+        return key
+
+    if isinstance(obj, dict):
+        return {stringify(key): _stringify_keys(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_stringify_keys(value) for value in obj]
+    return obj
+
+
+def dumps_canonical(
+    obj: Any,
+    default: Optional[Callable[[Any], Any]] = json_int_dttm_ser,
+) -> bytes:
+    """
+    Dumps object to a canonical form, for hashing
+
+    Keys are sorted, separators are compact and sets are sorted, so that equal
+    objects are always serialized to the same bytes. The encoder of the standard
+    library is used, which is faster than the one of simplejson for this purpose.
+
+    Dicts mixing key types, eg, int and str, can't be sorted: their keys are then
+    converted to strings first, like simplejson does.
+
+    :param obj: The serializable object
+    :param default: function that should return a serializable version of obj
+    :returns: The UTF-8 encoded canonical form
+    """
+
+    def canonical_default(value: Any) -> Any:
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=repr)
+        return default(value) if default else base_json_conv(value)
+
+    def encode(value: Any) -> bytes:
+        return json.dumps(
+            value,
+            default=canonical_default,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            check_circular=False,
+        ).encode("utf-8", "surrogatepass")
+
+    try:
+        return encode(obj)
+    except TypeError:
+        return encode(_stringify_keys(obj))
+
+
 def validate_json(obj: Union[bytes, bytearray, str]) -> None:
     """
     A JSON Validator that validates an object of bytes, bytes array or string
@@ -66,6 +66,7 @@ from superset.themes.utils import (
     is_valid_theme,
 )
 from superset.utils import core as utils, json
+from superset.utils.arrow import ARROW_STREAM_MIMETYPE
 from superset.utils.filters import get_dataset_access_filters
 from superset.utils.version import get_version_metadata
 from superset.views.error_handling import json_error_response
@@ -677,6 +678,14 @@ class CsvResponse(Response):
     default_mimetype = "text/csv"
 
 
+class ArrowResponse(Response):
+    """
+    Override Response to use the Arrow IPC stream mimetype
+    """
+
+    default_mimetype = ARROW_STREAM_MIMETYPE
+
+
 class XlsxResponse(Response):
     """
     Override Response to use xlsx mimetype
@@ -22,6 +22,7 @@ from typing import Any, Callable, DefaultDict, Optional, Union
 from urllib import parse
 
 import msgpack
+import pandas as pd
 import pyarrow as pa
 from flask import current_app as app, g, has_request_context, redirect, request
 from flask_appbuilder.security.sqla import models as ab_models
@@ -45,12 +46,14 @@ from superset.models.core import Database
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
+from superset.sqllab.utils import read_results_chunks
 from superset.superset_typing import (
     ExplorableData,
     FlaskResponse,
     FormData,
 )
 from superset.utils import json
+from superset.utils.arrow import df_to_arrow
 from superset.utils.core import DatasourceType
 from superset.utils.decorators import stats_timing
 from superset.viz import BaseViz
@@ -540,9 +543,25 @@ def check_datasource_perms(
     viz_obj.raise_for_access()
 
 
-def _deserialize_results_payload(
-    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+def _deserialize_results_payload(  # pylint: disable=too-many-arguments  # noqa: C901
+    payload: Union[bytes, str],
+    query: Query,
+    use_msgpack: Optional[bool] = False,
+    rows: Optional[int] = None,
+    chunk: Optional[int] = None,
+    as_arrow: bool = False,
+    offset: int = 0,
+    columns: Optional[list[str]] = None,
 ) -> dict[str, Any]:
+    """
+    Deserialize a results payload read from the results backend.
+
+    Only ``rows`` rows after the first ``offset`` ones, or the rows of the single
+    chunk with index ``chunk``, and only the ``columns`` given, are returned. When
+    the results were stored in chunks, only the chunks holding these rows are read.
+    With ``as_arrow`` the data is returned as an Arrow table, without converting it
+    to records.
+    """
     logger.debug("Deserializing from msgpack: %r", use_msgpack)
     if use_msgpack:
         with stats_timing(
@@ -553,11 +572,39 @@ def _deserialize_results_payload(
         with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
             try:
                 reader = pa.BufferReader(ds_payload["data"])
-                pa_table = pa.ipc.open_stream(reader).read_all()
+                pa_tables = [pa.ipc.open_stream(reader).read_all()]
+                if "chunks" in ds_payload:
+                    pa_tables = (
+                        read_results_chunks(ds_payload["chunks"], rows, chunk, offset)
+                        or pa_tables
+                    )
+                elif offset or rows is not None:
+                    pa_tables = [pa_tables[0].slice(offset, rows)]
             except pa.ArrowSerializationError as ex:
                 raise SerializationError("Unable to deserialize table") from ex
 
-        df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
+        if columns is not None:
+            pa_tables = [
+                table.select([name for name in columns if name in table.column_names])
+                for table in pa_tables
+            ]
+            _project_columns(ds_payload, columns)
+        if chunk is not None:
+            ds_payload["chunk"] = chunk
+        if offset:
+            ds_payload["offset"] = offset
+
+        if as_arrow:
+            ds_payload["data"] = _concat_tables(pa_tables)
+            return ds_payload
+
+        dfs = [
+            result_set.SupersetResultSet.convert_table_to_df(pa_table)
+            for pa_table in pa_tables
+        ]
+        # chunks can have different types for the same column (eg, all nulls), so
+        # they're concatenated as dataframes
+        df = dfs[0] if len(dfs) == 1 else pd.concat(dfs, ignore_index=True)
         ds_payload["data"] = dataframe.df_to_records(df) or []
 
         for column in ds_payload["selected_columns"]:
@@ -575,7 +622,56 @@ def _deserialize_results_payload(
         return ds_payload
 
     with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+        ds_payload = json.loads(payload)
+
+    if offset or rows is not None:
+        end = offset + rows if rows is not None else None
+        ds_payload["data"] = ds_payload["data"][offset:end]
+    if columns is not None:
+        ds_payload["data"] = [
+            {name: row[name] for name in columns if name in row}
+            for row in ds_payload["data"]
+        ]
+        _project_columns(ds_payload, columns)
+    if offset:
+        ds_payload["offset"] = offset
+
+    if as_arrow:
+        ds_payload["data"] = pa.Table.from_pylist(ds_payload["data"])
+    return ds_payload
+
+
+def _project_columns(ds_payload: dict[str, Any], columns: list[str]) -> None:
+    """
+    Keep only the given columns in the column lists of a results payload.
+    """
+    names = set(columns)
+    for key in ("columns", "selected_columns"):
+        if key in ds_payload:
+            ds_payload[key] = [
+                column
+                for column in ds_payload[key]
+                if column.get("column_name", column.get("name")) in names
+            ]
+
+
+def _concat_tables(tables: list[pa.Table]) -> pa.Table:
+    if len(tables) == 1:
+        return tables[0]
+
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # a column has incompatible types across chunks, eg, strings and numbers
+        return df_to_arrow(
+            pd.concat(
+                [
+                    result_set.SupersetResultSet.convert_table_to_df(table)
+                    for table in tables
+                ],
+                ignore_index=True,
+            )
+        )
 
 
 def get_cta_schema_name(
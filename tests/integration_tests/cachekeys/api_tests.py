@@ -18,6 +18,7 @@
 """Unit tests for Superset"""
 
 from typing import Any
+from unittest import mock
 
 import pytest
 
@@ -171,3 +172,15 @@ def test_invalidate_existing_caches(invalidate):
         .datasource_uid
         == "X__table"
     )
+
+
+@mock.patch("superset.cachekeys.api.bump_database_generations")
+@mock.patch("superset.cachekeys.api.bump_datasource_generations")
+def test_invalidate_cache_generations(
+    bump_datasource_generations, bump_database_generations, invalidate
+):
+    rv = invalidate({"datasource_uids": ["3__table"], "database_ids": [1]})
+
+    assert rv.status_code == 201
+    bump_datasource_generations.assert_called_once_with({"3__table"})
+    bump_database_generations.assert_called_once_with([1])
@@ -2788,3 +2788,33 @@ def test_apply_client_processing_csv_format_default_na_behavior():
     assert (
         "Alice," in lines[2]
     )  # Second data row should have empty last_name (NA converted to null)
+
+
+def test_apply_client_processing_arrow_format():
+    """
+    It should be able to process Arrow results
+    """
+    import pyarrow as pa
+
+    result = {
+        "queries": [
+            {
+                "result_format": ChartDataResultFormat.ARROW,
+                "data": pa.table({"COUNT(is_software_dev)": [4725]}),
+            }
+        ]
+    }
+    form_data = {
+        "datasource": "19__table",
+        "viz_type": "table",
+        "metrics": ["COUNT(is_software_dev)"],
+        "result_format": "arrow",
+        "result_type": "post_processed",
+    }
+
+    result = apply_client_processing(result, form_data)
+    query = result["queries"][0]
+    assert query["colnames"] == ["COUNT(is_software_dev)"]
+    assert query["rowcount"] == 1
+    assert isinstance(query["data"], pa.Table)
+    assert query["data"].to_pylist() == [{"COUNT(is_software_dev)": 4725}]
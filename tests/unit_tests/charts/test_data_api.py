@@ -0,0 +1,91 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, unused-argument
+
+import pyarrow as pa
+import pytest
+from flask import current_app
+from pytest_mock import MockerFixture
+
+from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
+from superset.utils.arrow import ARROW_STREAM_MIMETYPE, read_arrow_streams
+
+
+@pytest.mark.parametrize(
+    "accept, result_format, expected",
+    [
+        (ARROW_STREAM_MIMETYPE, "json", "arrow"),
+        (ARROW_STREAM_MIMETYPE, None, "arrow"),
+        (ARROW_STREAM_MIMETYPE, "csv", "csv"),
+        ("application/json", "json", "json"),
+    ],
+)
+def test_negotiate_result_format(
+    app_context: None,
+    accept: str,
+    result_format: str | None,
+    expected: str,
+) -> None:
+    """
+    Test that JSON results are sent as Arrow to clients that prefer it.
+    """
+    from superset.charts.data.api import ChartDataRestApi
+
+    form_data = {"result_format": result_format} if result_format else {}
+    with current_app.test_request_context(headers={"Accept": accept}):
+        ChartDataRestApi._negotiate_result_format(form_data)
+    assert form_data.get("result_format", "json") == expected
+
+
+def test_send_chart_response_arrow(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that each query is sent as an Arrow stream, with its metadata.
+    """
+    from superset.charts.data.api import ChartDataRestApi
+
+    mocker.patch(
+        "superset.charts.data.api.security_manager.is_guest_user",
+        return_value=False,
+    )
+    query_context = mocker.MagicMock()
+    query_context.result_format = ChartDataResultFormat.ARROW
+    query_context.result_type = ChartDataResultType.FULL
+    result = {
+        "query_context": query_context,
+        "queries": [
+            {
+                "data": pa.table({"a": [1, 2]}),
+                "colnames": ["a"],
+                "indexnames": [0, 1],
+                "rowcount": 2,
+            },
+            {"data": pa.table({"b": ["x"]}), "colnames": ["b"], "rowcount": 1},
+        ],
+    }
+
+    response = ChartDataRestApi()._send_chart_response(result)
+
+    assert response.mimetype == ARROW_STREAM_MIMETYPE
+    results = read_arrow_streams(response.get_data())
+    assert [table.to_pydict() for table, _ in results] == [
+        {"a": [1, 2]},
+        {"b": ["x"]},
+    ]
+    assert [metadata for _, metadata in results] == [
+        {"colnames": ["a"], "rowcount": 2},
+        {"colnames": ["b"], "rowcount": 1},
+    ]
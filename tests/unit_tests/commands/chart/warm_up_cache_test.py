@@ -488,3 +488,48 @@ def test_validate_with_nonexistent_chart_id(mock_db):
 
     with pytest.raises(WarmUpCacheChartNotFoundError):
         command.validate()
+
+
+@patch("superset.commands.chart.warm_up_cache.get_dashboard_extra_filters")
+@patch("superset.commands.chart.warm_up_cache.ChartDataQueryContextSchema")
+@patch("superset.commands.chart.warm_up_cache.ChartDataCommand")
+def test_runs_given_query_context_without_forcing(
+    mock_chart_data_command, mock_schema, mock_get_dashboard_filters
+):
+    """Verify a given query context is run as is, and cached results are reused"""
+    chart = Slice(
+        id=127,
+        slice_name="Test Chart",
+        viz_type="pie",
+        datasource_id=1,
+        datasource_type="table",
+    )
+
+    mock_query = Mock()
+    mock_query.filter = [{"col": "country", "op": "==", "val": "FR"}]
+    mock_qc = Mock()
+    mock_qc.queries = [mock_query]
+    mock_schema.return_value.load.return_value = mock_qc
+    query_context = {"datasource": {"id": 1, "type": "table"}, "queries": [{}]}
+
+    with patch.object(chart, "get_query_context") as mock_get_query_context:
+        with patch(
+            "superset.commands.chart.warm_up_cache.get_form_data",
+            return_value=[{"viz_type": "pie"}],
+        ):
+            mock_chart_data_command.return_value.run.return_value = {
+                "queries": [{"error": None, "status": "success", "is_cached": True}]
+            }
+
+            command = ChartWarmUpCacheCommand(
+                chart, 42, None, force=False, query_context=query_context
+            )
+            result = command.run()
+
+            mock_schema.return_value.load.assert_called_once_with(query_context)
+            mock_get_query_context.assert_not_called()
+            mock_get_dashboard_filters.assert_not_called()
+            assert mock_query.filter == [{"col": "country", "op": "==", "val": "FR"}]
+            assert mock_qc.force is False
+            assert command.is_cached is True
+            assert result["viz_status"] == "success"
@@ -0,0 +1,75 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from superset.commands.sql_lab.results import SqlExecutionResultsCommand
+from superset.errors import SupersetErrorType
+from superset.exceptions import SupersetErrorException
+
+
+@pytest.fixture
+def query(mocker: MockerFixture) -> Any:
+    mocker.patch("superset.commands.sql_lab.results.results_backend")
+    db = mocker.patch("superset.commands.sql_lab.results.db")
+    query = db.session.query.return_value.filter_by.return_value.one_or_none()
+    query.extra = {
+        "columns": [
+            {"column_name": "a", "name": "a", "type": "INT", "is_dttm": False},
+            {"column_name": "b", "name": "b", "type": "STRING", "is_dttm": False},
+        ]
+    }
+    return query
+
+
+def test_run_page(mocker: MockerFixture, app_context: None, query: Any) -> None:
+    """
+    Test that the page and the columns requested are read from the results.
+    """
+    mocker.patch("superset.commands.sql_lab.results.decompress_results")
+    deserialize = mocker.patch(
+        "superset.commands.sql_lab.results._deserialize_results_payload",
+        return_value={"status": "success", "data": [{"b": "x"}], "query": {"rows": 1}},
+    )
+
+    SqlExecutionResultsCommand("key", rows=10, offset=20, columns=["b"]).run()
+
+    assert deserialize.call_args.kwargs == {
+        "rows": 10,
+        "chunk": None,
+        "as_arrow": False,
+        "offset": 20,
+        "columns": ["b"],
+    }
+
+
+def test_validate_unknown_columns(app_context: None, query: Any) -> None:
+    """
+    Test that requesting columns that aren't in the results is an error.
+    """
+    with pytest.raises(SupersetErrorException) as excinfo:
+        SqlExecutionResultsCommand("key", columns=["b", "c"]).validate()
+
+    assert excinfo.value.status == 400
+    assert (
+        excinfo.value.error.error_type == SupersetErrorType.COLUMN_DOES_NOT_EXIST_ERROR
+    )
+    assert "c" in excinfo.value.error.message
@@ -0,0 +1,207 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+from unittest.mock import MagicMock
+
+import pytest
+from flask import current_app
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+
+from superset.common.utils.cache_generation import (
+    bump_database_generations,
+    bump_datasource_generations,
+    CacheGenerationError,
+    get_cache_generation,
+)
+from tests.conftest import with_config
+
+
+@pytest.fixture(autouse=True)
+def cache_generations(app_context: None, mocker: MockerFixture) -> None:
+    mocker.patch.dict(current_app.config, {"DATA_CACHE_GENERATIONS": True})
+
+
+@pytest.fixture
+def data_cache(app_context: None, mocker: MockerFixture) -> Cache:
+    cache = Cache(current_app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch(
+        "superset.common.utils.cache_generation.cache_manager",
+        data_cache=cache,
+    )
+    return cache
+
+
+def test_get_cache_generation_never_bumped(data_cache: Cache) -> None:
+    """
+    Test that generations are set the first time they're read.
+    """
+    first = get_cache_generation("1__table", 1)
+    assert first is not None
+    assert None not in first
+    assert get_cache_generation("1__table", 1) == first
+    assert get_cache_generation("1__table") == first[:1]
+
+
+def test_get_cache_generation_evicted(data_cache: Cache) -> None:
+    """
+    Test that an evicted generation is replaced with a new one, rather than dropped
+    from the cache key.
+    """
+    bump_datasource_generations(["1__table"])
+    bumped = get_cache_generation("1__table", 1)
+
+    data_cache.delete("cache_generation:datasource:1__table")
+    # in a later request
+    with current_app.app_context():
+        evicted = get_cache_generation("1__table", 1)
+    assert evicted is not None
+    assert evicted != bumped
+    assert evicted[1] == bumped[1]
+
+
+def test_get_cache_generation_request_cache(
+    data_cache: Cache,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that generations are read once per request, until they're bumped.
+    """
+    get_many = mocker.spy(data_cache, "get_many")
+    with current_app.test_request_context():
+        first = get_cache_generation("1__table", 1)
+        assert get_cache_generation("1__table", 1) == first
+        assert get_many.call_count == 2  # the generations are set on the first read
+
+        bump_datasource_generations(["1__table"])
+        assert get_cache_generation("1__table", 1) != first
+        assert get_many.call_count == 3
+
+
+def test_get_cache_generation_null_cache(app_context: None) -> None:
+    """
+    Test that cache keys are unchanged when generations can't be stored.
+    """
+    assert get_cache_generation("1__table", 1) is None
+
+
+def test_bump_datasource_generations(data_cache: Cache) -> None:
+    """
+    Test that bumping a datasource changes its generation only.
+    """
+    first = get_cache_generation("1__table", 1)
+    other = get_cache_generation("2__table", 1)
+
+    bump_datasource_generations(["1__table"])
+    bumped = get_cache_generation("1__table", 1)
+    assert bumped[0] != first[0]
+    assert bumped[1] == first[1]
+    assert get_cache_generation("2__table", 1) == other
+
+
+def test_bump_database_generations(data_cache: Cache) -> None:
+    """
+    Test that bumping a database changes the generation of all its datasources.
+    """
+    bump_datasource_generations(["1__table"])
+    before = get_cache_generation("1__table", 1)
+
+    other = get_cache_generation("3__table", 2)
+
+    bump_database_generations([1])
+    assert get_cache_generation("1__table", 1) != before
+    assert (
+        get_cache_generation("1__table", 1)[1] == get_cache_generation("2__table", 1)[1]
+    )
+    assert get_cache_generation("3__table", 2) == other
+
+
+@with_config({"DATA_CACHE_GENERATIONS": False})
+def test_get_cache_generation_disabled(data_cache: Cache) -> None:
+    """
+    Test that generations are ignored when disabled.
+    """
+    bump_datasource_generations(["1__table"])
+    assert get_cache_generation("1__table", 1) is None
+
+
+def test_bump_failure(app_context: None, mocker: MockerFixture) -> None:
+    """
+    Test that an error is raised when the generations can't be stored.
+    """
+    cache_manager = mocker.patch(
+        "superset.common.utils.cache_generation.cache_manager",
+    )
+    cache_manager.data_cache.set_many.return_value = []
+
+    with pytest.raises(CacheGenerationError, match="Could not store"):
+        bump_datasource_generations(["1__table"])
+
+    cache_manager.data_cache.set_many.reset_mock()
+    bump_datasource_generations([])
+    cache_manager.data_cache.set_many.assert_not_called()
+
+
+def test_get_cache_generation_error(app_context: None, mocker: MockerFixture) -> None:
+    """
+    Test that cache keys are unchanged when the generations can't be read.
+    """
+    cache_manager = mocker.patch(
+        "superset.common.utils.cache_generation.cache_manager",
+    )
+    cache_manager.data_cache.get_many.side_effect = ConnectionError()
+
+    assert get_cache_generation("1__table", 1) is None
+
+
+@pytest.mark.parametrize("legacy_encoding", [True, False])
+def test_query_cache_key(
+    data_cache: Cache,
+    mocker: MockerFixture,
+    legacy_encoding: bool,
+) -> None:
+    """
+    Test that bumping a generation changes the cache keys of a datasource.
+    """
+    from superset.common.query_context_processor import QueryContextProcessor
+
+    mocker.patch(
+        "superset.common.query_context_processor.security_manager",
+        new_callable=MagicMock,
+    ).get_rls_cache_key.return_value = []
+    query_context = MagicMock()
+    query_context.datasource.uid = "1__table"
+    query_context.datasource.database_id = 1
+    query_context.datasource.changed_on = None
+    query_context.datasource.get_extra_cache_keys.return_value = []
+    query_obj = MagicMock()
+    query_obj.cache_key.side_effect = lambda **kwargs: str(kwargs)
+
+    def query_cache_key() -> str | None:
+        return QueryContextProcessor(query_context).query_cache_key(query_obj)
+
+    mocker.patch.dict(
+        current_app.config, {"CACHE_KEY_LEGACY_ENCODING": legacy_encoding}
+    )
+    first = query_cache_key()
+    assert first == query_cache_key()
+    bump_database_generations([1])
+    second = query_cache_key()
+    assert second != first
+    bump_datasource_generations(["2__table"])
+    assert query_cache_key() == second
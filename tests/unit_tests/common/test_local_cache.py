@@ -0,0 +1,98 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pandas as pd
+from freezegun import freeze_time
+
+from superset.common.utils.local_cache import estimate_size, LocalCache
+
+
+def value(size: int) -> dict[str, bytes]:
+    return {"df": b"x" * size}
+
+
+def test_estimate_size() -> None:
+    """
+    Test that DataFrames are measured deeply.
+    """
+    df = pd.DataFrame({"name": ["a" * 1000] * 10})
+    assert estimate_size({"df": df}) > 10_000
+    assert 1000 < estimate_size(value(1000)) < 2000
+
+
+def test_local_cache_lru() -> None:
+    """
+    Test that the least recently used values are evicted to stay within budget.
+    """
+    size = estimate_size(value(1000))
+    cache = LocalCache(max_bytes=3 * size, timeout=60)
+    for key in ("a", "b", "c"):
+        cache.set(key, value(1000))
+    assert cache.size == 3 * size
+
+    assert cache.get("a") is not None
+    cache.set("d", value(1000))
+
+    assert cache.get("b") is None
+    assert [key for key in "acd" if cache.get(key)] == ["a", "c", "d"]
+    assert cache.evictions == 1
+    assert (cache.hits, cache.misses) == (4, 1)
+
+
+def test_local_cache_too_large() -> None:
+    """
+    Test that values larger than the budget are not cached.
+    """
+    cache = LocalCache(max_bytes=1000, timeout=60)
+    cache.set("a", value(1000))
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_local_cache_timeout() -> None:
+    """
+    Test that values expire with the cache, or with the data cache if earlier.
+    """
+    cache = LocalCache(max_bytes=100_000, timeout=60)
+    with freeze_time("2024-01-01 00:00:00") as frozen:
+        cache.set("a", value(10))
+        cache.set("b", value(10), timeout=10)
+        cache.set("c", value(10), timeout=0)
+
+        frozen.tick(11)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+        frozen.tick(60)
+        assert cache.get("a") is None
+        assert cache.get("c") is None
+        assert cache.size == 0
+
+
+def test_local_cache_invalidate() -> None:
+    """
+    Test that the values of a datasource can be removed.
+    """
+    cache = LocalCache(max_bytes=100_000, timeout=60)
+    cache.set("a", value(10), datasource_uid="1__table")
+    cache.set("b", value(10), datasource_uid="2__table")
+    cache.set("c", value(10))
+
+    assert cache.invalidate({"1__table"}) == 1
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
@@ -0,0 +1,212 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+import pandas as pd
+import pytest
+from flask import current_app
+from flask_caching import Cache
+from freezegun import freeze_time
+from pytest_mock import MockerFixture
+
+from superset.common.db_query_status import QueryStatus
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.constants import CacheRegion
+from superset.models.helpers import QueryResult
+from superset.utils.arrow import is_serialized_dataframe
+from tests.conftest import with_config
+
+
+@pytest.fixture
+def data_cache(app_context: None, mocker: MockerFixture) -> Cache:
+    cache = Cache(current_app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.dict(
+        "superset.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    return cache
+
+
+def set_df(df: pd.DataFrame) -> None:
+    query_result = QueryResult(
+        df=df, query="SELECT 1", duration=None, status=QueryStatus.SUCCESS
+    )
+    QueryCacheManager().set_query_result(
+        "key", query_result, timeout=300, region=CacheRegion.DATA
+    )
+
+
+@with_config({"DATA_CACHE_DATAFRAME_FORMAT": "arrow"})
+def test_arrow_dataframe(app_context: None, data_cache: Cache) -> None:
+    """
+    Test that DataFrames are cached as Arrow when configured, and read back with
+    their dtypes.
+    """
+    df = pd.DataFrame(
+        {
+            "ds": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+            "country": ["FR", None],
+            "count": [1, 2],
+        }
+    )
+    set_df(df)
+    assert is_serialized_dataframe(data_cache.get("key")["df"])
+
+    cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    assert cache.is_loaded
+    assert cache.query == "SELECT 1"
+    pd.testing.assert_frame_equal(cache.df, df)
+
+    cache = QueryCacheManager.get("key", CacheRegion.DATA, columns=["count"])
+    pd.testing.assert_frame_equal(cache.df, df[["count"]])
+
+
+@with_config({"DATA_CACHE_DATAFRAME_FORMAT": "arrow"})
+def test_pickled_dataframe(app_context: None, data_cache: Cache) -> None:
+    """
+    Test that DataFrames Arrow can't represent are cached as they are.
+    """
+    df = pd.DataFrame({"mixed": ["a", 1]})
+    set_df(df)
+    assert isinstance(data_cache.get("key")["df"], pd.DataFrame)
+    pd.testing.assert_frame_equal(QueryCacheManager.get("key", CacheRegion.DATA).df, df)
+
+
+def test_pickle_format(app_context: None, data_cache: Cache) -> None:
+    """
+    Test that DataFrames are pickled by default.
+    """
+    df = pd.DataFrame({"count": [1, 2]})
+    set_df(df)
+    assert isinstance(data_cache.get("key")["df"], pd.DataFrame)
+    pd.testing.assert_frame_equal(QueryCacheManager.get("key", CacheRegion.DATA).df, df)
+
+
+def test_read_both_formats(
+    mocker: MockerFixture,
+    app_context: None,
+    data_cache: Cache,
+) -> None:
+    """
+    Test that DataFrames cached as Arrow are read whatever the configured format.
+    """
+    df = pd.DataFrame({"count": [1, 2]})
+    mocker.patch.dict(current_app.config, {"DATA_CACHE_DATAFRAME_FORMAT": "arrow"})
+    set_df(df)
+    current_app.config["DATA_CACHE_DATAFRAME_FORMAT"] = "pickle"
+    assert is_serialized_dataframe(data_cache.get("key")["df"])
+    pd.testing.assert_frame_equal(QueryCacheManager.get("key", CacheRegion.DATA).df, df)
+
+
+@with_config({"DATA_CACHE_LOCAL_MAX_BYTES": 10_000_000})
+def test_local_cache(
+    app_context: None,
+    data_cache: Cache,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that values are read from the local cache before the data cache.
+    """
+    stats_logger = mocker.MagicMock()
+    mocker.patch.dict(current_app.config, {"STATS_LOGGER": stats_logger})
+    df = pd.DataFrame({"count": [1, 2]})
+    set_df(df)
+    assert data_cache.get("key")["cache_timeout"] == 300
+
+    # written by another process
+    data_cache.set("other", data_cache.get("key"))
+    data_cache.delete("key")
+
+    cache = QueryCacheManager.get("key", CacheRegion.DATA)
+    pd.testing.assert_frame_equal(cache.df, df)
+    cache = QueryCacheManager.get("other", CacheRegion.DATA, datasource_uid="1__table")
+    pd.testing.assert_frame_equal(cache.df, df)
+    cache = QueryCacheManager.get("other", CacheRegion.DATA)
+    pd.testing.assert_frame_equal(cache.df, df)
+    assert [
+        call.args[0]
+        for call in stats_logger.incr.call_args_list
+        if call.args[0].startswith("data_cache.")
+    ] == [
+        "data_cache.l1.hit",
+        "data_cache.l1.miss",
+        "data_cache.l2.hit",
+        "data_cache.l1.hit",
+    ]
+
+    QueryCacheManager.invalidate_local({"1__table"})
+    QueryCacheManager.delete("key", CacheRegion.DATA)
+    data_cache.delete("other")
+    assert not QueryCacheManager.get("key", CacheRegion.DATA).is_loaded
+    assert not QueryCacheManager.get("other", CacheRegion.DATA).is_loaded
+
+
+@with_config(
+    {"DATA_CACHE_DATAFRAME_FORMAT": "pickle", "DATA_CACHE_LOCAL_MAX_BYTES": 10_000_000}
+)
+def test_local_cache_copy(app_context: None, data_cache: Cache) -> None:
+    """
+    Test that the local cache isn't modified through the DataFrames of its writers
+    and readers.
+    """
+    df = pd.DataFrame({"count": [1, 2]})
+    set_df(df)
+    df.columns = ["COUNT(*)"]
+    assert QueryCacheManager.get("key", CacheRegion.DATA).df.columns.tolist() == [
+        "count"
+    ]
+
+    QueryCacheManager.get("key", CacheRegion.DATA).df.columns = ["COUNT(*)"]
+    assert QueryCacheManager.get("key", CacheRegion.DATA).df.columns.tolist() == [
+        "count"
+    ]
+
+
+def test_stale_result(app_context: None, data_cache: Cache) -> None:
+    """
+    Test that results kept past their soft timeout are flagged as stale.
+    """
+    query_result = QueryResult(
+        df=pd.DataFrame({"count": [1]}),
+        query="SELECT 1",
+        duration=None,
+        status=QueryStatus.SUCCESS,
+    )
+    with freeze_time("2024-01-01 00:00:00") as frozen:
+        QueryCacheManager().set_query_result(
+            "key",
+            query_result,
+            timeout=3600,
+            region=CacheRegion.DATA,
+            stale_after=60,
+        )
+        assert not QueryCacheManager.get("key", CacheRegion.DATA).is_stale
+
+        frozen.tick(60)
+        cache = QueryCacheManager.get("key", CacheRegion.DATA)
+        assert cache.is_loaded
+        assert cache.is_stale
+
+
+def test_claim_refresh(app_context: None, data_cache: Cache) -> None:
+    """
+    Test that the refresh of a result can only be claimed once.
+    """
+    assert QueryCacheManager.claim_refresh("key", 60)
+    assert not QueryCacheManager.claim_refresh("key", 60)
+    QueryCacheManager.release_refresh("key")
+    assert QueryCacheManager.claim_refresh("key", 60)
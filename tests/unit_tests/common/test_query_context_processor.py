@@ -40,8 +40,7 @@ def mock_query_context():
 def processor(mock_query_context):
     from superset.models.helpers import ExploreMixin
 
-    mock_query_context.datasource.data = MagicMock()
-    mock_query_context.datasource.data.get.return_value = {
+    mock_query_context.datasource.get_data_field.return_value = {
         "col1": "Column 1",
         "col2": "Column 2",
     }
@@ -825,6 +824,7 @@ def test_ensure_totals_available_updates_cache_values():
             ) as mock_cache_manager:
                 mock_cache = MagicMock()
                 mock_cache.is_loaded = True
+                mock_cache.is_stale = False
                 mock_cache.df = pd.DataFrame(
                     {"brokerage": ["Test"], "Net Amount In": [100]}
                 )
@@ -924,6 +924,7 @@ def test_get_df_payload_validates_before_cache_key_generation():
             ) as mock_cache_manager:
                 mock_cache = MagicMock()
                 mock_cache.is_loaded = True
+                mock_cache.is_stale = False
                 mock_cache.df = pd.DataFrame({"col1": [1, 2, 3]})
                 mock_cache.query = "SELECT * FROM table"
                 mock_cache.error_message = None
@@ -1280,7 +1281,8 @@ def test_force_cached_normalizes_totals_query_row_limit():
     mock_query_context.get_data = processor.get_data
 
     with patch(
-        "superset.common.query_context_processor.security_manager"
+        "superset.common.query_context_processor.security_manager",
+        new_callable=MagicMock,
     ) as mock_security_manager:
         mock_security_manager.get_rls_cache_key.return_value = None
 
@@ -1292,6 +1294,7 @@ def test_force_cached_normalizes_totals_query_row_limit():
                 df = pd.DataFrame({"region": ["North"], "sales": [100]})
                 cache = MagicMock()
                 cache.is_loaded = True
+                cache.is_stale = False
                 cache.df = df
                 cache.query = "SELECT 1"
                 cache.error_message = None
@@ -1311,3 +1314,146 @@ def test_force_cached_normalizes_totals_query_row_limit():
 
     assert captured_limits == [None], "Totals query should be normalized before caching"
     mock_query_context.get_query_result.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "user_id,claimed,is_stale,refreshes",
+    [
+        (1, True, True, 1),
+        (1, False, True, 0),
+        (None, True, False, 0),
+    ],
+)
+def test_get_df_payload_stale(
+    user_id: int | None,
+    claimed: bool,
+    is_stale: bool,
+    refreshes: int,
+) -> None:
+    """
+    Test that stale results are served while a task refreshes them, unless the
+    task can't run as the user, in which case the query runs.
+    """
+    from superset.common.query_object import QueryObject
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+
+    mock_query_context = MagicMock()
+    mock_query_context.force = False
+    mock_query_context.get_cache_timeout.return_value = 60
+    mock_query_context.get_stale_cache_timeout.return_value = 600
+    mock_query_context.cache_values = {"queries": []}
+    mock_datasource = MagicMock()
+    mock_datasource.uid = "1__table"
+    processor = QueryContextProcessor(mock_query_context)
+    processor._qc_datasource = mock_datasource
+    query_obj = QueryObject(datasource=mock_datasource, columns=[], metrics=[])
+
+    stale = QueryCacheManager(
+        df=pd.DataFrame({"count": [1]}),
+        is_loaded=True,
+        is_stale=True,
+    )
+    fresh = QueryCacheManager(df=pd.DataFrame({"count": [2]}), is_loaded=True)
+
+    def load_query_result(query_obj, cache, cache_key, force_query):
+        cache.df = fresh.df
+        cache.is_loaded = True
+
+    with (
+        patch.object(processor, "query_cache_key", return_value="key"),
+        patch.object(QueryCacheManager, "get", return_value=stale),
+        patch.object(QueryCacheManager, "claim_refresh", return_value=claimed),
+        patch.object(processor, "_load_query_result", side_effect=load_query_result),
+        patch(
+            "superset.common.query_context_processor.get_user_id",
+            return_value=user_id,
+        ),
+        patch("superset.tasks.async_queries.refresh_chart_data_cache") as task,
+        patch("superset.common.query_context_processor.single_flight") as flight,
+    ):
+        flight.return_value.__enter__.return_value = None
+        payload = processor.get_df_payload(query_obj)
+
+    assert payload["is_stale"] is is_stale
+    assert payload["df"]["count"].tolist() == ([1] if is_stale else [2])
+    assert task.delay.call_count == refreshes
+    if refreshes:
+        task.delay.assert_called_once_with(
+            {"user_id": 1}, {"queries": []}, processor.cache_key(user_id=1)
+        )
+
+
+def test_get_df_payload_stale_queries() -> None:
+    """
+    Test that the stale results of a query context are refreshed by a single task,
+    which runs all of its queries.
+    """
+    from superset.common.query_object import QueryObject
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+
+    mock_query_context = MagicMock()
+    mock_query_context.force = False
+    mock_query_context.get_cache_timeout.return_value = 60
+    mock_query_context.get_stale_cache_timeout.return_value = 600
+    mock_query_context.cache_values = {"queries": [{}, {}]}
+    mock_datasource = MagicMock()
+    mock_datasource.uid = "1__table"
+    processor = QueryContextProcessor(mock_query_context)
+    processor._qc_datasource = mock_datasource
+
+    claimed: set[str] = set()
+
+    def claim_refresh(key: str, timeout: int) -> bool:
+        if key in claimed:
+            return False
+        claimed.add(key)
+        return True
+
+    with (
+        patch.object(processor, "query_cache_key", side_effect=["key1", "key2"]),
+        patch.object(
+            QueryCacheManager,
+            "get",
+            side_effect=lambda *args, **kwargs: QueryCacheManager(
+                df=pd.DataFrame({"count": [1]}),
+                is_loaded=True,
+                is_stale=True,
+            ),
+        ),
+        patch.object(QueryCacheManager, "claim_refresh", side_effect=claim_refresh),
+        patch(
+            "superset.common.query_context_processor.get_user_id",
+            return_value=1,
+        ),
+        patch("superset.tasks.async_queries.refresh_chart_data_cache") as task,
+    ):
+        for _ in range(2):
+            query_obj = QueryObject(datasource=mock_datasource, columns=[], metrics=[])
+            assert processor.get_df_payload(query_obj)["is_stale"]
+
+    assert task.delay.call_count == 1
+
+
+def test_query_cache_key_datasource_parts_computed_once():
+    """
+    The parts of the cache keys that only depend on the datasource, eg, its RLS
+    filters, are computed once for all the queries of a query context.
+    """
+    mock_query_context = MagicMock()
+    mock_query_context.datasource.uid = "1__table"
+    mock_query_context.datasource.changed_on = None
+    mock_query_context.datasource.get_extra_cache_keys.return_value = []
+    processor = QueryContextProcessor(mock_query_context)
+    query_obj = MagicMock()
+    query_obj.cache_key.side_effect = lambda **kwargs: str(sorted(kwargs))
+
+    with patch(
+        "superset.common.query_context_processor.security_manager",
+        new_callable=MagicMock,
+    ) as mock_security_manager:
+        mock_security_manager.get_rls_cache_key.return_value = ["rls"]
+        keys = [processor.query_cache_key(query_obj) for _ in range(3)]
+
+    mock_security_manager.get_rls_cache_key.assert_called_once()
+    assert keys[0] == str(["datasource", "datasource_key", "extra_cache_keys"])
+    assert len(set(keys)) == 1
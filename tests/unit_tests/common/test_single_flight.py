@@ -0,0 +1,173 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from flask import current_app
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+
+from superset.common.db_query_status import QueryStatus
+from superset.common.utils.query_cache_manager import QueryCacheManager
+from superset.common.utils.single_flight import single_flight
+from superset.constants import CACHE_DISABLED_TIMEOUT, CacheRegion
+from superset.models.helpers import QueryResult
+from tests.conftest import with_config
+
+
+@pytest.fixture(autouse=True)
+def enable_single_flight(app_context: None, mocker: MockerFixture) -> None:
+    mocker.patch.dict(current_app.config, {"DATA_CACHE_SINGLE_FLIGHT": True})
+
+
+@pytest.fixture
+def data_cache(app_context: None, mocker: MockerFixture) -> Cache:
+    cache = Cache(current_app, config={"CACHE_TYPE": "SimpleCache"})
+    mocker.patch.dict(
+        "superset.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    return cache
+
+
+@pytest.fixture
+def stats_logger(mocker: MockerFixture) -> MagicMock:
+    stats_logger = MagicMock()
+    mocker.patch.dict(current_app.config, {"STATS_LOGGER": stats_logger})
+    return stats_logger
+
+
+def cache_result(key: str) -> None:
+    query_result = QueryResult(
+        df=pd.DataFrame({"count": [1]}),
+        query="SELECT 1",
+        duration=None,
+        status=QueryStatus.SUCCESS,
+    )
+    QueryCacheManager().set_query_result(key, query_result, region=CacheRegion.DATA)
+
+
+def test_single_flight_lease(data_cache: Cache, stats_logger: MagicMock) -> None:
+    """
+    Test that the first caller holds the lease while running the query.
+    """
+    with single_flight("key") as cached:
+        assert cached is None
+        assert QueryCacheManager.is_leased("key")
+
+    assert not QueryCacheManager.is_leased("key")
+    stats_logger.incr.assert_called_once_with("data_cache.single_flight.lease")
+
+
+@with_config({"DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0})
+def test_single_flight_hit(data_cache: Cache, stats_logger: MagicMock) -> None:
+    """
+    Test that waiters get the result cached by the lease holder.
+    """
+    QueryCacheManager.acquire_lease("key", 60)
+    cache_result("key")
+    with single_flight("key") as cached:
+        assert cached is not None
+        assert cached.is_loaded
+        assert cached.df.to_dict() == {"count": {0: 1}}
+
+    stats_logger.incr.assert_called_with("data_cache.single_flight.hit")
+
+
+@with_config({"DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0})
+def test_single_flight_released(
+    data_cache: Cache,
+    stats_logger: MagicMock,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that waiters run the query when the lease is released without a result.
+    """
+    QueryCacheManager.acquire_lease("key", 60)
+    mocker.patch.object(QueryCacheManager, "is_leased", return_value=False)
+    with single_flight("key") as cached:
+        assert cached is None
+
+    stats_logger.incr.assert_called_once_with("data_cache.single_flight.fallback")
+
+
+@with_config(
+    {
+        "DATA_CACHE_SINGLE_FLIGHT_TIMEOUT": 0.05,
+        "DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL": 0.01,
+    }
+)
+def test_single_flight_timeout(data_cache: Cache, stats_logger: MagicMock) -> None:
+    """
+    Test that waiters run the query when the lease holder takes too long.
+    """
+    QueryCacheManager.acquire_lease("key", 60)
+    with single_flight("key") as cached:
+        assert cached is None
+
+    stats_logger.incr.assert_called_once_with("data_cache.single_flight.fallback")
+
+
+@pytest.mark.parametrize(
+    "kwargs,config",
+    [
+        ({"enabled": False}, {}),
+        ({}, {"DATA_CACHE_SINGLE_FLIGHT": False}),
+        ({"cache_timeout": CACHE_DISABLED_TIMEOUT}, {}),
+    ],
+)
+def test_single_flight_disabled(
+    data_cache: Cache,
+    stats_logger: MagicMock,
+    mocker: MockerFixture,
+    kwargs: dict[str, Any],
+    config: dict[str, bool],
+) -> None:
+    """
+    Test that queries are run without a lease when single-flight is disabled, or
+    when their result won't be cached.
+    """
+    mocker.patch.dict(current_app.config, config)
+    with single_flight("key", **kwargs) as cached:
+        assert cached is None
+        assert not QueryCacheManager.is_leased("key")
+
+    stats_logger.incr.assert_not_called()
+
+
+def test_single_flight_null_cache(app_context: None, stats_logger: MagicMock) -> None:
+    """
+    Test that queries are run without a lease when results aren't cached.
+    """
+    with single_flight("key") as cached:
+        assert cached is None
+        assert not QueryCacheManager.is_leased("key")
+
+
+def test_single_flight_error(data_cache: Cache, stats_logger: MagicMock) -> None:
+    """
+    Test that the lease is released when the query fails.
+    """
+    with pytest.raises(ValueError, match="failed"):
+        with single_flight("key"):
+            raise ValueError("failed")
+
+    assert not QueryCacheManager.is_leased("key")
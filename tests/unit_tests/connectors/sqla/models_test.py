@@ -15,6 +15,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from typing import Any, Callable
+
 import pandas as pd
 import pytest
 from pytest_mock import MockerFixture
@@ -842,3 +844,150 @@ def test_quoted_name_prevents_double_quoting(mocker: MockerFixture) -> None:
     # Should have each part quoted separately:
     # GOOD: "MY_DB"."MY_SCHEMA"."MY_TABLE"
     assert '"MY_DB"."MY_SCHEMA"."MY_TABLE"' in compiled
+
+
+def test_get_time_filter_partition_filter(mocker: MockerFixture) -> None:
+    """
+    Test that the engine spec can add a partition filter to time range filters.
+    """
+    from datetime import datetime
+
+    from sqlalchemy import column
+
+    from superset.db_engine_specs.sqlite import SqliteEngineSpec
+
+    get_time_partition_filter = mocker.patch.object(
+        SqliteEngineSpec,
+        "get_time_partition_filter",
+        return_value=column("dt") >= "2024-01-01",
+    )
+    database = Database(database_name="my_db", sqlalchemy_uri="sqlite://")
+    dt = TableColumn(column_name="dt", type="TEXT")
+    table = SqlaTable(
+        table_name="events",
+        schema="analytics",
+        database=database,
+        columns=[dt],
+    )
+
+    time_filter = table.get_time_filter(
+        dt,
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 8),
+        time_grain="P1W",
+    )
+    sql = str(
+        time_filter.compile(
+            dialect=database.get_dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+    assert sql.endswith("< '2024-01-08 00:00:00' AND dt >= '2024-01-01'")
+    get_time_partition_filter.assert_called_once_with(
+        database,
+        Table("events", "analytics"),
+        "dt",
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 8),
+        time_grain="P1W",
+    )
+
+    # virtual datasets and computed columns are not partitions
+    get_time_partition_filter.reset_mock()
+    table.sql = "SELECT * FROM analytics.events"
+    table.get_time_filter(dt, datetime(2024, 1, 1), datetime(2024, 1, 8))
+    get_time_partition_filter.assert_not_called()
+
+
+@pytest.fixture
+def dataset(session: Session) -> SqlaTable:
+    from superset.connectors.sqla.models import SqlMetric
+
+    SqlaTable.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    dataset = SqlaTable(
+        table_name="events",
+        database=Database(database_name="my_db", sqlalchemy_uri="sqlite://"),
+        columns=[
+            TableColumn(column_name=f"col_{i}", verbose_name=f"Column {i}")
+            for i in range(50)
+        ],
+        metrics=[SqlMetric(metric_name="count", expression="COUNT(*)")],
+    )
+    session.add(dataset)
+    session.commit()
+    return dataset
+
+
+def test_data_memoized(mocker: MockerFixture, session: Session, dataset: SqlaTable):
+    """
+    Test that the data of a dataset is built once, until the dataset is modified.
+    """
+    build_data = mocker.spy(SqlaTable, "build_data")
+
+    data = dataset.data
+    data["columns"].clear()
+    assert len(dataset.data["columns"]) == 50
+    assert build_data.call_count == 1
+
+    # unflushed changes
+    dataset.columns[0].verbose_name = "First"
+    assert dataset.data["verbose_map"]["col_0"] == "First"
+    session.flush()
+    assert dataset.data["verbose_map"]["col_0"] == "First"
+    assert dataset.data["verbose_map"]["col_0"] == "First"
+    assert build_data.call_count == 3
+
+    dataset.description = "Events"
+    session.commit()
+    assert dataset.data["description"] == "Events"
+    assert build_data.call_count == 4
+
+
+def test_chart_data_profile(
+    mocker: MockerFixture, session: Session, dataset: SqlaTable
+) -> None:
+    """
+    Profile the metadata queries and CPU time of the dataset fields read by a chart
+    data request, before and after reading them on their own.
+    """
+    import time
+
+    from sqlalchemy import event
+
+    from superset.common.chart_data import ChartDataResultFormat
+    from superset.common.query_context_processor import QueryContextProcessor
+    from superset.utils.core import GenericDataType
+
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    def profile(request: Callable[[], Any], number: int = 20) -> tuple[int, float]:
+        statements.clear()
+        event.listen(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+        start = time.process_time()
+        for _ in range(number):
+            # each request loads the dataset anew
+            session.expire_all()
+            request()
+        elapsed = time.process_time() - start
+        event.remove(session.get_bind(), "before_cursor_execute", before_cursor_execute)
+        return len(statements) // number, elapsed / number
+
+    query_context = mocker.MagicMock(result_format=ChartDataResultFormat.CSV)
+    query_context.datasource = dataset
+    processor = QueryContextProcessor(query_context)
+    df = pd.DataFrame({"col_0": [1, 2], "count": [3, 4]})
+
+    def get_data() -> Any:
+        return processor.get_data(df.copy(), [GenericDataType.NUMERIC] * 2)
+
+    before_queries, before_cpu = profile(lambda: dataset.data["verbose_map"])
+    build_data = mocker.spy(SqlaTable, "build_data")
+    after_queries, after_cpu = profile(get_data)
+
+    assert get_data().splitlines()[0] == "Column 0,count"
+    build_data.assert_not_called()
+    assert after_queries < before_queries
+    assert after_cpu < before_cpu
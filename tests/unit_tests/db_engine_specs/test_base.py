@@ -894,3 +894,34 @@ def test_extract_errors_no_match_falls_back(mocker: MockerFixture) -> None:
         engine_name="ExampleEngine",
     )
     assert result == [expected]
+
+
+def test_fetch_data_batches(mocker: MockerFixture) -> None:
+    """
+    Test that results are fetched with ``fetchmany``, up to the limit.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    rows = [(i,) for i in range(7)]
+    cursor = mocker.MagicMock()
+    cursor.fetchmany.side_effect = lambda size: [rows.pop(0) for _ in range(size)]
+
+    batches = list(BaseEngineSpec.fetch_data_batches(cursor, 3, limit=5))
+    assert batches == [[(0,), (1,), (2,)], [(3,), (4,)]]
+    assert [call.args for call in cursor.fetchmany.call_args_list] == [(3,), (2,)]
+
+
+def test_fetch_data_batches_custom_fetch_data(mocker: MockerFixture) -> None:
+    """
+    Test that specs overriding ``fetch_data`` get the whole result in one batch.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    class TestEngineSpec(BaseEngineSpec):
+        @classmethod
+        def fetch_data(cls, cursor: Any, limit: int | None = None) -> list[Any]:
+            return [("a",), ("b",)]
+
+    cursor = mocker.MagicMock()
+    assert list(TestEngineSpec.fetch_data_batches(cursor, 1)) == [[("a",), ("b",)]]
+    cursor.fetchmany.assert_not_called()
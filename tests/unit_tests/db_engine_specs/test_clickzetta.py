@@ -0,0 +1,689 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy import create_engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+
+@pytest.fixture
+def registry(mocker: MockerFixture) -> Any:
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineRegistry
+
+    registry = ClickZettaEngineRegistry()
+    mocker.patch("superset.db_engine_specs.clickzetta.engine_registry", registry)
+    return registry
+
+
+def test_get_or_create_engine_reuses_pooled_engine(
+    registry: Any,
+    tmp_path: Path,
+) -> None:
+    """
+    Test that engines are cached per database/catalog/schema and use a real pool.
+    """
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    database = Mock(id=1, impersonate_user=False)
+    url = make_url(f"sqlite:///{tmp_path / 'test.db'}")
+    create = Mock(side_effect=lambda url, kwargs: create_engine(url, **kwargs))
+
+    def get_engine(schema: str, username: str = "alice") -> Any:
+        return ClickZettaEngineSpec.get_or_create_engine(
+            database=database,
+            url=url,
+            engine_kwargs={"poolclass": NullPool},
+            create=create,
+            schema=schema,
+            effective_username=username,
+        )
+
+    engine = get_engine("public")
+    assert isinstance(engine.pool, QueuePool)
+    assert get_engine("public") is engine
+    # without impersonation the effective user is not part of the key
+    assert get_engine("public", "bob") is engine
+    assert get_engine("other") is not engine
+    assert create.call_count == 2
+    assert len(registry) == 2
+
+    kwargs = create.call_args[0][1]
+    assert kwargs["poolclass"] is QueuePool
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["pool_size"] == ClickZettaEngineSpec.pool_size
+
+
+def test_get_or_create_engine_impersonation(registry: Any, tmp_path: Path) -> None:
+    """
+    Test that each impersonated user gets their own engine.
+    """
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    database = Mock(id=1, impersonate_user=True)
+    url = make_url(f"sqlite:///{tmp_path / 'test.db'}")
+
+    engines = {
+        ClickZettaEngineSpec.get_or_create_engine(
+            database=database,
+            url=url,
+            engine_kwargs={},
+            create=lambda url, kwargs: create_engine(url, **kwargs),
+            effective_username=username,
+        )
+        for username in ("alice", "bob", "alice")
+    }
+    assert len(engines) == 2
+
+
+def test_get_or_create_engine_fingerprint(
+    registry: Any,
+    tmp_path: Path,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that objects in the engine kwargs don't change the fingerprint, and that
+    editing the connection replaces its engine.
+    """
+    import ssl
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    database = Mock(id=1, impersonate_user=False)
+    url = make_url(f"sqlite:///{tmp_path / 'test.db'}")
+    create = Mock(side_effect=lambda url, kwargs: create_engine(url, **kwargs))
+
+    def get_engine(timeout: int) -> Any:
+        return ClickZettaEngineSpec.get_or_create_engine(
+            database=database,
+            url=url,
+            engine_kwargs={
+                "connect_args": {
+                    "ssl_context": ssl.create_default_context(),
+                    "on_connect": lambda conn: None,
+                    "timeout": timeout,
+                },
+            },
+            create=create,
+        )
+
+    first = get_engine(10)
+    assert get_engine(10) is first
+    assert create.call_count == 1
+    mocker.patch.object(first, "dispose")
+
+    second = get_engine(20)
+    assert second is not first
+    first.dispose.assert_called_once()
+    assert len(registry) == 1
+
+
+def test_engine_registry_eviction(mocker: MockerFixture) -> None:
+    """
+    Test that idle engines and engines over the size limit are disposed.
+    """
+    from superset.db_engine_specs.clickzetta import (
+        ClickZettaEngineRegistry,
+        EngineKey,
+    )
+
+    monotonic = mocker.patch("superset.db_engine_specs.clickzetta.time.monotonic")
+    monotonic.return_value = 0
+    registry = ClickZettaEngineRegistry(idle_timeout=60, max_size=2)
+
+    def key(schema: str) -> EngineKey:
+        return EngineKey(1, None, schema, None, "fingerprint")
+
+    first, second, third = Mock(), Mock(), Mock()
+    registry.get_or_create(key("a"), lambda: first)
+    registry.get_or_create(key("b"), lambda: second)
+    registry.get_or_create(key("a"), Mock())
+    registry.get_or_create(key("c"), lambda: third)
+
+    # "b" was the least recently used engine
+    second.dispose.assert_called_once()
+    first.dispose.assert_not_called()
+    assert len(registry) == 2
+
+    monotonic.return_value = 61
+    new = Mock()
+    assert registry.get_or_create(key("a"), lambda: new) is new
+    first.dispose.assert_called_once()
+    third.dispose.assert_called_once()
+    assert len(registry) == 1
+
+
+def test_pool_metrics(registry: Any, mocker: MockerFixture, tmp_path: Path) -> None:
+    """
+    Test that pool events are sent to the stats logger.
+    """
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    stats_logger = mocker.patch(
+        "superset.db_engine_specs.clickzetta.stats_logger_manager"
+    ).instance
+
+    engine = ClickZettaEngineSpec.get_or_create_engine(
+        database=Mock(id=1, impersonate_user=False),
+        url=make_url(f"sqlite:///{tmp_path / 'test.db'}"),
+        engine_kwargs={},
+        create=lambda url, kwargs: create_engine(url, **kwargs),
+    )
+    with engine.connect():
+        stats_logger.gauge.assert_any_call("clickzetta.pool.checked_out", 1)
+
+    stats_logger.incr.assert_any_call("clickzetta.engine.created")
+    stats_logger.incr.assert_any_call("clickzetta.pool.connect")
+    stats_logger.incr.assert_any_call("clickzetta.pool.checkout")
+    stats_logger.incr.assert_any_call("clickzetta.pool.checkin")
+
+
+def test_quote_when_required() -> None:
+    """
+    Test that the identifier preparer only quotes identifiers when required.
+    """
+    from sqlalchemy import column, select, table
+    from sqlalchemy.dialects.mysql.base import MySQLDialect, MySQLIdentifierPreparer
+
+    from superset.db_engine_specs.clickzetta import QuoteWhenRequiredMixin
+
+    class AlwaysQuotePreparer(MySQLIdentifierPreparer):
+        def quote(self, ident: str, force: Any = None) -> str:
+            return self.quote_identifier(ident)
+
+    class Preparer(QuoteWhenRequiredMixin, AlwaysQuotePreparer):
+        pass
+
+    dialect = MySQLDialect()
+    dialect.identifier_preparer = Preparer(dialect)
+
+    query = select(
+        column("Name"),
+        column("my col"),
+        column("select"),
+    ).select_from(table("tbl", schema="sch"))
+    assert str(query.compile(dialect=dialect)) == (
+        "SELECT Name, `my col`, `select` \nFROM sch.tbl"
+    )
+
+
+def test_fetch_data_arrow_batches() -> None:
+    """
+    Test that record batches are fetched up to the limit, without reading the rest.
+    """
+    import pyarrow as pa
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    batches = [pa.record_batch({"a": [i, i + 1]}) for i in range(0, 10, 2)]
+    read: list[pa.RecordBatch] = []
+
+    def fetch_arrow_batches() -> Any:
+        for batch in batches:
+            read.append(batch)
+            yield batch
+
+    cursor = Mock(spec=["fetch_arrow_batches", "fetchmany", "fetchall"])
+    cursor.fetch_arrow_batches = fetch_arrow_batches
+
+    data = ClickZettaEngineSpec.fetch_data(cursor, limit=3)
+    assert isinstance(data, pa.Table)
+    assert data.column("a").to_pylist() == [0, 1, 2]
+    assert len(read) == 2
+    cursor.fetchmany.assert_not_called()
+
+
+def test_fetch_data_batches() -> None:
+    """
+    Test that record batches are grouped into batches of at least ``batch_size`` rows.
+    """
+    import pyarrow as pa
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    cursor = Mock(spec=["fetch_arrow_batches", "fetchmany", "fetchall"])
+    cursor.fetch_arrow_batches.return_value = iter(
+        [pa.record_batch({"a": [i, i + 1]}) for i in range(0, 10, 2)]
+    )
+
+    batches = list(ClickZettaEngineSpec.fetch_data_batches(cursor, 3, limit=7))
+    assert [batch.column("a").to_pylist() for batch in batches] == [
+        [0, 1, 2, 3],
+        [4, 5, 6],
+    ]
+    cursor.fetchmany.assert_not_called()
+
+
+def test_fetch_data_fallback() -> None:
+    """
+    Test that rows are fetched as tuples when the driver doesn't support Arrow.
+    """
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    cursor = Mock(spec=["fetchmany", "fetchall"])
+    cursor.fetchall.return_value = [(1,), (2,)]
+    assert ClickZettaEngineSpec.fetch_data(cursor) == [(1,), (2,)]
+
+    cursor = Mock(spec=["fetch_arrow_table", "fetchmany", "fetchall"])
+    cursor.fetch_arrow_table.side_effect = NotImplementedError()
+    cursor.fetchmany.return_value = [(1,)]
+    assert ClickZettaEngineSpec.fetch_data(cursor, limit=1) == [(1,)]
+
+
+def test_fetch_data_arrow_error() -> None:
+    """
+    Test that Arrow errors are raised rather than falling back to a half-read cursor.
+    """
+    import pyarrow as pa
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+
+    def fetch_arrow_batches() -> Any:
+        yield pa.record_batch({"a": [1]})
+        raise NotImplementedError()
+
+    cursor = Mock(spec=["fetch_arrow_batches", "fetchmany", "fetchall"])
+    cursor.fetch_arrow_batches = fetch_arrow_batches
+    with pytest.raises(NotImplementedError):
+        ClickZettaEngineSpec.fetch_data(cursor)
+
+    cursor = Mock(spec=["fetch_arrow_table", "fetchmany", "fetchall"])
+    cursor.fetch_arrow_table.side_effect = ValueError("connection lost")
+    with pytest.raises(ValueError, match="connection lost"):
+        ClickZettaEngineSpec.fetch_data(cursor)
+
+    cursor.fetchall.assert_not_called()
+
+    cursor = Mock(spec=["fetchmany", "fetchall"])
+    cursor.fetchall.side_effect = ValueError("connection lost")
+    with pytest.raises(ValueError, match="connection lost"):
+        ClickZettaEngineSpec.fetch_data(cursor)
+
+
+@pytest.fixture
+def information_schema_engine(tmp_path: Path) -> Any:
+    """
+    A SQLite engine with an attached ``information_schema`` database.
+    """
+    from sqlalchemy import event
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'main.db'}")
+    info = tmp_path / "information_schema.db"
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.execute(f"ATTACH DATABASE '{info}' AS information_schema")
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE information_schema.tables "
+            "(table_schema TEXT, table_name TEXT, table_type TEXT)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE information_schema.columns (table_schema TEXT, "
+            "table_name TEXT, column_name TEXT, data_type TEXT, is_nullable TEXT, "
+            "column_default TEXT, comment TEXT, ordinal_position INTEGER)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO information_schema.tables VALUES "
+            "('sales', 'orders', 'MANAGED_TABLE'), "
+            "('sales', 'customers', 'EXTERNAL_TABLE'), "
+            "('sales', 'orders_view', 'VIRTUAL_VIEW'), "
+            "('sales', 'daily', 'MATERIALIZED_VIEW'), "
+            "('other', 'ignored', 'MANAGED_TABLE')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO information_schema.columns VALUES "
+            "('sales', 'orders', 'amount', 'DOUBLE', 'YES', NULL, NULL, 2), "
+            "('sales', 'orders', 'id', 'BIGINT', 'NO', NULL, 'pk', 1), "
+            "('sales', 'customers', 'name', 'STRING', 'YES', NULL, NULL, 1)"
+        )
+    return engine
+
+
+def test_schema_metadata(
+    information_schema_engine: Any,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that tables are listed once per inspector without their columns, and that
+    columns come from a bulk, cached query, refreshed along with the table list.
+    """
+    from sqlalchemy import event, inspect, types
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.db_engine_specs.clickzetta import (
+        ClickZettaEngineSpec,
+        ClickZettaMetadataCache,
+        MetadataScope,
+    )
+    from superset.sql.parse import Table
+
+    cache = ClickZettaMetadataCache()
+    mocker.patch("superset.db_engine_specs.clickzetta.metadata_cache", cache)
+    cache.bind(information_schema_engine, MetadataScope(1, None, 300))
+
+    statements: list[str] = []
+    event.listen(
+        information_schema_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    inspector = inspect(information_schema_engine)
+    database = Mock()
+    assert ClickZettaEngineSpec.get_table_names(database, inspector, "sales") == {
+        "orders",
+        "customers",
+    }
+    assert ClickZettaEngineSpec.get_view_names(database, inspector, "sales") == {
+        "orders_view",
+    }
+    assert ClickZettaEngineSpec.get_materialized_view_names(
+        database, inspector, "sales"
+    ) == {"daily"}
+    assert len(statements) == 1
+    assert not any("information_schema.columns" in sql for sql in statements)
+
+    columns = ClickZettaEngineSpec.get_columns(inspector, Table("orders", "sales"))
+    assert [column["column_name"] for column in columns] == ["id", "amount"]
+    assert isinstance(columns[0]["type"], types.BigInteger)
+    assert columns[0]["nullable"] is False
+    assert columns[0]["comment"] == "pk"
+    assert ClickZettaEngineSpec.get_columns(inspector, Table("ORDERS", "sales")) == (
+        columns
+    )
+    assert len(statements) == 3
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # tables created since the metadata was loaded are inspected directly
+    get_columns = mocker.patch.object(
+        BaseEngineSpec,
+        "get_columns",
+        return_value=[{"column_name": "id", "name": "id", "type": "BIGINT"}],
+    )
+    assert ClickZettaEngineSpec.get_columns(inspector, Table("new", "sales")) == [
+        {"column_name": "id", "name": "id", "type": "BIGINT"}
+    ]
+    get_columns.assert_called_once_with(inspector, Table("new", "sales"), None)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # refreshing the table list refreshes the columns
+    inspector = inspect(information_schema_engine)
+    ClickZettaEngineSpec.get_table_names(database, inspector, "sales")
+    ClickZettaEngineSpec.get_columns(inspector, Table("orders", "sales"))
+    assert len(statements) == 6
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_schema_metadata_zero_timeout(
+    information_schema_engine: Any,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that a table cache timeout of 0 disables the cache.
+    """
+    from sqlalchemy import inspect
+
+    from superset.db_engine_specs.clickzetta import (
+        ClickZettaEngineSpec,
+        ClickZettaMetadataCache,
+        MetadataScope,
+    )
+
+    cache = ClickZettaMetadataCache()
+    mocker.patch("superset.db_engine_specs.clickzetta.metadata_cache", cache)
+    cache.bind(information_schema_engine, MetadataScope(1, None, 0))
+
+    inspector = inspect(information_schema_engine)
+    for _ in range(2):
+        assert ClickZettaEngineSpec.get_schema_metadata(inspector, "sales").tables
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_get_columns_without_table_cache(
+    information_schema_engine: Any,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that columns are fetched per table when the table cache is disabled.
+    """
+    from superset.db_engine_specs.clickzetta import (
+        ClickZettaEngineSpec,
+        ClickZettaMetadataCache,
+        MetadataScope,
+    )
+    from superset.sql.parse import Table
+
+    cache = ClickZettaMetadataCache()
+    mocker.patch("superset.db_engine_specs.clickzetta.metadata_cache", cache)
+    cache.bind(information_schema_engine, MetadataScope(1, None, None))
+
+    inspector = Mock(bind=information_schema_engine)
+    inspector.get_columns.return_value = [{"name": "id", "type": "BIGINT"}]
+
+    columns = ClickZettaEngineSpec.get_columns(inspector, Table("orders", "sales"))
+    assert columns == [{"column_name": "id", "name": "id", "type": "BIGINT"}]
+    inspector.get_columns.assert_called_with("orders", "sales")
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+@pytest.fixture
+def partition_cache(mocker: MockerFixture) -> Any:
+    from superset.db_engine_specs.clickzetta import ClickZettaPartitionCache
+
+    cache = ClickZettaPartitionCache()
+    mocker.patch("superset.db_engine_specs.clickzetta.partition_cache", cache)
+    return cache
+
+
+def test_latest_partition(mocker: MockerFixture, partition_cache: Any) -> None:
+    """
+    Test that the latest partition is found from ``SHOW PARTITIONS``, and cached.
+    """
+    import pandas as pd
+    from sqlalchemy.dialects.mysql.base import MySQLDialect
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+    from superset.sql.parse import Table
+
+    database = mocker.MagicMock()
+    database.get_dialect.return_value = MySQLDialect()
+    database.get_df.return_value = pd.DataFrame(
+        {
+            "partitions": [
+                "dt=2024-01-09/hour=23",
+                "dt=2024-01-10/hour=9",
+                "dt=2024-01-10/hour=10",
+            ]
+        }
+    )
+
+    assert ClickZettaEngineSpec.latest_partition(
+        database, Table("events", "analytics")
+    ) == (["dt", "hour"], ["2024-01-10", "10"])
+    database.get_df.assert_called_once_with(
+        "SHOW PARTITIONS analytics.events",
+        catalog=None,
+        schema="analytics",
+    )
+
+    assert ClickZettaEngineSpec.latest_partition(
+        database, Table("events", "analytics")
+    ) == (["dt", "hour"], ["2024-01-10", "10"])
+    database.get_df.assert_called_once()
+
+
+def test_latest_partition_not_partitioned(
+    mocker: MockerFixture,
+    partition_cache: Any,
+) -> None:
+    """
+    Test that tables without partitions have no latest partition, and are cached.
+    """
+    from sqlalchemy.dialects.mysql.base import MySQLDialect
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+    from superset.sql.parse import Table
+
+    database = mocker.MagicMock()
+    database.get_dialect.return_value = MySQLDialect()
+    database.get_df.side_effect = Exception("table is not partitioned")
+
+    assert ClickZettaEngineSpec.latest_partition(database, Table("events")) == (
+        [],
+        None,
+    )
+    assert ClickZettaEngineSpec.get_extra_table_metadata(database, Table("t")) == {}
+    assert ClickZettaEngineSpec.latest_partition(database, Table("events")) == (
+        [],
+        None,
+    )
+    assert database.get_df.call_count == 2
+
+
+def test_latest_partition_error(mocker: MockerFixture, partition_cache: Any) -> None:
+    """
+    Test that errors listing the partitions are not cached.
+    """
+    import pandas as pd
+    from sqlalchemy.dialects.mysql.base import MySQLDialect
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+    from superset.sql.parse import Table
+
+    database = mocker.MagicMock()
+    database.get_dialect.return_value = MySQLDialect()
+    database.get_df.side_effect = [
+        Exception("connection timed out"),
+        pd.DataFrame({"partitions": ["dt=2024-01-10"]}),
+    ]
+
+    assert ClickZettaEngineSpec.latest_partition(database, Table("events")) == (
+        [],
+        None,
+    )
+    assert ClickZettaEngineSpec.latest_partition(database, Table("events")) == (
+        ["dt"],
+        ["2024-01-10"],
+    )
+
+
+def test_select_star_latest_partition(mocker: MockerFixture) -> None:
+    """
+    Test that ``select_star`` only reads the latest partition.
+    """
+    from sqlalchemy.dialects.mysql.base import MySQLDialect
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+    from superset.sql.parse import Table
+
+    mocker.patch.object(
+        ClickZettaEngineSpec,
+        "latest_partition",
+        return_value=(["dt"], ["2024-01-10"]),
+    )
+    database = mocker.MagicMock()
+    engine = Mock(dialect=MySQLDialect())
+
+    ClickZettaEngineSpec.select_star(
+        database=database,
+        table=Table("events", "analytics"),
+        engine=engine,
+        limit=100,
+        indent=False,
+        latest_partition=True,
+        cols=[{"column_name": "dt", "name": "dt", "type": "DATE"}],
+    )
+
+    query = database.compile_sqla_query.mock_calls[0][1][0]
+    assert str(
+        query.compile(dialect=MySQLDialect(), compile_kwargs={"literal_binds": True})
+    ) == ("SELECT * \nFROM analytics.events \nWHERE dt = '2024-01-10' \n LIMIT 100")
+
+
+@pytest.mark.parametrize(
+    "latest, time_grain, expected",
+    [
+        (
+            "2024-01-10",
+            None,
+            "dt >= '2024-01-01' AND dt <= '2024-01-08'",
+        ),
+        ("20240110", None, "dt >= '20240101' AND dt <= '20240108'"),
+        ("2024-01-10", "P1M", "dt >= '2024-01-01'"),
+        ("cn", None, None),
+    ],
+)
+def test_get_time_partition_filter(
+    mocker: MockerFixture,
+    latest: str,
+    time_grain: str | None,
+    expected: str | None,
+) -> None:
+    """
+    Test that time range filters are pushed down to date-like partitions.
+    """
+    from datetime import datetime
+
+    from sqlalchemy.dialects.mysql.base import MySQLDialect
+
+    from superset.db_engine_specs.clickzetta import ClickZettaEngineSpec
+    from superset.sql.parse import Table
+
+    mocker.patch.object(
+        ClickZettaEngineSpec,
+        "latest_partition",
+        return_value=(["dt"], [latest]),
+    )
+
+    clause = ClickZettaEngineSpec.get_time_partition_filter(
+        mocker.MagicMock(),
+        Table("events", "analytics"),
+        "dt",
+        datetime(2024, 1, 1, 12),
+        datetime(2024, 1, 8, 12),
+        time_grain=time_grain,
+    )
+    if expected is None:
+        assert clause is None
+    else:
+        assert (
+            str(
+                clause.compile(
+                    dialect=MySQLDialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            )
+            == expected
+        )
+
+    assert (
+        ClickZettaEngineSpec.get_time_partition_filter(
+            mocker.MagicMock(),
+            Table("events", "analytics"),
+            "event_time",
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 8),
+        )
+        is None
+    )
@@ -17,6 +17,7 @@
 
 # pylint: disable=invalid-name
 
+from datetime import timedelta
 from typing import Any
 from uuid import UUID
 
@@ -99,3 +100,30 @@ def test_key_value_distributed_lock_expired() -> None:
                 assert _get_lock(MAIN_KEY, session) is None
 
         assert _get_lock(MAIN_KEY, session) is None
+
+
+def test_key_value_distributed_lock_ttl() -> None:
+    """
+    Test that the lock can be held for longer than the default expiration.
+    """
+    session = _get_other_session()
+
+    with freeze_time("2021-01-01"):
+        with KeyValueDistributedLock("ns", ttl=timedelta(hours=1), a=1, b=2):
+            with freeze_time("2021-01-01 00:59:00"):
+                assert _get_lock(MAIN_KEY, session) == LOCK_VALUE
+            with freeze_time("2021-01-01 01:01:00"):
+                assert _get_lock(MAIN_KEY, session) is None
+
+
+def test_key_value_distributed_lock_released_on_error() -> None:
+    """
+    Test that the lock is released when the locked code raises.
+    """
+    session = _get_other_session()
+
+    with pytest.raises(ValueError, match="failed"):
+        with KeyValueDistributedLock("ns", a=1, b=2):
+            raise ValueError("failed")
+
+    assert _get_lock(MAIN_KEY, session) is None
@@ -0,0 +1,165 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from flask import current_app
+from flask_caching import Cache
+from pytest_mock import MockerFixture
+from sqlalchemy import event
+from sqlalchemy.orm.session import Session
+
+
+@contextmanager
+def count_queries(session: Session) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def dashboard(session: Session) -> Any:
+    from superset.connectors.sqla.models import SqlaTable, SqlMetric, TableColumn
+    from superset.models.core import Database
+    from superset.models.dashboard import Dashboard
+    from superset.models.slice import Slice
+
+    Dashboard.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+
+    database = Database(database_name="db", sqlalchemy_uri="sqlite://")
+    tables = [
+        SqlaTable(
+            table_name=f"table_{i}",
+            database=database,
+            columns=[TableColumn(column_name="ds"), TableColumn(column_name="a")],
+            metrics=[SqlMetric(metric_name="count", expression="COUNT(*)")],
+        )
+        for i in range(3)
+    ]
+    session.add_all(tables)
+    session.flush()
+    dashboard = Dashboard(
+        dashboard_title="dashboard",
+        slices=[
+            Slice(
+                slice_name=f"slice_{i}",
+                datasource_type="table",
+                datasource_id=tables[i % 3].id,
+                viz_type="table",
+                params='{"metrics": ["count"], "groupby": ["a"]}',
+            )
+            for i in range(6)
+        ],
+    )
+    session.add(dashboard)
+    session.commit()
+    session.expire_all()
+    return dashboard
+
+
+def test_get_datasources_by_key(session: Session, dashboard: Any) -> None:
+    """
+    Test that the datasources of a dashboard, with their columns, metrics, owners
+    and database, are loaded in a constant number of queries.
+    """
+    from superset.models.dashboard import Dashboard
+
+    keys = {(slc.cls_model, slc.datasource_id) for slc in dashboard.slices}
+
+    with count_queries(session) as statements:
+        datasources = Dashboard.get_datasources_by_key(keys)
+        for datasource in datasources.values():
+            assert {column.column_name for column in datasource.columns} == {
+                "ds",
+                "a",
+            }
+            assert [metric.metric_name for metric in datasource.metrics] == ["count"]
+            assert datasource.owners == []
+            assert datasource.database.database_name == "db"
+
+    assert set(datasources) == keys
+    assert len(statements) == 4
+
+
+def test_datasets_trimmed_for_slices_cache(
+    mocker: MockerFixture, session: Session, dashboard: Any
+) -> None:
+    """
+    Test that the payloads of the datasets are cached until a dataset is changed.
+    """
+    from superset.connectors.sqla.models import SqlaTable
+    from superset.extensions import cache_manager
+
+    mocker.patch.object(
+        cache_manager,
+        "_cache",
+        Cache(current_app, config={"CACHE_TYPE": "SimpleCache"}),
+    )
+    data_for_slices = mocker.spy(SqlaTable, "data_for_slices")
+
+    result = dashboard.datasets_trimmed_for_slices()
+    assert [dataset["table_name"] for dataset in result] == [
+        "table_0",
+        "table_1",
+        "table_2",
+    ]
+    assert [
+        [metric["metric_name"] for metric in dataset["metrics"]] for dataset in result
+    ] == [["count"]] * 3
+    assert [
+        [column["column_name"] for column in dataset["columns"]] for dataset in result
+    ] == [["a"]] * 3
+    assert data_for_slices.call_count == 3
+
+    assert dashboard.datasets_trimmed_for_slices() == result
+    assert data_for_slices.call_count == 3
+
+    table = session.query(SqlaTable).filter_by(table_name="table_1").one()
+    table.description = "changed"
+    session.commit()
+    assert dashboard.datasets_trimmed_for_slices() == result
+    assert data_for_slices.call_count == 4
+
+    # syncing the columns from the source only changes the columns
+    column = next(column for column in table.columns if column.column_name == "a")
+    column.type = "VARCHAR"
+    session.commit()
+    result = dashboard.datasets_trimmed_for_slices()
+    assert result[1]["columns"][0]["type"] == "VARCHAR"
+    assert data_for_slices.call_count == 5
+
+    table.columns = [column]
+    session.commit()
+    assert dashboard.datasets_trimmed_for_slices() != result
+    assert data_for_slices.call_count == 6
+    result = dashboard.datasets_trimmed_for_slices()
+
+    mocker.patch.dict(current_app.config, {"DASHBOARD_DATASETS_CACHE_TIMEOUT": None})
+    assert dashboard.datasets_trimmed_for_slices() == result
+    assert data_for_slices.call_count == 9
@@ -21,6 +21,8 @@ from datetime import datetime, timezone
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pytest
 from numpy.core.multiarray import array
 from pytest_mock import MockerFixture
 
@@ -185,3 +187,111 @@ def test_get_column_description_from_empty_data_using_cursor_description(
     )
     assert any(col.get("column_name") == "__time" for col in result_set.columns)
     logger.exception.assert_not_called()
+
+
+def test_arrow_table() -> None:
+    """
+    Test that an Arrow table from the driver is used without conversion.
+    """
+    import pyarrow as pa
+
+    table = pa.table(
+        {
+            "a": pa.array([1, 2], type=pa.int64()),
+            "b": pa.array([{"x": 1}, None], type=pa.struct([("x", pa.int64())])),
+            "c": pa.array(["foo", "bar"]),
+        }
+    )
+    description = [
+        ("a", "int", None, None, None, None, True),
+        ("a", "struct", None, None, None, None, True),
+        ("c", "string", None, None, None, None, True),
+    ]
+    result_set = SupersetResultSet(table, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.table.column_names == ["a", "a__1", "c"]
+    # no copy is made
+    assert (
+        result_set.table.column("a").chunk(0).buffers()[1].address
+        == table.column("a").chunk(0).buffers()[1].address
+    )
+    assert result_set.table.column("a__1").to_pylist() == ["{'x': 1}", None]
+    assert result_set.columns[0]["type"] == "INT"
+    assert result_set.to_pandas_df()["c"].tolist() == ["foo", "bar"]
+
+
+def test_arrow_table_nested_columns() -> None:
+    """
+    Test that nested columns are stringified the same way from Arrow and from rows.
+    """
+    import pyarrow as pa
+
+    table = pa.table(
+        {
+            "s": pa.array(
+                [{"x": 1, "y": "s"}, None],
+                type=pa.struct([("x", pa.int64()), ("y", pa.string())]),
+            ),
+            "l": pa.array([[1, 2], None], type=pa.list_(pa.int64())),
+        }
+    )
+    description = [
+        ("s", "struct", None, None, None, None, True),
+        ("l", "array", None, None, None, None, True),
+    ]
+    from_arrow = SupersetResultSet(table, description, BaseEngineSpec)  # type: ignore
+    from_rows = SupersetResultSet(
+        [tuple(row.values()) for row in table.to_pylist()],
+        description,  # type: ignore
+        BaseEngineSpec,
+    )
+
+    assert from_arrow.table.to_pylist() == from_rows.table.to_pylist()
+    assert from_arrow.table.column("s").to_pylist() == ["{'x': 1, 'y': 's'}", None]
+    assert from_arrow.table.column("l").to_pylist() == ["[1, 2]", None]
+
+
+def test_stringify_values_only_converts_offending_values(
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test that strings and nulls are not converted when stringifying a column.
+    """
+    stringify_value = mocker.patch(
+        "superset.result_set.stringify_value",
+        side_effect=lambda value: f"<{value}>",
+    )
+
+    array = np.array(["a", None, 1, pd.NA, "b", 2.5], dtype=object)
+    assert stringify_values(array).tolist() == ["a", None, "<1>", None, "b", "<2.5>"]
+    assert [call.args for call in stringify_value.mock_calls] == [(1,), (2.5,)]
+
+
+def test_mixed_columns() -> None:
+    """
+    Test columns with mixed, nested and timezone-aware values.
+    """
+    data = [
+        (1, [{"a": 1}], datetime(2023, 1, 1, tzinfo=timezone.utc), b"x"),
+        ("a", None, None, None),
+        (None, [], datetime(2023, 1, 2, tzinfo=timezone.utc), {"b": 2}),
+    ]
+    description = [(name, None) for name in ("mixed", "nested", "ts", "other")]
+    result_set = SupersetResultSet(data, description, BaseEngineSpec)  # type: ignore
+
+    assert result_set.table.column("mixed").to_pylist() == ["1", "a", None]
+    assert result_set.table.column("nested").to_pylist() == ['[{"a": 1}]', None, "[]"]
+    assert result_set.table.column("ts").type == pa.timestamp("ns", tz="UTC")
+    assert result_set.table.column("other").to_pylist() == ["x", None, "{'b': 2}"]
+
+
+def test_rows_with_different_lengths() -> None:
+    """
+    Test that rows must match the cursor description.
+    """
+    description = [("a", None), ("b", None)]
+
+    with pytest.raises(ValueError, match="same number of values"):
+        SupersetResultSet([(1, 2), (3,)], description, BaseEngineSpec)  # type: ignore
+    with pytest.raises(ValueError, match="Expected 2 values per row, got 3"):
+        SupersetResultSet([(1, 2, 3)], description, BaseEngineSpec)  # type: ignore
@@ -18,10 +18,18 @@
 # pylint: disable=invalid-name, unused-argument, redefined-outer-name
 
 import json  # noqa: TID251
+from pathlib import Path
 
 import pytest
-from flask_appbuilder.security.sqla.models import Role, User
+from flask_appbuilder.security.sqla.models import (
+    Permission,
+    PermissionView,
+    Role,
+    User,
+    ViewMenu,
+)
 from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
 
 from superset.common.query_object import QueryObject
 from superset.connectors.sqla.models import Database, SqlaTable
@@ -1186,3 +1194,308 @@ def test_get_catalogs_accessible_by_user_schema_access(
     catalogs = {"catalog1", "catalog2"}
 
     assert sm.get_catalogs_accessible_by_user(database, catalogs) == {"catalog2"}
+
+
+def test_get_rls_filters_cache(
+    mocker: MockerFixture, session: Session, tmp_path: Path
+) -> None:
+    """
+    Test that RLS filters are cached in the request and across requests, per set
+    of roles and table, until they're modified.
+    """
+    from unittest.mock import MagicMock
+
+    from flask import current_app, g
+    from flask_caching.backends import FileSystemCache
+
+    from superset.connectors.sqla.models import RowLevelSecurityFilter
+    from superset.utils.core import RowLevelSecurityFilterType
+
+    SqlaTable.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    mocker.patch("superset.extensions.cache_manager").cache = FileSystemCache(
+        str(tmp_path)
+    )
+    stats_logger = MagicMock()
+    mocker.patch.dict(
+        current_app.config,
+        {"STATS_LOGGER": stats_logger, "RLS_FILTERS_CACHE_TIMEOUT": 3600},
+    )
+
+    database = Database(database_name="db", sqlalchemy_uri="sqlite://")
+    table = SqlaTable(table_name="t", database=database)
+    other_table = SqlaTable(table_name="u", database=database)
+    role = Role(name="tenant")
+    user = User(
+        first_name="Alice",
+        last_name="Doe",
+        email="adoe@example.org",
+        username="adoe",
+        roles=[role],
+    )
+    rls_filter = RowLevelSecurityFilter(
+        name="tenant",
+        filter_type=RowLevelSecurityFilterType.REGULAR,
+        clause="tenant_id = 1",
+        roles=[role],
+        tables=[table],
+    )
+    session.add_all([table, other_table, user, rls_filter])
+    session.commit()
+
+    sm = appbuilder.sm
+    query_rls_filters = mocker.spy(sm, "_query_rls_filters")
+
+    def clauses(table: SqlaTable) -> list[str]:
+        return [rls_filter.clause for rls_filter in sm.get_rls_filters(table)]
+
+    def stats() -> list[str]:
+        return [call.args[0] for call in stats_logger.incr.call_args_list]
+
+    with override_user(user):
+        assert clauses(table) == ["tenant_id = 1"]
+        assert clauses(table) == ["tenant_id = 1"]
+        assert clauses(other_table) == []
+        assert query_rls_filters.call_count == 2
+
+        # another request
+        g.pop("rls_filters")
+        assert clauses(table) == ["tenant_id = 1"]
+        assert query_rls_filters.call_count == 2
+        assert stats() == [
+            "rls_filters.cache_miss",
+            "rls_filters.request_cache_hit",
+            "rls_filters.cache_miss",
+            "rls_filters.cache_hit",
+        ]
+
+        rls_filter.clause = "tenant_id = 2"
+        session.commit()
+        assert clauses(table) == ["tenant_id = 2"]
+        assert query_rls_filters.call_count == 3
+
+        rls_filter.tables = [table, other_table]
+        session.commit()
+        assert clauses(other_table) == ["tenant_id = 2"]
+        assert query_rls_filters.call_count == 4
+
+
+def test_get_rls_filters_local_cache(mocker: MockerFixture, session: Session) -> None:
+    """
+    Test that RLS filters are only cached in the request with a cache that isn't
+    shared by the processes, which couldn't be invalidated in all of them.
+    """
+    from flask import current_app, g
+    from flask_caching.backends import SimpleCache
+
+    from superset.connectors.sqla.models import RowLevelSecurityFilter
+    from superset.utils.core import RowLevelSecurityFilterType
+
+    SqlaTable.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    mocker.patch("superset.extensions.cache_manager").cache = SimpleCache()
+    mocker.patch.dict(current_app.config, {"RLS_FILTERS_CACHE_TIMEOUT": 3600})
+
+    role = Role(name="tenant")
+    user = User(
+        first_name="Alice",
+        last_name="Doe",
+        email="adoe@example.org",
+        username="adoe",
+        roles=[role],
+    )
+    table = SqlaTable(
+        table_name="t",
+        database=Database(database_name="db", sqlalchemy_uri="sqlite://"),
+    )
+    rls_filter = RowLevelSecurityFilter(
+        name="tenant",
+        filter_type=RowLevelSecurityFilterType.REGULAR,
+        clause="tenant_id = 1",
+        roles=[role],
+        tables=[table],
+    )
+    session.add_all([table, user, rls_filter])
+    session.commit()
+
+    sm = appbuilder.sm
+    query_rls_filters = mocker.spy(sm, "_query_rls_filters")
+    with override_user(user):
+        assert len(sm.get_rls_filters(table)) == 1
+        assert len(sm.get_rls_filters(table)) == 1
+        assert query_rls_filters.call_count == 1
+
+        # another request
+        g.pop("rls_filters")
+        assert len(sm.get_rls_filters(table)) == 1
+        assert query_rls_filters.call_count == 2
+
+
+def test_has_view_access_compiled_permissions(
+    mocker: MockerFixture, session: Session, tmp_path: Path
+) -> None:
+    """
+    Test that the permissions of a set of roles are compiled once, and compiled
+    again once they're modified.
+    """
+    from unittest.mock import MagicMock
+
+    from flask import current_app, g
+    from flask_caching.backends import FileSystemCache
+
+    from superset.security import permissions_cache
+
+    Role.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    mocker.patch("superset.extensions.cache_manager").cache = FileSystemCache(
+        str(tmp_path)
+    )
+    stats_logger = MagicMock()
+    mocker.patch.dict(
+        current_app.config,
+        {"STATS_LOGGER": stats_logger, "PERMISSIONS_CACHE_TIMEOUT": 3600},
+    )
+
+    sm = appbuilder.sm
+    chart = ViewMenu(name="Chart")
+    can_read = PermissionView(permission=Permission(name="can_read"), view_menu=chart)
+    can_write = PermissionView(permission=Permission(name="can_write"), view_menu=chart)
+    database_access = PermissionView(
+        permission=Permission(name="database_access"),
+        view_menu=ViewMenu(name="[db].(id:1)"),
+    )
+    role = Role(name="analyst", permissions=[can_read, database_access])
+    user = User(
+        first_name="Alice",
+        last_name="Doe",
+        email="adoe@example.org",
+        username="adoe",
+        roles=[role],
+    )
+    session.add(user)
+    session.commit()
+
+    query_permissions = mocker.spy(sm, "_query_permissions")
+
+    def stats() -> list[str]:
+        return [call.args[0] for call in stats_logger.incr.call_args_list]
+
+    with override_user(user):
+        assert sm.can_access("can_read", "Chart")
+        assert not sm.can_access("can_write", "Chart")
+        assert sm.user_view_menu_names("database_access") == {"[db].(id:1)"}
+        assert query_permissions.call_count == 1
+
+        # another request, in another process
+        g.pop("permissions_version")
+        permissions_cache._local_cache.clear()  # pylint: disable=protected-access
+        assert sm.can_access("can_read", "Chart")
+        assert query_permissions.call_count == 1
+        assert stats() == [
+            "permissions.cache_miss",
+            "permissions.local_cache_hit",
+            "permissions.local_cache_hit",
+            "permissions.cache_hit",
+        ]
+
+        role.permissions = [can_read, can_write]
+        session.commit()
+        assert sm.can_access("can_write", "Chart")
+        assert sm.user_view_menu_names("database_access") == set()
+        assert query_permissions.call_count == 2
+
+
+@pytest.mark.parametrize("cache_type", ["NullCache", "SimpleCache"])
+def test_has_view_access_compiled_permissions_local_cache(
+    mocker: MockerFixture, session: Session, cache_type: str
+) -> None:
+    """
+    Test that the permissions aren't compiled with a cache that isn't shared by the
+    processes, which couldn't be invalidated in all of them.
+    """
+    from flask import current_app
+    from flask_caching import backends
+
+    Role.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    mocker.patch("superset.extensions.cache_manager").cache = getattr(
+        backends, cache_type
+    )()
+    mocker.patch.dict(current_app.config, {"PERMISSIONS_CACHE_TIMEOUT": 3600})
+
+    sm = appbuilder.sm
+    chart = ViewMenu(name="Chart")
+    can_read = PermissionView(permission=Permission(name="can_read"), view_menu=chart)
+    user = User(
+        first_name="Alice",
+        last_name="Doe",
+        email="adoe@example.org",
+        username="adoe",
+        roles=[Role(name="analyst", permissions=[can_read])],
+    )
+    session.add(user)
+    session.commit()
+
+    query_permissions = mocker.spy(sm, "_query_permissions")
+    with override_user(user):
+        assert sm.can_access("can_read", "Chart")
+        assert not sm.can_access("can_write", "Chart")
+    assert query_permissions.call_count == 0
+
+
+def test_user_view_menu_names_guest_user(
+    mocker: MockerFixture, session: Session, tmp_path: Path
+) -> None:
+    """
+    Test that guest users aren't granted view menus by their roles when the
+    permissions are cached.
+    """
+    from flask import current_app
+    from flask_caching.backends import FileSystemCache
+
+    from superset.security.guest_token import GuestUser
+
+    Role.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    mocker.patch("superset.extensions.cache_manager").cache = FileSystemCache(
+        str(tmp_path)
+    )
+    mocker.patch.dict(current_app.config, {"PERMISSIONS_CACHE_TIMEOUT": 3600})
+    mocker.patch(
+        "superset.is_feature_enabled",
+        side_effect=lambda feature: feature == "EMBEDDED_SUPERSET",
+    )
+
+    guest_role = Role(
+        name="Gamma",
+        permissions=[
+            PermissionView(
+                permission=Permission(name="datasource_access"),
+                view_menu=ViewMenu(name="[db].[table](id:1)"),
+            )
+        ],
+    )
+    session.add(guest_role)
+    session.commit()
+
+    guest_user = GuestUser(
+        token={"user": {}, "resources": [], "rls_rules": []},  # type: ignore
+        roles=[guest_role],
+    )
+    with override_user(guest_user):
+        assert appbuilder.sm.user_view_menu_names("datasource_access") == set()
+
+
+def test_local_permissions_cache_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that the permissions cached in a process expire.
+    """
+    from superset.security.permissions_cache import LocalPermissionsCache
+
+    monotonic = mocker.patch(
+        "superset.security.permissions_cache.time.monotonic", return_value=0
+    )
+    cache = LocalPermissionsCache(max_entries=2, timeout=60)
+    cache.set("v1", (1,), frozenset({("can_read", "Chart")}))
+
+    monotonic.return_value = 59
+    assert cache.get("v1", (1,)) == frozenset({("can_read", "Chart")})
+
+    monotonic.return_value = 60
+    assert cache.get("v1", (1,)) is None
+    assert len(cache) == 0
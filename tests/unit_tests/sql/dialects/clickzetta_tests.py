@@ -0,0 +1,62 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+from sqlglot import parse_one
+
+from superset.sql.dialects.clickzetta import ClickZetta
+from superset.sql.parse import SQLScript
+
+
+@pytest.mark.parametrize(
+    "sql,expected",
+    [
+        ("SELECT `name` FROM `sch`.`tbl`", "SELECT name FROM sch.tbl"),
+        ("SELECT `Name` AS `Total`", "SELECT Name AS Total"),
+        ("SELECT `my col` FROM t", "SELECT `my col` FROM t"),
+        ("SELECT `select`, `date` FROM t", "SELECT `select`, `date` FROM t"),
+        ("SELECT `1a` FROM t", "SELECT `1a` FROM t"),
+    ],
+)
+def test_identifiers(sql: str, expected: str) -> None:
+    """
+    Test that identifiers are only quoted when required.
+    """
+    assert parse_one(sql, dialect=ClickZetta).sql(dialect=ClickZetta) == expected
+
+
+def test_string_literals_with_backticks() -> None:
+    """
+    Test that backticks inside string literals are preserved.
+    """
+    sql = "SELECT `a` FROM t WHERE b = 'x `y` z'"
+
+    assert (
+        parse_one(sql, dialect=ClickZetta).sql(dialect=ClickZetta)
+        == "SELECT a FROM t WHERE b = 'x `y` z'"
+    )
+
+
+def test_format_with_limit() -> None:
+    """
+    Test that statements are formatted without needless backticks.
+    """
+    script = SQLScript("SELECT `a` FROM `t`", "clickzetta")
+    statement = script.statements[0]
+    statement.set_limit_value(10)
+
+    assert statement.format() == "SELECT\n  a\nFROM t\nLIMIT 10"
@@ -18,6 +18,7 @@
 
 
 import pytest
+from flask import current_app
 from pytest_mock import MockerFixture
 from sqlglot import Dialects, exp, parse_one
 
@@ -30,6 +31,7 @@ from superset.sql.parse import (
     KQLTokenType,
     KustoKQLStatement,
     LimitMethod,
+    ParsedScriptCache,
     process_jinja_sql,
     remove_quotes,
     RLSMethod,
@@ -2977,3 +2979,77 @@ def test_has_subquery(sql: str, engine: str, expected: bool) -> None:
     Test the `has_subquery` method.
     """
     assert SQLStatement(sql, engine).has_subquery() == expected
+
+
+def test_parsed_script_cache(mocker: MockerFixture) -> None:
+    """
+    Test that scripts are parsed once per engine, and that the cached ASTs aren't
+    modified by the statements using them.
+    """
+    cache = ParsedScriptCache(512, 20_000)
+    mocker.patch("superset.sql.parse._parsed_script_cache", cache)
+    mocker.patch.dict(current_app.config, {"SQL_PARSE_CACHE_SIZE": 2})
+    parse = mocker.spy(SQLStatement, "_parse_uncached")
+    sql = "SELECT * FROM t -- comment"
+
+    statement = SQLStatement(sql, "postgresql")
+    statement.set_limit_value(10)
+    assert statement.format() == "SELECT\n  *\nFROM t /* comment */\nLIMIT 10"
+
+    assert (
+        SQLStatement(sql, "postgresql").format() == "SELECT\n  *\nFROM t /* comment */"
+    )
+    assert SQLScript(sql, "postgresql").statements[0].get_limit_value() is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    SQLStatement(sql, "mysql")
+    SQLStatement("SELECT 1", "postgresql")
+    assert parse.call_count == 3
+    assert len(cache) == 2
+
+    # the least recently used script was evicted
+    SQLStatement(sql, "postgresql")
+    assert parse.call_count == 4
+
+
+def test_parsed_script_cache_disabled(mocker: MockerFixture) -> None:
+    """
+    Test that scripts are parsed every time when the cache is disabled, and that
+    invalid scripts are not cached.
+    """
+    cache = ParsedScriptCache(512, 20_000)
+    mocker.patch("superset.sql.parse._parsed_script_cache", cache)
+    mocker.patch.dict(current_app.config, {"SQL_PARSE_CACHE_SIZE": 0})
+    parse = mocker.spy(SQLStatement, "_parse_uncached")
+
+    SQLStatement("SELECT 1", "postgresql")
+    SQLStatement("SELECT 1", "postgresql")
+    assert parse.call_count == 2
+    assert len(cache) == 0
+
+    mocker.patch.dict(current_app.config, {"SQL_PARSE_CACHE_SIZE": 2})
+    for _ in range(2):
+        with pytest.raises(SupersetParseError):
+            SQLStatement("SELECT FROM FROM", "postgresql")
+    assert len(cache) == 0
+
+
+def test_parsed_script_cache_long_script(mocker: MockerFixture) -> None:
+    """
+    Test that scripts longer than the maximum length are not cached.
+    """
+    cache = ParsedScriptCache(512, 20_000)
+    mocker.patch("superset.sql.parse._parsed_script_cache", cache)
+    mocker.patch.dict(current_app.config, {"SQL_PARSE_CACHE_MAX_SCRIPT_LENGTH": 20})
+    parse = mocker.spy(SQLStatement, "_parse_uncached")
+
+    for _ in range(2):
+        SQLStatement("SELECT a, b, c FROM some_table", "postgresql")
+    assert parse.call_count == 2
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    for _ in range(2):
+        SQLStatement("SELECT 1", "postgresql")
+    assert parse.call_count == 3
+    assert len(cache) == 1
@@ -17,16 +17,18 @@
 # pylint: disable=import-outside-toplevel, invalid-name, unused-argument, too-many-locals
 
 import json  # noqa: TID251
+from typing import Any
 from unittest.mock import MagicMock
 from uuid import UUID
 
 import pytest
+from flask_caching.backends import SimpleCache
 from freezegun import freeze_time
 from pytest_mock import MockerFixture
 
 from superset.common.db_query_status import QueryStatus
 from superset.db_engine_specs.postgres import PostgresEngineSpec
-from superset.errors import ErrorLevel, SupersetErrorType
+from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import OAuth2Error, SupersetErrorException
 from superset.models.core import Database
 from superset.sql.parse import SQLStatement, Table
@@ -34,7 +36,9 @@ from superset.sql_lab import (
     execute_query,
     execute_sql_statements,
     get_sql_results,
+    SqlLabException,
 )
+from superset.sqllab.limiting_factor import LimitingFactor
 from superset.utils.rls import apply_rls, get_predicates_for_table
 from tests.conftest import with_config
 from tests.unit_tests.models.core_test import oauth2_client_info
@@ -66,6 +70,252 @@ def test_execute_query(mocker: MockerFixture, app: None) -> None:
     SupersetResultSet.assert_called_with([(42,)], cursor.description, db_engine_spec)
 
 
+def test_execute_query_streaming(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that `execute_query` writes batches to the writer, without the extra row.
+    """
+    query = mocker.MagicMock()
+    query.executed_sql = "SELECT 42 AS answer"
+    query.limit = 3
+    query.limiting_factor = LimitingFactor.UNKNOWN
+    db_engine_spec = query.database.db_engine_spec
+    db_engine_spec.fetch_data_batches.return_value = iter([[(1,), (2,)], [(3,), (4,)]])
+
+    cursor = mocker.MagicMock()
+    writer = mocker.MagicMock()
+    writer.chunk_rows = 2
+    SupersetResultSet = mocker.patch("superset.sql_lab.SupersetResultSet")  # noqa: N806
+
+    execute_query(query, cursor=cursor, log_params={}, writer=writer)
+
+    db_engine_spec.fetch_data.assert_not_called()
+    db_engine_spec.fetch_data_batches.assert_called_with(cursor, 2, 4)
+    assert [call.args[0] for call in SupersetResultSet.call_args_list] == [
+        [(1,), (2,)],
+        [(3,)],
+        [],
+    ]
+    assert writer.write.call_count == 2
+    assert query.limiting_factor == LimitingFactor.UNKNOWN
+
+
+def test_results_chunks(mocker: MockerFixture, app: None) -> None:
+    """
+    Test writing results in chunks, and reading some or all of them back.
+    """
+    import msgpack
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sqllab.utils import ResultsChunkWriter, write_ipc_buffer
+    from superset.views.utils import _deserialize_results_payload
+
+    results_backend = SimpleCache()
+    mocker.patch("superset.sqllab.utils.results_backend", results_backend)
+
+    description = [("a", None, None, None, None, None, True)]
+    writer = ResultsChunkWriter("key", chunk_rows=2, cache_timeout=60)
+    writer.write(SupersetResultSet([(None,), (None,)], description, BaseEngineSpec))
+    writer.write(SupersetResultSet([(3,), (4,)], description, BaseEngineSpec))
+    writer.write(SupersetResultSet([(5,)], description, BaseEngineSpec))
+    assert writer.rows == 5
+    assert writer.chunks == [
+        {"key": "key-0", "rows": 2},
+        {"key": "key-1", "rows": 2},
+        {"key": "key-2", "rows": 1},
+    ]
+    assert writer.columns[0]["type"] == "INT"
+
+    empty = SupersetResultSet([], description, BaseEngineSpec)
+    payload = msgpack.dumps(
+        {
+            "data": write_ipc_buffer(empty.pa_table).to_pybytes(),
+            "chunks": writer.chunks,
+            "selected_columns": writer.columns,
+        }
+    )
+    query = mocker.MagicMock()
+    query.database.db_engine_spec = BaseEngineSpec
+
+    def read(**kwargs: Any) -> list[Any]:
+        results = _deserialize_results_payload(payload, query, True, **kwargs)
+        return [row["a"] for row in results["data"]]
+
+    assert read() == [None, None, 3, 4, 5]
+    assert read(rows=3) == [None, None, 3]
+    assert read(chunk=2) == [5]
+    assert read(offset=3) == [4, 5]
+    assert read(offset=1, rows=2) == [None, 3]
+    assert read(offset=5) == []
+
+    # chunks before the offset, or after the limit, aren't read
+    get = mocker.spy(results_backend, "get")
+    assert read(offset=2, rows=2) == [3, 4]
+    assert [call.args[0] for call in get.call_args_list] == ["key-1"]
+
+    table = _deserialize_results_payload(payload, query, True, as_arrow=True)["data"]
+    assert table.column("a").to_pylist() == [None, None, 3, 4, 5]
+
+    writer.discard()
+    assert not results_backend.has("key-0")
+
+
+@pytest.mark.parametrize("use_msgpack", [True, False])
+def test_deserialize_results_page(
+    mocker: MockerFixture, app: None, use_msgpack: bool
+) -> None:
+    """
+    Test reading a page of the rows and some of the columns of a stored result.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sql_lab import _serialize_and_expand_data, _serialize_payload
+    from superset.views.utils import _deserialize_results_payload
+
+    description = [
+        ("a", None, None, None, None, None, True),
+        ("b", None, None, None, None, None, True),
+    ]
+    result_set = SupersetResultSet(
+        [(i, f"b{i}") for i in range(5)], description, BaseEngineSpec
+    )
+    data, selected_columns, all_columns, _ = _serialize_and_expand_data(
+        result_set, BaseEngineSpec, use_msgpack
+    )
+    payload = _serialize_payload(
+        {
+            "data": data,
+            "columns": all_columns,
+            "selected_columns": selected_columns,
+        },
+        use_msgpack,
+    )
+    query = mocker.MagicMock()
+    query.database.db_engine_spec = BaseEngineSpec
+
+    results = _deserialize_results_payload(
+        payload, query, use_msgpack, rows=2, offset=1, columns=["b"]
+    )
+
+    assert results["data"] == [{"b": "b1"}, {"b": "b2"}]
+    assert [column["column_name"] for column in results["columns"]] == ["b"]
+    assert [column["column_name"] for column in results["selected_columns"]] == ["b"]
+    assert results["offset"] == 1
+
+    table = _deserialize_results_payload(
+        payload, query, use_msgpack, offset=3, columns=["a"], as_arrow=True
+    )["data"]
+    assert table.to_pydict() == {"a": [3, 4]}
+
+
+def test_results_chunks_too_large(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that writing chunks fails once the results exceed the size limit.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.result_set import SupersetResultSet
+    from superset.sqllab.utils import ResultsChunkWriter
+
+    mocker.patch("superset.sqllab.utils.results_backend", SimpleCache())
+    description = [("a", None, None, None, None, None, True)]
+    writer = ResultsChunkWriter("key", chunk_rows=2, cache_timeout=60, max_bytes=10)
+
+    with pytest.raises(SupersetErrorException) as excinfo:
+        writer.write(SupersetResultSet([(1,), (2,)], description, BaseEngineSpec))
+    assert excinfo.value.error.error_type == SupersetErrorType.RESULT_TOO_LARGE_ERROR
+
+
+def test_result_size_tracker(mocker: MockerFixture) -> None:
+    """
+    Test that the size of a result is estimated from a sample of each batch.
+    """
+    import pyarrow as pa
+
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.sqllab.utils import ResultSizeTracker
+
+    description = [("a", None, None, None, None, None, True)]
+    tracker = ResultSizeTracker(1000, description, BaseEngineSpec, sample_rows=10)
+
+    tracker.add([(i,) for i in range(50)])
+    assert tracker.rows == 50
+    assert tracker.size == 400  # 8 bytes per int64
+
+    tracker.add(pa.table({"a": list(range(50))}))
+    assert tracker.size == 800
+
+    with pytest.raises(SupersetErrorException) as excinfo:
+        tracker.add([(i,) for i in range(50)])
+    assert excinfo.value.error.error_type == SupersetErrorType.RESULT_TOO_LARGE_ERROR
+
+
+def test_result_size_tracker_projection() -> None:
+    """
+    Test that results that can't fit are rejected after the first batch.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+    from superset.sqllab.utils import ResultSizeTracker
+
+    description = [("a", None, None, None, None, None, True)]
+    tracker = ResultSizeTracker(1000, description, BaseEngineSpec, expected_rows=200)
+
+    with pytest.raises(SupersetErrorException):
+        tracker.add([(i,) for i in range(10)])
+    assert tracker.size == 80
+
+
+@with_config({"SQLLAB_PAYLOAD_MAX_MB": 0.001, "STATS_LOGGER": MagicMock()})
+def test_execute_query_exceeds_payload_limit(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that `execute_query` stops fetching as soon as the results are too large.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    query = mocker.MagicMock()
+    query.executed_sql = "SELECT * FROM logs"
+    query.limit = None
+    query.database.db_engine_spec = BaseEngineSpec
+    mocker.patch("superset.sql_lab.PAYLOAD_SIZE_BATCH_ROWS", 100)
+
+    cursor = mocker.MagicMock()
+    cursor.rowcount = -1
+    cursor.description = [("a", None, None, None, None, None, True)]
+    cursor.fetchmany.side_effect = lambda size: [(1,)] * size
+
+    with pytest.raises(SupersetErrorException) as excinfo:
+        execute_query(query, cursor=cursor, log_params={})
+    assert excinfo.value.error.error_type == SupersetErrorType.RESULT_TOO_LARGE_ERROR
+    # 0.001 MB is about 130 integers, so the limit is crossed on the second batch
+    assert cursor.fetchmany.call_count == 2
+
+
+def test_execute_query_engine_error(mocker: MockerFixture, app: None) -> None:
+    """
+    Test that errors raised by the engine while fetching are wrapped, even when they
+    carry a `SupersetError`.
+    """
+    from superset.db_engine_specs.base import BaseEngineSpec
+
+    query = mocker.MagicMock()
+    query.executed_sql = "SELECT * FROM logs"
+    query.limit = None
+    query.status = QueryStatus.RUNNING
+    query.database.db_engine_spec = BaseEngineSpec
+    mocker.patch("superset.sql_lab.db")
+
+    cursor = mocker.MagicMock()
+    cursor.fetchall.side_effect = SupersetErrorException(
+        SupersetError(
+            message="Connection reset",
+            error_type=SupersetErrorType.GENERIC_DB_ENGINE_ERROR,
+            level=ErrorLevel.ERROR,
+        )
+    )
+
+    with pytest.raises(SqlLabException):
+        execute_query(query, cursor=cursor, log_params={})
+
+
 @with_config(
     {
         "SQLLAB_PAYLOAD_MAX_MB": 50,
@@ -53,3 +53,31 @@ def test_load_chart_data_into_cache_with_error(
     mock_async_query_manager.update_job.assert_called_once_with(
         job_metadata, "error", errors=expected_errors
     )
+
+
+@mock.patch("superset.common.utils.query_cache_manager.QueryCacheManager")
+@mock.patch("superset.commands.chart.data.get_data_command.ChartDataCommand")
+@mock.patch("superset.tasks.async_queries.security_manager")
+@mock.patch("superset.tasks.async_queries.ChartDataQueryContextSchema")
+def test_refresh_chart_data_cache(
+    mock_query_context_schema_cls,
+    mock_security_manager,
+    mock_command_cls,
+    mock_query_cache_manager,
+):
+    """Test that stale results are refreshed by forcing the queries"""
+    from superset.tasks.async_queries import refresh_chart_data_cache
+
+    mock_security_manager.get_user_by_id.return_value = mock.MagicMock()
+    mock_command_cls.return_value.run.side_effect = ChartDataQueryFailedError(
+        _("Something went wrong")
+    )
+
+    with pytest.raises(ChartDataQueryFailedError):
+        refresh_chart_data_cache({"user_id": 1}, {"queries": []}, "key")
+
+    mock_query_context_schema_cls.return_value.load.assert_called_once_with(
+        {"queries": [], "force": True}
+    )
+    mock_command_cls.return_value.validate.assert_called_once()
+    mock_query_cache_manager.release_refresh.assert_called_once_with("key")
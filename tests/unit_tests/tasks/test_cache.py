@@ -0,0 +1,363 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from superset.tasks.cache import (
+    CacheWarmupTask,
+    PredictiveStrategy,
+    schedule_warm_up_charts,
+    TopNFilterStatesStrategy,
+    warm_up_chart,
+    warm_up_charts,
+)
+from superset.utils import concurrency, json
+from tests.conftest import with_config
+
+
+def chart_data_request(dashboard_id: int | None, country: str) -> dict[str, Any]:
+    form_data = {"slice_id": 1, "viz_type": "pie"}
+    if dashboard_id:
+        form_data["dashboardId"] = dashboard_id
+    return {
+        "path": "/api/v1/chart/data",
+        "datasource": {"id": 1, "type": "table"},
+        "queries": [{"filters": [{"col": "country", "op": "==", "val": country}]}],
+        "form_data": form_data,
+        "result_format": "json",
+        "result_type": "full",
+        "is_cached": False,
+    }
+
+
+def make_task(chart_id: int, username: str | None = "admin") -> CacheWarmupTask:
+    return {"payload": {"chart_id": chart_id}, "username": username}
+
+
+@pytest.mark.parametrize(
+    "record,expected",
+    [
+        (None, False),
+        ("not json", False),
+        (json.dumps(chart_data_request(None, "FR")), False),
+        (
+            json.dumps({**chart_data_request(2, "FR"), "result_format": "csv"}),
+            False,
+        ),
+        (json.dumps(chart_data_request(2, "FR")), True),
+    ],
+)
+def test_get_query_context(record: str | None, expected: bool) -> None:
+    """
+    Test that only the chart data requests from dashboards are warmed up.
+    """
+    query_context = TopNFilterStatesStrategy.get_query_context(record)
+    if expected:
+        assert query_context == {
+            "datasource": {"id": 1, "type": "table"},
+            "queries": [{"filters": [{"col": "country", "op": "==", "val": "FR"}]}],
+            "form_data": {"slice_id": 1, "viz_type": "pie", "dashboardId": 2},
+            "result_type": "full",
+        }
+    else:
+        assert query_context is None
+
+
+@pytest.fixture
+def users(session: Session) -> tuple[Any, Any]:
+    from superset import security_manager
+    from superset.models.core import Log
+
+    Log.metadata.create_all(session.get_bind())  # pylint: disable=no-member
+    alice = security_manager.user_model(
+        first_name="Alice", last_name="A", username="alice", email="alice@a.com"
+    )
+    bob = security_manager.user_model(
+        first_name="Bob", last_name="B", username="bob", email="bob@b.com"
+    )
+    session.add_all([alice, bob])
+    session.flush()
+    return alice, bob
+
+
+def log(
+    user_id: int,
+    country: str,
+    dttm: datetime | None = None,
+    is_cached: Any = None,
+) -> Any:
+    from superset.models.core import Log
+
+    return Log(
+        action="ChartRestApi.data",
+        user_id=user_id,
+        slice_id=1,
+        dttm=dttm or datetime.now(),
+        json=json.dumps({**chart_data_request(2, country), "is_cached": is_cached}),
+    )
+
+
+def filter_states(tasks: list[CacheWarmupTask]) -> list[tuple[Any, ...]]:
+    return [
+        (
+            task["username"],
+            task["payload"]["chart_id"],
+            task["payload"]["dashboard_id"],
+            task["payload"]["query_context"]["queries"][0]["filters"][0]["val"],
+        )
+        for task in tasks
+    ]
+
+
+def test_top_n_filter_states_strategy(session: Session, users: tuple[Any, Any]) -> None:
+    """
+    Test that the most requested filter states are warmed up as their users.
+    """
+    from superset.models.core import Log
+
+    alice, bob = users
+    session.add_all(
+        [
+            log(alice.id, "FR"),
+            log(alice.id, "FR"),
+            log(alice.id, "DE"),
+            log(bob.id, "US"),
+            log(bob.id, "US"),
+            log(bob.id, "US"),
+            log(bob.id, "JP", datetime(2000, 1, 1)),
+            Log(action="ChartRestApi.data", user_id=bob.id, slice_id=1, json="{}"),
+        ]
+    )
+    session.flush()
+
+    tasks = TopNFilterStatesStrategy(top_n=2, since="7 days ago").get_tasks()
+
+    assert filter_states(tasks) == [("bob", 1, 2, "US"), ("alice", 1, 2, "FR")]
+
+
+# a Wednesday
+NOW = datetime(2024, 1, 31, 7, 30)
+
+
+@pytest.mark.parametrize(
+    "kwargs,hours,window_start",
+    [
+        ({}, {8, 9, 10, 11}, datetime(2024, 1, 31, 8)),
+        ({"window_hours": 2}, {8, 9}, datetime(2024, 1, 31, 8)),
+        ({"hours": [6, 7]}, {6, 7}, datetime(2024, 2, 1, 6)),
+        ({"now": datetime(2024, 2, 2, 23, 30)}, {0, 1, 2, 3}, datetime(2024, 2, 3)),
+    ],
+)
+def test_predictive_strategy_window(
+    kwargs: dict[str, Any], hours: set[int], window_start: datetime
+) -> None:
+    """
+    Test the window of hours predicted, by default the next hours.
+    """
+    strategy = PredictiveStrategy(**{"now": NOW, **kwargs})
+
+    assert strategy.hours == hours
+    assert strategy.window_start == window_start
+    assert strategy.is_weekend == (window_start.weekday() >= 5)
+
+
+def test_predictive_strategy_utc() -> None:
+    """
+    Test that the window is in UTC, like the logged requests, on any server.
+    """
+    from freezegun import freeze_time
+
+    with freeze_time("2024-01-31 07:30:00", tz_offset=-5):
+        strategy = PredictiveStrategy()
+
+    assert strategy.now == datetime(2024, 1, 31, 7, 30)
+    assert strategy.hours == {8, 9, 10, 11}
+
+
+def test_predictive_strategy_weight() -> None:
+    """
+    Test that requests at other hours, or other kinds of day, are ignored, and
+    older requests weigh less.
+    """
+    strategy = PredictiveStrategy(now=NOW, half_life_days=7)
+
+    assert strategy.weight(datetime(2024, 1, 30, 9)) == pytest.approx(
+        0.5 ** (22.5 / 24 / 7)
+    )
+    assert strategy.weight(datetime(2024, 1, 24, 7, 30)) == 0.0
+    assert strategy.weight(datetime(2024, 1, 24, 9, 0)) < strategy.weight(
+        datetime(2024, 1, 30, 9)
+    )
+    # Saturday
+    assert strategy.weight(datetime(2024, 1, 27, 9)) == 0.0
+
+    with pytest.raises(ValueError, match="between 0 and 23"):
+        PredictiveStrategy(hours=[24])
+
+
+def test_predictive_strategy(session: Session, users: tuple[Any, Any]) -> None:
+    """
+    Test that the filter states requested at the hours of the window are
+    predicted, rather than the most requested ones.
+    """
+    alice, bob = users
+    session.add_all(
+        [
+            # during the night
+            log(alice.id, "FR", datetime(2024, 1, 30, 2)),
+            log(alice.id, "FR", datetime(2024, 1, 30, 3)),
+            log(alice.id, "FR", datetime(2024, 1, 29, 3)),
+            # on the weekend
+            log(alice.id, "DE", datetime(2024, 1, 27, 9)),
+            log(alice.id, "DE", datetime(2024, 1, 28, 9)),
+            # in the morning
+            log(bob.id, "US", datetime(2024, 1, 30, 9)),
+            log(alice.id, "JP", datetime(2024, 1, 29, 10)),
+            # after the predictions
+            log(bob.id, "BR", datetime(2024, 1, 31, 9)),
+        ]
+    )
+    session.flush()
+
+    tasks = PredictiveStrategy(top_n=10, now=NOW).get_tasks()
+
+    assert filter_states(tasks) == [("bob", 1, 2, "US"), ("alice", 1, 2, "JP")]
+
+
+def test_predictive_strategy_report(session: Session, users: tuple[Any, Any]) -> None:
+    """
+    Test the report of the hit rate of the requests following a warm up.
+    """
+    alice, bob = users
+    session.add_all(
+        [
+            # the predictions
+            log(bob.id, "US", datetime(2024, 1, 30, 9)),
+            log(alice.id, "JP", datetime(2024, 1, 29, 10)),
+            # the requests of the window
+            log(bob.id, "US", datetime(2024, 1, 31, 9), is_cached=[True]),
+            log(bob.id, "US", datetime(2024, 1, 31, 10), is_cached=[True, True]),
+            log(alice.id, "FR", datetime(2024, 1, 31, 9), is_cached=[False]),
+            log(alice.id, "FR", datetime(2024, 1, 31, 10), is_cached=True),
+            # out of the window
+            log(alice.id, "FR", datetime(2024, 1, 31, 13), is_cached=[False]),
+            log(bob.id, "US", datetime(2024, 2, 1, 9), is_cached=[True]),
+        ]
+    )
+    session.flush()
+
+    report = PredictiveStrategy(top_n=10, now=NOW).get_report()
+
+    assert report == {
+        "start": "2024-01-31T07:30:00",
+        "end": "2024-02-01T07:30:00",
+        "hours": [8, 9, 10, 11],
+        "predicted": 2,
+        "requests": 4,
+        "hits": 3,
+        "hit_rate": 0.75,
+        "predicted_requests": 2,
+        "predicted_hits": 2,
+        "predicted_hit_rate": 1.0,
+        "coverage": 0.5,
+        "precision": 0.5,
+    }
+
+
+def test_warm_up_chart(mocker: MockerFixture) -> None:
+    """
+    Test that a chart is warmed up as the user of the task, without forcing it.
+    """
+    command = mocker.patch("superset.tasks.cache.ChartWarmUpCacheCommand")
+    command.return_value.run.return_value = {
+        "chart_id": 1,
+        "viz_error": None,
+        "viz_status": "success",
+    }
+    command.return_value.is_cached = True
+    get_user = mocker.patch(
+        "superset.tasks.cache.security_manager.get_user_by_username"
+    )
+    override_user = mocker.patch("superset.tasks.cache.override_user")
+
+    result = warm_up_chart(
+        {
+            "payload": {"chart_id": 1, "dashboard_id": 2, "query_context": {}},
+            "username": "admin",
+        }
+    )
+
+    command.assert_called_once_with(1, 2, None, force=False, query_context={})
+    get_user.assert_called_once_with("admin")
+    override_user.assert_called_once_with(get_user.return_value)
+    assert result["error"] is None
+    assert result["status"] == "success"
+    assert result["is_cached"] is True
+    assert result["duration_ms"] >= 0
+
+
+@with_config({"CACHE_WARMUP_MAX_WORKERS": 2})
+def test_warm_up_charts(mocker: MockerFixture) -> None:
+    """
+    Test that charts are warmed up concurrently, and their results reported.
+    """
+    warm_up_chart = mocker.patch(
+        "superset.tasks.cache.warm_up_chart",
+        side_effect=lambda task, force: {
+            "chart_id": task["payload"]["chart_id"],
+            "dashboard_id": None,
+            "error": "boom" if task["payload"]["chart_id"] == 2 else None,
+            "status": "success",
+            "is_cached": task["payload"]["chart_id"] == 3,
+            "duration_ms": 1.0,
+        },
+    )
+    run_concurrently = mocker.patch(
+        "superset.tasks.cache.run_concurrently",
+        wraps=concurrency.run_concurrently,
+    )
+
+    results = warm_up_charts.run([make_task(1), make_task(2), make_task(3)], force=True)
+
+    assert [result["chart_id"] for result in results] == [1, 2, 3]
+    assert [result["error"] for result in results] == [None, "boom", None]
+    assert warm_up_chart.call_count == 3
+    assert all(call.args[1] is True for call in warm_up_chart.call_args_list)
+    assert run_concurrently.call_args.kwargs["max_workers"] == 2
+
+
+@with_config({"CACHE_WARMUP_BATCH_SIZE": 2})
+def test_schedule_warm_up_charts(mocker: MockerFixture) -> None:
+    """
+    Test that tasks are split in batches, and tasks without executor skipped.
+    """
+    delay = mocker.patch("superset.tasks.cache.warm_up_charts.delay")
+    tasks = [make_task(1), make_task(2), make_task(3, None), make_task(4)]
+
+    results = schedule_warm_up_charts(tasks)
+
+    assert results == {"scheduled": ["1", "2", "4"], "errors": []}
+    assert [call.args[0] for call in delay.call_args_list] == [
+        [make_task(1), make_task(2)],
+        [make_task(4)],
+    ]
@@ -0,0 +1,116 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from flask import Flask
+
+from superset.utils.arrow import (
+    accepts_arrow,
+    ARROW_STREAM_MIMETYPE,
+    deserialize_dataframe,
+    df_to_arrow,
+    is_serialized_dataframe,
+    read_arrow_streams,
+    read_dataframe_header,
+    serialize_dataframe,
+    write_arrow_streams,
+)
+
+
+def test_df_to_arrow():
+    """Test that DataFrames are converted column by column, without the index."""
+    df = pd.DataFrame(
+        {
+            "ds": [datetime(2024, 1, 1), None],
+            "value": [1.5, None],
+            "mixed": ["a", 1],
+            0: [1, 2],
+        },
+        index=["x", "y"],
+    )
+    table = df_to_arrow(df)
+    assert table.column_names == ["ds", "value", "mixed", "0"]
+    assert table.schema.field("ds").type == pa.timestamp("ns")
+    assert table.column("value").to_pylist() == [1.5, None]
+    assert table.column("mixed").to_pylist() == ["a", "1"]
+
+
+def test_write_read_arrow_streams():
+    """Test that each result is written as a stream, with its metadata."""
+    buffer = write_arrow_streams(
+        [
+            (pa.table({"a": [1, 2]}), {"rowcount": 2, "ts": datetime(2024, 1, 1)}),
+            (None, {"rowcount": 0}),
+        ]
+    )
+    results = read_arrow_streams(buffer)
+    assert len(results) == 2
+    assert results[0][0].to_pydict() == {"a": [1, 2]}
+    assert results[0][1] == {"rowcount": 2, "ts": 1704067200000.0}
+    assert results[1][0].num_columns == 0
+    assert results[1][1] == {"rowcount": 0}
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (ARROW_STREAM_MIMETYPE, True),
+        (f"{ARROW_STREAM_MIMETYPE}, application/json;q=0.5", True),
+        (f"application/json, {ARROW_STREAM_MIMETYPE};q=0.5", False),
+        ("application/json", False),
+        ("*/*", False),
+        (None, False),
+    ],
+)
+def test_accepts_arrow(accept, expected):
+    """Test that Arrow is only used when the client prefers it."""
+    headers = {"Accept": accept} if accept else {}
+    with Flask(__name__).test_request_context(headers=headers) as ctx:
+        assert accepts_arrow(ctx.request) is expected
+
+
+@pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+def test_serialize_dataframe(compression):
+    """Test that DataFrames keep their index and dtypes."""
+    df = pd.DataFrame(
+        {"value": [1.5, None], "count": [1, 2], "name": ["a", "b"]},
+        index=pd.Index(["x", "y"], name="key"),
+    )
+    data = serialize_dataframe(df, compression)
+    assert is_serialized_dataframe(data)
+    assert read_dataframe_header(data)[0] == {
+        "fields": ["value", "count", "name", "key"],
+        "index_columns": ["key"],
+        "rows": 2,
+    }
+    pd.testing.assert_frame_equal(deserialize_dataframe(data), df)
+    pd.testing.assert_frame_equal(
+        deserialize_dataframe(data, columns=["count"]),
+        df[["count"]],
+    )
+
+
+def test_serialize_dataframe_multiindex_columns():
+    """Test that pivoted DataFrames keep their column levels."""
+    df = pd.DataFrame(
+        [[1, 2]],
+        columns=pd.MultiIndex.from_tuples([("SUM(num)", "CA"), ("SUM(num)", "NY")]),
+    )
+    pd.testing.assert_frame_equal(deserialize_dataframe(serialize_dataframe(df)), df)
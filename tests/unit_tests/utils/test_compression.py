@@ -0,0 +1,75 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+from superset.utils.compression import (
+    compress_results,
+    decompress_results,
+    get_results_codec,
+)
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd", "lz4", "none"])
+def test_round_trip(codec):
+    """Test that entries are decompressed with the codec they were written with."""
+    data = b'{"data": [1, 2, 3]}' * 100
+    blob = compress_results(data, codec=codec)
+    assert decompress_results(blob, decode=False) == data
+    assert decompress_results(blob) == data.decode("utf-8")
+
+
+def test_round_trip_str():
+    """Test that strings are compressed as UTF-8."""
+    blob = compress_results('{"test": "ü"}', codec="zstd")
+    assert decompress_results(blob) == '{"test": "ü"}'
+
+
+def test_decompress_legacy_zlib():
+    """Test that entries written before codecs were configurable still read."""
+    blob = zlib.compress(b'{"test": 1}')
+    assert decompress_results(blob) == '{"test": 1}'
+
+
+def test_compress_zlib_legacy():
+    """Test that zlib entries are written without a header, for older readers."""
+    blob = compress_results('{"test": 1}', codec="zlib")
+    assert zlib.decompress(blob) == b'{"test": 1}'
+
+
+def test_get_results_codec_fallback():
+    """Test that unavailable codecs fall back to zlib."""
+    with (
+        patch(
+            "superset.utils.compression.current_app.config",
+            {"RESULTS_BACKEND_CODEC": "zstd"},
+        ),
+        patch("superset.utils.compression.is_codec_available", return_value=False),
+    ):
+        assert get_results_codec() == "zlib"
+
+
+def test_get_results_codec_invalid():
+    """Test that unknown codecs are rejected."""
+    with patch(
+        "superset.utils.compression.current_app.config",
+        {"RESULTS_BACKEND_CODEC": "brotli"},
+    ):
+        with pytest.raises(ValueError, match="Unsupported results backend codec"):
+            get_results_codec()
@@ -0,0 +1,124 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+import threading
+import time
+
+import pytest
+from flask import current_app, g, request
+
+from superset.utils.concurrency import database_query_slot, run_concurrently
+from tests.conftest import with_config
+
+
+@with_config({"CHART_DATA_MAX_WORKERS": 4})
+def test_run_concurrently(app_context: None) -> None:
+    """
+    Test that tasks run in worker threads, with the context of the caller.
+    """
+    g.user = "admin"
+
+    def task(value: int) -> tuple[int, str, bool]:
+        # finish in reverse order
+        time.sleep(0.01 * (3 - value))
+        return value, g.user, threading.get_ident() != caller
+
+    caller = threading.get_ident()
+    assert run_concurrently([lambda i=i: task(i) for i in range(3)]) == [
+        (0, "admin", True),
+        (1, "admin", True),
+        (2, "admin", True),
+    ]
+
+
+@with_config({"CHART_DATA_MAX_WORKERS": 4})
+def test_run_concurrently_request_context(app_context: None) -> None:
+    """
+    Test that the request context is available to the tasks.
+    """
+    with current_app.test_request_context("/?foo=bar"):
+        assert run_concurrently([lambda: request.args["foo"]] * 2) == ["bar", "bar"]
+
+
+def test_run_concurrently_sequential(app_context: None) -> None:
+    """
+    Test that tasks run in the calling thread when there's a single worker, the
+    default.
+    """
+    assert run_concurrently([threading.get_ident] * 2) == [threading.get_ident()] * 2
+
+
+@with_config({"CHART_DATA_MAX_WORKERS": 4})
+def test_run_concurrently_nested(app_context: None) -> None:
+    """
+    Test that tasks run by a worker run in the thread of the worker.
+    """
+
+    def task() -> bool:
+        worker = threading.get_ident()
+        return run_concurrently([threading.get_ident] * 2) == [worker] * 2
+
+    assert run_concurrently([task] * 2) == [True, True]
+
+
+@with_config({"CHART_DATA_MAX_WORKERS": 4})
+def test_run_concurrently_error(app_context: None) -> None:
+    """
+    Test that the first exception raised by a task is raised.
+    """
+    done = []
+
+    def fail() -> None:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError, match="failed"):
+        run_concurrently([fail, lambda: done.append(True)])
+
+    assert done == [True]
+
+
+@with_config({"CHART_DATA_MAX_WORKERS": 4, "CHART_DATA_MAX_QUERIES_PER_DATABASE": 2})
+def test_database_query_slot(app_context: None) -> None:
+    """
+    Test that worker threads run a limited number of queries on each database.
+    """
+    lock = threading.Lock()
+    running = {"db1": 0, "db2": 0}
+    peak = {"db1": 0, "db2": 0}
+
+    def query(database: str) -> None:
+        with database_query_slot(database):
+            with lock:
+                running[database] += 1
+                peak[database] = max(peak[database], running[database])
+            time.sleep(0.02)
+            with lock:
+                running[database] -= 1
+
+    run_concurrently([lambda: query("db1")] * 4 + [lambda: query("db2")])
+
+    assert peak == {"db1": 2, "db2": 1}
+
+
+@with_config({"CHART_DATA_MAX_QUERIES_PER_DATABASE": 0})
+def test_database_query_slot_caller(app_context: None) -> None:
+    """
+    Test that queries run by the calling thread are not limited.
+    """
+    with database_query_slot("db"):
+        pass
@@ -14,14 +14,28 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import math
+from datetime import datetime
 from unittest.mock import patch
 
 import pytest
 
 from superset.utils.hashing import (
+    hash_cache_key,
     hash_from_dict,
     hash_from_str,
 )
+from superset.utils.json import json_int_dttm_ser
+from tests.conftest import with_config
+
+CACHE_DICT = {
+    "datasource": "1__table",
+    "metrics": [{"label": "SUM(num)", "aggregate": "SUM"}],
+    "filter": [{"col": "country", "op": "IN", "val": ["US", "FR"]}],
+    "changed_on": datetime(2024, 1, 1),
+    "row_limit": 10000,
+    "value": math.nan,
+}
 
 
 def test_hash_from_str_sha256():
@@ -181,3 +195,68 @@ def test_md5_vs_sha256_different_outputs():
     assert len(md5_result) == 32
     # SHA-256 produces 64 character hex string
     assert len(sha256_result) == 64
+
+
+@with_config({"CACHE_KEY_LEGACY_ENCODING": True, "CACHE_KEY_HASH_ALGORITHM": None})
+def test_hash_cache_key_legacy():
+    """Test that the legacy encoding of cache keys is the same as hash_from_dict."""
+    assert hash_cache_key(
+        CACHE_DICT, ignore_nan=True, default=json_int_dttm_ser
+    ) == hash_from_dict(CACHE_DICT, ignore_nan=True, default=json_int_dttm_ser)
+
+
+@with_config({"CACHE_KEY_LEGACY_ENCODING": False, "CACHE_KEY_HASH_ALGORITHM": None})
+def test_hash_cache_key_canonical():
+    """Test that the canonical encoding is invariant to key and set order."""
+    reordered = dict(reversed(list(CACHE_DICT.items())))
+    key = hash_cache_key(CACHE_DICT, default=json_int_dttm_ser)
+    assert key == hash_cache_key(reordered, default=json_int_dttm_ser)
+    assert key != hash_from_dict(CACHE_DICT, default=json_int_dttm_ser)
+    assert len(key) == 64
+
+    assert hash_cache_key({"rls": {"b", "a", 1}}) == hash_cache_key(
+        {"rls": {1, "a", "b"}}
+    )
+    assert hash_cache_key({"value": 1}) != hash_cache_key({"value": "1"})
+
+
+@with_config({"CACHE_KEY_LEGACY_ENCODING": False, "CACHE_KEY_HASH_ALGORITHM": None})
+def test_hash_cache_key_mixed_key_types():
+    """Test that dicts mixing key types, which can't be sorted, are hashed."""
+    from superset.utils.json import dumps_canonical
+
+    assert dumps_canonical({"b": [{2: "x", "a": None}], None: 1, 1.5: True}) == (
+        b'{"1.5":true,"b":[{"2":"x","a":null}],"null":1}'
+    )
+    assert hash_cache_key({1: "a", "b": 2}) == hash_cache_key({"b": 2, "1": "a"})
+    # keys of a single type are sorted as they are
+    assert dumps_canonical({10: "a", 2: "b"}) == b'{"2":"b","10":"a"}'
+
+
+@pytest.mark.parametrize(
+    "algorithm,length",
+    [("md5", 32), ("sha256", 64), ("blake2b", 32)],
+)
+def test_hash_cache_key_algorithm(algorithm: str, length: int):
+    """Test the hash algorithms of cache keys."""
+    assert len(hash_cache_key({"a": 1}, algorithm=algorithm)) == length
+
+
+@with_config({"CACHE_KEY_HASH_ALGORITHM": "blake2b"})
+def test_hash_cache_key_configured_algorithm():
+    """Test that the hash algorithm of cache keys can differ from HASH_ALGORITHM."""
+    key = hash_cache_key(CACHE_DICT, default=json_int_dttm_ser)
+    assert key == hash_cache_key(
+        CACHE_DICT, default=json_int_dttm_ser, algorithm="blake2b"
+    )
+
+
+def test_hash_cache_key_xxhash():
+    """Test that xxh3_128 is available only if the xxhash package is installed."""
+    try:
+        import xxhash  # noqa: F401
+    except ImportError:
+        with pytest.raises(ValueError, match="Unsupported cache key hash algorithm"):
+            hash_cache_key({"a": 1}, algorithm="xxh3_128")
+    else:
+        assert len(hash_cache_key({"a": 1}, algorithm="xxh3_128")) == 32